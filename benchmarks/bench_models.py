@@ -0,0 +1,164 @@
+"""Benchmark building ballot data models from extracted data.
+
+Compares the checked construction ('ElectionData(**data)'), which checks
+the type of every field, with 'ElectionData.from_extracted', the path
+'BallotDataExtractor' uses. For each it reports the time taken and the
+memory the models hold, measured with 'tracemalloc':
+
+    python benchmarks/bench_models.py --scale state --output models.json
+
+The data is shaped like the extractor's output, built with the tests'
+ballot data builders; no EDF is involved.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from electos.ballotmaker.constants import VERSION
+from electos.ballotmaker.data.models import ElectionData
+
+# the tests' ballot data builders
+sys.path.insert(0, str(Path(__file__).parents[1] / "tests"))
+from conftest import (  # noqa: E402
+    ballot_measure,
+    ballot_style,
+    candidate_contest,
+    election_data,
+)
+
+SCALES = {
+    "small": dict(
+        ballot_styles=10,
+        contests_per_style=6,
+        candidates_per_contest=4,
+        measures_per_style=1,
+    ),
+    "county": dict(
+        ballot_styles=500,
+        contests_per_style=20,
+        candidates_per_contest=5,
+        measures_per_style=3,
+    ),
+    "state": dict(
+        ballot_styles=5000,
+        contests_per_style=40,
+        candidates_per_contest=6,
+        measures_per_style=6,
+    ),
+}
+
+# best of this many runs
+REPEAT = 3
+
+
+def extracted_data(
+    ballot_styles: int,
+    contests_per_style: int,
+    candidates_per_contest: int,
+    measures_per_style: int,
+) -> dict:
+    """Election data as 'BallotDataExtractor' produces it"""
+    party = {"name": "Party", "abbreviation": "PTY"}
+    return election_data(
+        *(
+            ballot_style(
+                f"precinct_{style}",
+                contests=[
+                    candidate_contest(
+                        f"Contest {number}",
+                        candidates_per_contest,
+                        party,
+                        number=number,
+                    )
+                    for number in range(contests_per_style)
+                ]
+                + [
+                    ballot_measure(number)
+                    for number in range(measures_per_style)
+                ],
+                scope=f"Precinct {style}",
+            )
+            for style in range(ballot_styles)
+        )
+    )
+
+
+def measure(build, data: dict, repeat: int = REPEAT) -> dict:
+    """Time a model construction and the memory its models hold"""
+    gc.collect()
+    tracemalloc.start()
+    election = build(data)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del election
+    # time it untraced, which slows allocation down, and like 'timeit'
+    # with the garbage collector off: its runs make the times erratic
+    times = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            election = build(data)
+            times.append(time.perf_counter() - start)
+            del election
+    finally:
+        gc.enable()
+    return {
+        "seconds": min(times),
+        "held_bytes": held,
+        "peak_bytes": peak,
+    }
+
+
+def run(parameters: dict) -> dict:
+    data = extracted_data(**parameters)
+    return {
+        "checked": measure(lambda data: ElectionData(**data), data),
+        "trusted": measure(ElectionData.from_extracted, data),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="county")
+    parser.add_argument(
+        "--ballot-styles", type=int, help="Override the scale's value"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="JSON file for the results"
+    )
+    opts = parser.parse_args()
+
+    parameters = dict(SCALES[opts.scale])
+    if opts.ballot_styles is not None:
+        parameters["ballot_styles"] = opts.ballot_styles
+
+    results = {
+        "benchmark": "models",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": opts.scale,
+        "parameters": parameters,
+        "stages": run(parameters),
+    }
+
+    for name, stage in results["stages"].items():
+        print(
+            f"{name:>8}: {stage['seconds']:8.3f} s, "
+            f"{stage['held_bytes'] / 2**20:8.1f} MiB held"
+        )
+    if opts.output:
+        opts.output.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark the ballot pipeline on synthetic EDFs.
+
+Generates an EDF at the requested scale, then times each stage of the
+pipeline: JSON parsing (whole, and with 'load_edf', which leaves out
+results), 'ElectionReport' construction, 'ElementIndex' construction,
+'BallotDataExtractor.extract', and 'build_ballot' for each ballot style.
+Results are written as JSON so runs can be compared:
+
+    python benchmarks/bench_pipeline.py --scale county --output county.json
+
+Rendering every style of a state-scale EDF takes a long time; use
+'--render-limit' to render a sample of the ballot styles.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from electos.ballotmaker.ballots.ballot_layout import build_ballot
+from electos.ballotmaker.ballots.build_ballots import get_election_header
+from electos.ballotmaker.constants import VERSION
+from electos.ballotmaker.data.edf_reader import load_edf
+from electos.ballotmaker.data.extractor import BallotDataExtractor
+from electos.ballotmaker.data.synthetic_edf import SCALES, generate_edf
+from electos.datamodels.nist.indexes import ElementIndex
+from electos.datamodels.nist.models.edf import ElectionReport
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(parameters: dict, render_limit: int = None) -> dict:
+    """Run the pipeline once, returning the timings."""
+    text = json.dumps(generate_edf(**parameters))
+    stages = {}
+
+    data, seconds = timed(json.loads, text)
+    stages["json_parse"] = {"seconds": seconds}
+    with tempfile.TemporaryDirectory() as edf_dir:
+        edf = Path(edf_dir, "edf.json")
+        edf.write_text(text)
+        data, seconds = timed(load_edf, edf)
+    stages["load_edf"] = {"seconds": seconds}
+    election_report, seconds = timed(lambda: ElectionReport(**data))
+    stages["election_report"] = {"seconds": seconds}
+    index, seconds = timed(ElementIndex, election_report, "ElectionResults")
+    stages["element_index"] = {"seconds": seconds}
+    extractor = BallotDataExtractor()
+    elections, seconds = timed(extractor.extract, election_report, index)
+    ballot_styles = elections[0].ballot_styles
+    stages["extract"] = {
+        "seconds": seconds,
+        "ballot_styles": len(ballot_styles),
+        "styles_per_second": len(ballot_styles) / seconds,
+    }
+
+    election_header = get_election_header(elections[0])
+    per_style = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for ballot_data in ballot_styles[:render_limit]:
+            _, seconds = timed(
+                build_ballot, ballot_data, election_header, output_dir
+            )
+            per_style.append({"id": ballot_data.id, "seconds": seconds})
+    render_seconds = sum(_["seconds"] for _ in per_style)
+    stages["build_ballot"] = {
+        "seconds": render_seconds,
+        "ballot_styles": len(per_style),
+        "styles_per_second": (
+            len(per_style) / render_seconds if per_style else None
+        ),
+        "per_style": per_style,
+    }
+
+    return {
+        "edf_bytes": len(text.encode("utf-8")),
+        "stages": stages,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument(
+        "--ballot-styles", type=int, help="Override the scale's value"
+    )
+    parser.add_argument(
+        "--contests-per-style", type=int, help="Override the scale's value"
+    )
+    parser.add_argument(
+        "--candidates-per-contest",
+        type=int,
+        help="Override the scale's value",
+    )
+    parser.add_argument(
+        "--gp-units", type=int, help="Override the scale's value"
+    )
+    parser.add_argument(
+        "--measure-text-length", type=int, help="Override the scale's value"
+    )
+    parser.add_argument(
+        "--render-limit",
+        type=int,
+        default=None,
+        help="Render at most this many ballot styles",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="JSON file for the results"
+    )
+    opts = parser.parse_args()
+
+    parameters = dict(SCALES[opts.scale])
+    for name in (
+        "ballot_styles",
+        "contests_per_style",
+        "candidates_per_contest",
+        "gp_units",
+        "measure_text_length",
+    ):
+        value = getattr(opts, name)
+        if value is not None:
+            parameters[name] = value
+
+    results = {
+        "benchmark": "pipeline",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": opts.scale,
+        "parameters": parameters,
+        **run(parameters, opts.render_limit),
+    }
+
+    for name, stage in results["stages"].items():
+        rate = stage.get("styles_per_second")
+        rate = f" ({rate:.1f} styles/s)" if rate else ""
+        print(f"{name:>16}: {stage['seconds']:9.3f} s{rate}")
+    print(f"{'peak RSS':>16}: {results['peak_rss_kb']} KiB")
+    if opts.output:
+        opts.output.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark EDF validation on synthetic EDFs.
+
+Compares checking an EDF against the NIST schema with the compiled
+validator ('data.edf_schema') with validating it by building its
+'ElectionReport' and extracting its ballot data, as 'validate' did before
+the schema check. Compiling the schema is timed too:
+
+    python benchmarks/bench_validate.py --scale county --output validate.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+
+from electos.ballotmaker.constants import VERSION
+from electos.ballotmaker.data.edf_schema import load_validator
+from electos.ballotmaker.data.extractor import BallotDataExtractor
+from electos.ballotmaker.data.synthetic_edf import SCALES, generate_edf
+from electos.datamodels.nist.indexes import ElementIndex
+from electos.datamodels.nist.models.edf import ElectionReport
+
+# best of this many runs
+REPEAT = 3
+
+
+def best_of(function, *args, repeat: int = REPEAT) -> float:
+    """The fastest of several runs, with the garbage collector off"""
+    times = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(times)
+
+
+def extract(data: dict):
+    election_report = ElectionReport(**data)
+    index = ElementIndex(election_report, "ElectionResults")
+    return BallotDataExtractor().extract(election_report, index)
+
+
+def run(parameters: dict, repeat: int = REPEAT) -> dict:
+    data = json.loads(json.dumps(generate_edf(**parameters)))
+    stages = {}
+    load_validator.cache_clear()
+    start = time.perf_counter()
+    validator = load_validator()
+    stages["compile_schema"] = {"seconds": time.perf_counter() - start}
+    errors = validator(data)
+    stages["schema_validation"] = {
+        "seconds": best_of(validator, data, repeat=repeat),
+        "errors": len(errors),
+    }
+    stages["election_report"] = {
+        "seconds": best_of(lambda: ElectionReport(**data), repeat=repeat)
+    }
+    stages["extraction_validation"] = {
+        "seconds": best_of(extract, data, repeat=repeat)
+    }
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="county")
+    parser.add_argument(
+        "--ballot-styles", type=int, help="Override the scale's value"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=REPEAT, help="Report the best of N runs"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="JSON file for the results"
+    )
+    opts = parser.parse_args()
+
+    parameters = dict(SCALES[opts.scale])
+    if opts.ballot_styles is not None:
+        parameters["ballot_styles"] = opts.ballot_styles
+
+    results = {
+        "benchmark": "validate",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": opts.scale,
+        "parameters": parameters,
+        "stages": run(parameters, opts.repeat),
+    }
+
+    for name, stage in results["stages"].items():
+        print(f"{name:>22}: {stage['seconds']:9.3f} s")
+    if opts.output:
+        opts.output.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
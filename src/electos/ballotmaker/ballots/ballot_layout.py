@@ -5,17 +5,18 @@ page templates, and specific pages
 import logging
 from datetime import datetime
 from functools import partial
+from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO, List, Type, Union
 
-from electos.ballotmaker.ballots.contest_layout import (
-    BallotMeasureLayout,
-    CandidateContestLayout,
-)
-from electos.ballotmaker.ballots.instructions import Instructions
+from electos.ballotmaker.ballots.contest_layout import contest_table
+from electos.ballotmaker.ballots.instructions import get_instructions
 from electos.ballotmaker.ballots.page_layout import PageLayout
 from electos.ballotmaker.data.models import BallotStyleData
+from electos.ballotmaker.timing import span
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
+from reportlab.pdfgen.canvas import Canvas
 from reportlab.platypus import (
     BaseDocTemplate,
     Frame,
@@ -77,6 +78,9 @@ one_frame = Frame(
     showBoundary=SHOW_BOUNDARY,
 )
 
+# ballot header text style, shared by every ballot
+header_style = getSampleStyleSheet()["Normal"]
+
 
 def add_header_line(
     font_size: int, line_text: str, new_line: bool = False
@@ -108,43 +112,12 @@ def header(canvas, doc, content):
     canvas.restoreState()
 
 
-def build_ballot(
-    ballot_data: BallotStyleData, election_header: dict, output_dir: Path
-) -> str:
-    # create PDF filename
-    now = datetime.now()
-    date_time = now.strftime("%Y_%m_%dT%H%M%S")
-    ballot_label = ballot_data.id
-    ballot_scope_count = len(ballot_data.scopes)
-    if ballot_scope_count > 1:
-        raise NotImplementedError(
-            f"Multiple ballot scopes currently unsupported. Found {ballot_scope_count} ballot scopes."
-        )
-    ballot_scope = ballot_data.scopes[0]
-    ballot_name = f"{output_dir}/{ballot_label}_{date_time}.pdf"
+def ballot_file_name(output_dir: Path, ballot_label: str, date_time: str):
+    return f"{output_dir}/{ballot_label}_{date_time}.pdf"
 
-    doc = BaseDocTemplate(ballot_name)
-
-    styles = getSampleStyleSheet()
-    normal = styles["Normal"]
-    header_text = build_header_text(election_header, ballot_scope)
-    header_content = Paragraph(header_text, normal)
-    three_column_template = PageTemplate(
-        id="3col",
-        frames=[left_frame, mid_frame, right_frame],
-        onPage=partial(header, content=header_content),
-    )
-    one_column_template = PageTemplate(
-        id="1col",
-        frames=[one_frame],
-        onPage=partial(
-            header,
-            content=header_content,
-        ),
-    )
-    doc.addPageTemplates(three_column_template)
-    doc.addPageTemplates(one_column_template)
 
+def ballot_elements(ballot_data: BallotStyleData) -> list:
+    """The flowables for a ballot style, ready for a BaseDocTemplate"""
     # TODO: use ballot_data.candidate_contests & .ballot_measures instead.
     # See thread for details: https://github.com/TrustTheVote-Project/BallotLab/pull/113#discussion_r973608016
     candidate_contests = []
@@ -163,18 +136,16 @@ def build_ballot(
     logging.info(f"Total: {count} contests.")
 
     elements = []
-    # add voting instructions
-    inst = Instructions()
+    # add voting instructions, shared by every ballot
+    inst = get_instructions()
     elements.append(NextPageTemplate("3col"))
-    elements = inst.instruction_list
+    elements.extend(inst.instruction_list)
 
     # add candidate contests
     for can_con_count, candidate_contest in enumerate(
         candidate_contests, start=1
     ):
-        candidate_layout = CandidateContestLayout(
-            candidate_contest
-        ).contest_table
+        candidate_layout = contest_table(candidate_contest)
         elements.append(candidate_layout)
         # insert column break after every 2 contests
         if (can_con_count % 2 == 0) and (can_con_count < 4):
@@ -184,8 +155,173 @@ def build_ballot(
     elements.append(NextPageTemplate("1col"))
     elements.append(PageBreak())
     for measures, ballot_measure in enumerate(ballot_measures, start=1):
-        ballot_layout = BallotMeasureLayout(ballot_measure).contest_table
+        ballot_layout = contest_table(ballot_measure)
         elements.append(ballot_layout)
     logging.info(f"Added {measures} ballot measures.")
-    doc.build(elements)
+    return elements
+
+
+def ballot_document(
+    ballot_data: BallotStyleData,
+    election_header: dict,
+    output: Union[str, Path, BinaryIO],
+    document_class: Type[BaseDocTemplate] = BaseDocTemplate,
+) -> BaseDocTemplate:
+    """The document for a ballot style, with its page templates"""
+    ballot_scope_count = len(ballot_data.scopes)
+    if ballot_scope_count > 1:
+        raise NotImplementedError(
+            f"Multiple ballot scopes currently unsupported. Found {ballot_scope_count} ballot scopes."
+        )
+    ballot_scope = ballot_data.scopes[0]
+    if isinstance(output, Path):
+        output = str(output)
+
+    doc = document_class(output)
+
+    header_text = build_header_text(election_header, ballot_scope)
+    header_content = Paragraph(header_text, header_style)
+    three_column_template = PageTemplate(
+        id="3col",
+        frames=[left_frame, mid_frame, right_frame],
+        onPage=partial(header, content=header_content),
+    )
+    one_column_template = PageTemplate(
+        id="1col",
+        frames=[one_frame],
+        onPage=partial(
+            header,
+            content=header_content,
+        ),
+    )
+    doc.addPageTemplates(three_column_template)
+    doc.addPageTemplates(one_column_template)
+    return doc
+
+
+class _NoFields:
+    """Leaves out the form fields of a ballot"""
+
+    def checkbox(self, **kwargs):
+        pass
+
+    def textfield(self, **kwargs):
+        pass
+
+
+class PageFormCanvas(Canvas):
+    """
+    A canvas that can keep the pages of a ballot as forms, to draw on
+    as many pages as needed; see 'layout_ballot_forms'
+    """
+
+    def __init__(self, output: Union[str, Path, BinaryIO], **kwargs):
+        if isinstance(output, Path):
+            output = str(output)
+        super().__init__(output, **kwargs)
+
+    @property
+    def acroForm(self):
+        # the fields are hidden, for marking a single ballot on screen: a
+        # PDF of many ballots doesn't need them, and a form can't hold them
+        return _NoFields()
+
+    def showPage(self):
+        if self._formData is None:
+            super().showPage()
+        else:
+            # a page of a ballot layout
+            self.endForm()
+
+
+class _PageFormDocTemplate(BaseDocTemplate):
+    """Lays out a ballot as one form per page, without saving the PDF"""
+
+    form_prefix = "BallotPage"
+    _doSave = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_forms = []
+
+    def handle_pageBegin(self):
+        name = f"{self.form_prefix}{len(self.page_forms) + 1}"
+        self.page_forms.append(name)
+        self.canv.beginForm(name)
+        super().handle_pageBegin()
+
+
+def layout_ballot_forms(
+    ballot_data: BallotStyleData,
+    election_header: dict,
+    canvas: PageFormCanvas,
+    form_prefix: str = _PageFormDocTemplate.form_prefix,
+) -> List[str]:
+    """Lay out a ballot style on a canvas as a form per page
+    The pages aren't shown: draw each form on a page with 'doForm'. The
+    fonts, images and forms a ballot uses are stored once per canvas.
+    Requires:
+        ballot_data: the ballot style
+        election_header: shared header data, see 'get_election_header'
+        canvas: the canvas of the PDF
+    Optional:
+        form_prefix: name of the page forms, numbered from 1; unique for
+            each ballot style laid out on the canvas
+    Returns:
+        The names of the page forms, in page order
+    """
+    ballot_label = ballot_data.id
+    doc = ballot_document(
+        ballot_data, election_header, canvas._filename, _PageFormDocTemplate
+    )
+    doc.form_prefix = form_prefix
+    with span("flowables", ballot_style=ballot_label):
+        elements = ballot_elements(ballot_data)
+    with span("doc_build", ballot_style=ballot_label):
+        # platypus lays out on the canvas it's given, not one of its own
+        doc.build(elements, canvasmaker=lambda *args, **kwargs: canvas)
+    return doc.page_forms
+
+
+def write_ballot(
+    ballot_data: BallotStyleData,
+    election_header: dict,
+    output: Union[str, Path, BinaryIO],
+):
+    """Render a ballot style as a PDF
+    Requires:
+        ballot_data: the ballot style
+        election_header: shared header data, see 'get_election_header'
+        output: PDF file name, or a writable binary stream
+    """
+    ballot_label = ballot_data.id
+    doc = ballot_document(ballot_data, election_header, output)
+
+    with span("flowables", ballot_style=ballot_label):
+        elements = ballot_elements(ballot_data)
+    with span("doc_build", ballot_style=ballot_label):
+        doc.build(elements)
+
+
+def render_ballot(
+    ballot_data: BallotStyleData, election_header: dict
+) -> bytes:
+    """Render a ballot style as PDF bytes, without writing a file"""
+    output = BytesIO()
+    write_ballot(ballot_data, election_header, output)
+    return output.getvalue()
+
+
+def build_ballot(
+    ballot_data: BallotStyleData,
+    election_header: dict,
+    output_dir: Path,
+    date_time: str = None,
+) -> str:
+    # create PDF filename
+    if date_time is None:
+        now = datetime.now()
+        date_time = now.strftime("%Y_%m_%dT%H%M%S")
+    ballot_name = ballot_file_name(output_dir, ballot_data.id, date_time)
+    write_ballot(ballot_data, election_header, ballot_name)
     return str(ballot_name)
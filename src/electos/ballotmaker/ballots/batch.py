@@ -0,0 +1,125 @@
+"""Ballot production as a batch job.
+
+A run of 'build_ballots' is a batch with one task per ballot style. A
+task is rendered, linked to the PDF of an identical ballot style, or kept
+from an earlier build of the same output directory. The batch counts the
+tasks as they finish, logging progress, and reports the throughput at the
+end. A task that fails is recorded with its error; the tasks that never
+started are left pending.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+# task states
+PENDING = "pending"
+RENDERED = "rendered"
+LINKED = "linked"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+DONE = (RENDERED, LINKED, UNCHANGED)
+
+
+@dataclass
+class BallotTask:
+    """Making the PDF of one ballot style"""
+
+    ballot_id: str
+    # the PDF's file name in the batch's output directory
+    file: str
+    state: str = PENDING
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BallotBatch:
+    """The ballot styles of a build, and how far it has got"""
+
+    output_dir: Path
+    tasks: Dict[str, BallotTask] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    seconds: float = 0.0
+    finished: int = 0
+
+    def add(self, ballot_id: str, file: str) -> BallotTask:
+        task = BallotTask(ballot_id, file)
+        self.tasks[ballot_id] = task
+        return task
+
+    def finish(
+        self,
+        ballot_id: str,
+        state: str,
+        seconds: float = 0.0,
+        error: str = None,
+    ):
+        """Record the result of a task, and log the batch's progress"""
+        task = self.tasks[ballot_id]
+        task.state = state
+        task.seconds = seconds
+        task.error = error
+        self.finished += 1
+        progress = f"[{self.finished}/{len(self.tasks)}]"
+        if state == FAILED:
+            log.error(f"{progress} Ballot for {ballot_id} failed: {error}")
+        elif state == RENDERED:
+            log.info(f"{progress} Rendered {ballot_id} in {seconds:.2f} s")
+        else:
+            log.info(f"{progress} Ballot for {ballot_id} {state}")
+
+    def in_state(self, *states: str) -> List[BallotTask]:
+        return [_ for _ in self.tasks.values() if _.state in states]
+
+    @property
+    def failed(self) -> List[BallotTask]:
+        return self.in_state(FAILED)
+
+    @property
+    def ok(self) -> bool:
+        """True if every ballot style's PDF was made"""
+        return len(self.in_state(*DONE)) == len(self.tasks)
+
+    def end(self):
+        self.seconds = time.perf_counter() - self.started
+
+    def summary(self) -> dict:
+        """Task counts by state, time taken and throughput"""
+        counts = {
+            state: len(self.in_state(state))
+            for state in (RENDERED, LINKED, UNCHANGED, FAILED, PENDING)
+        }
+        done = counts[RENDERED] + counts[LINKED] + counts[UNCHANGED]
+        return {
+            "ballot_styles": len(self.tasks),
+            **counts,
+            "seconds": round(self.seconds, 3),
+            "styles_per_second": (
+                round(done / self.seconds, 2) if self.seconds else None
+            ),
+            "failures": {_.ballot_id: _.error for _ in self.failed},
+        }
+
+    def report(self):
+        """Log the batch's results and throughput"""
+        summary = self.summary()
+        done = len(self.in_state(*DONE))
+        rate = summary["styles_per_second"]
+        rate = f" ({rate} styles/s)" if rate else ""
+        log.info(
+            f"Made {done} of {len(self.tasks)} ballot styles in "
+            f"{summary['seconds']:.2f} s{rate}: "
+            f"{summary[RENDERED]} rendered, {summary[LINKED]} linked, "
+            f"{summary[UNCHANGED]} unchanged."
+        )
+        if summary[FAILED] or summary[PENDING]:
+            log.error(
+                f"{summary[FAILED]} ballot styles failed, "
+                f"{summary[PENDING]} not made."
+            )
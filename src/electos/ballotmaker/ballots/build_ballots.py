@@ -1,32 +1,71 @@
 import logging
+import os
+import time
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
-from electos.ballotmaker.ballots.ballot_layout import build_ballot
+from electos.ballotmaker.ballots.ballot_layout import ballot_file_name
+from electos.ballotmaker.ballots.batch import (
+    DONE,
+    FAILED,
+    LINKED,
+    PENDING,
+    RENDERED,
+    UNCHANGED,
+    BallotBatch,
+)
+from electos.ballotmaker.ballots.fingerprint import (
+    ballot_fingerprint,
+    ballot_inputs_hash,
+    get_election_header,
+)
+from electos.ballotmaker.ballots.journal import BallotJournal, read_journal
+from electos.ballotmaker.ballots.manifest import (
+    alias_ballot,
+    read_manifest,
+    remove_orphans,
+    write_manifest,
+)
+from electos.ballotmaker.ballots.workers import build_ballot_task, run_parallel
 from electos.ballotmaker.constants import PROGRAM_NAME
 from electos.ballotmaker.data.models import ElectionData
+from electos.ballotmaker.timing import span
 
 logging.getLogger(__name__)
 
 
-def get_election_header(election: ElectionData) -> dict:
-    """extract the shared data for ballot headers"""
-    name = election.name
-    end_date = election.end_date
-    election_type = election.type
-    return {
-        "Name": name,
-        "EndDate": end_date,
-        "Type": election_type,
-    }
+def _try_build_ballot(task: tuple) -> tuple:
+    """Render one ballot style, returning any error rather than raising it
+    Returns:
+        The task, the error (None if the ballot was made), seconds taken
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        build_ballot_task(task)
+    except Exception as ex:
+        logging.exception(f"Rendering the ballot for {task[0].id} failed")
+        error = f"{type(ex).__name__}: {ex}"
+    return task, error, time.perf_counter() - start
 
 
-def build_ballots(election: ElectionData) -> Path:
+def _unchanged_ballot(
+    output_dir: Path, entry: Optional[dict], inputs: str
+) -> Optional[dict]:
+    """The manifest entry of a ballot built from the same inputs, if any"""
+    if entry is None or entry.get("inputs") != inputs:
+        return None
+    # only file names are recorded, never paths outside the directory
+    file_name = Path(entry.get("file", "")).name
+    if not file_name or not Path(output_dir, file_name).is_file():
+        return None
+    return dict(entry, file=file_name)
 
-    # create the directories needed
-    # TODO: clean up datetime code: https://github.com/TrustTheVote-Project/BallotLab/pull/113#discussion_r973609852
-    now = datetime.now()
-    date_time = now.strftime("%Y_%m_%dT%H%M%S")
+
+def make_ballot_dir(date_time: str) -> Path:
+    """Create a new directory for ballots, named for the time of the run"""
     home_dir = Path.home()
     program_dir = Path(home_dir, PROGRAM_NAME)
     new_ballot_dir = Path(program_dir, date_time)
@@ -36,11 +75,173 @@ def build_ballots(election: ElectionData) -> Path:
     Path(new_ballot_dir).mkdir(parents=True, exist_ok=False)
     # TODO: list actual dir in log output: https://github.com/TrustTheVote-Project/BallotLab/pull/113#discussion_r973610221
     logging.info("Output directory created.")
+    return new_ballot_dir
+
+
+def build_ballots(
+    election: ElectionData,
+    jobs: int = 1,
+    dedup: bool = True,
+    output_dir: Path = None,
+    incremental: bool = False,
+    keep_going: bool = False,
+) -> BallotBatch:
+    """Render a PDF for every ballot style in an election
+    Optional:
+        jobs: number of rendering processes; 0 = one per CPU
+        dedup: render identical ballot styles once, link the others
+        output_dir: write the ballots here instead of a new time-stamped
+            directory; PDFs listed in its manifest that are no longer
+            needed are deleted
+        incremental: keep the PDFs in output_dir whose inputs haven't
+            changed since they were built, render only the rest; with
+            the journal of an interrupted build, this resumes it
+        keep_going: render every ballot style, recording the ones that
+            fail, instead of stopping at the first failure
+    Returns:
+        The batch: its output directory and the result for each ballot
+        style
+    """
+
+    # create the directories needed
+    # TODO: clean up datetime code: https://github.com/TrustTheVote-Project/BallotLab/pull/113#discussion_r973609852
+    now = datetime.now()
+    date_time = now.strftime("%Y_%m_%dT%H%M%S")
+    if output_dir is None:
+        new_ballot_dir = make_ballot_dir(date_time)
+        previous = {}
+    else:
+        new_ballot_dir = Path(output_dir)
+        logging.info(f"Ballots will be saved in {new_ballot_dir}")
+        new_ballot_dir.mkdir(parents=True, exist_ok=True)
+        previous = read_manifest(new_ballot_dir)
+        # the ballot styles finished by a build that was interrupted
+        resumed = read_journal(new_ballot_dir)
+        if resumed:
+            logging.info(
+                f"Found the journal of an interrupted build "
+                f"with {len(resumed)} ballot styles"
+            )
+        previous.update(resumed)
     election_header = get_election_header(election)
 
+    # find the ballot styles that need rendering,
+    # the rest are copies of one of those or unchanged
+    batch = BallotBatch(new_ballot_dir)
+    manifest = {}
+    rendered = {}
+    tasks = []
+    duplicates = []
+    unchanged = []
     for ballot_data in election.ballot_styles:
-        logging.info(f"Generating ballot for {ballot_data.id}")
-        new_ballot_name = build_ballot(
-            ballot_data, election_header, new_ballot_dir
+        fingerprint = ballot_fingerprint(ballot_data, election_header)
+        inputs = ballot_inputs_hash(ballot_data, election_header)
+        entry = (
+            _unchanged_ballot(
+                new_ballot_dir, previous.get(ballot_data.id), inputs
+            )
+            if incremental
+            else None
         )
-    return new_ballot_dir
+        if entry is not None:
+            manifest[ballot_data.id] = entry
+            batch.add(ballot_data.id, entry["file"])
+            if dedup:
+                rendered.setdefault(fingerprint, ballot_data.id)
+            unchanged.append(ballot_data.id)
+            continue
+        source = rendered.get(fingerprint) if dedup else None
+        if source is None:
+            rendered[fingerprint] = ballot_data.id
+            source = ballot_data.id
+            # every PDF in a run shares the directory's time stamp,
+            # so file names don't depend on how the work is scheduled
+            tasks.append(
+                (ballot_data, election_header, new_ballot_dir, date_time)
+            )
+        else:
+            duplicates.append((ballot_data.id, source))
+        ballot_name = ballot_file_name(
+            new_ballot_dir, ballot_data.id, date_time
+        )
+        # don't write through a link to a PDF another style still uses
+        Path(ballot_name).unlink(missing_ok=True)
+        manifest[ballot_data.id] = {
+            "file": Path(ballot_name).name,
+            "fingerprint": fingerprint,
+            "source": source,
+            "inputs": inputs,
+        }
+        batch.add(ballot_data.id, manifest[ballot_data.id]["file"])
+    # record each ballot style as it's finished, in case the build is
+    # interrupted; the manifest is only written at the end
+    journal = BallotJournal(new_ballot_dir)
+    journal.start({_: manifest[_] for _ in unchanged})
+    for ballot_id in unchanged:
+        batch.finish(ballot_id, UNCHANGED)
+
+    def finish(ballot_id: str, state: str, seconds=0.0, error=None):
+        batch.finish(ballot_id, state, seconds, error)
+        journal.record(ballot_id, state, manifest[ballot_id], error)
+
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(tasks))
+    try:
+        # wall time; with several processes it's less than the ballots' sum
+        with span("render", jobs=jobs):
+            if jobs > 1:
+                logging.info(
+                    f"Rendering {len(tasks)} ballots with {jobs} processes"
+                )
+                results = run_parallel(_try_build_ballot, tasks, jobs)
+            else:
+                results = (_try_build_ballot(task) for task in tasks)
+            with closing(results):
+                for task, error, seconds in results:
+                    state = RENDERED if error is None else FAILED
+                    finish(task[0].id, state, seconds, error)
+                    if error is not None and not keep_going:
+                        break
+
+        for ballot_id, source in duplicates:
+            source_state = batch.tasks[source].state
+            if source_state in DONE:
+                logging.info(f"Ballot for {ballot_id} is the same as {source}")
+                alias_ballot(
+                    Path(new_ballot_dir, manifest[source]["file"]),
+                    Path(new_ballot_dir, manifest[ballot_id]["file"]),
+                )
+                finish(ballot_id, LINKED)
+            elif source_state == FAILED:
+                finish(
+                    ballot_id,
+                    FAILED,
+                    error=f"the same as {source}, which failed",
+                )
+    finally:
+        # kept if the build was interrupted, to resume it
+        journal.close()
+
+    # workers may have finished ballots after the batch stopped: they
+    # aren't recorded, so they aren't kept
+    for task in batch.in_state(PENDING):
+        Path(new_ballot_dir, task.file).unlink(missing_ok=True)
+    # only the PDFs that were made; the rest are made next time
+    manifest = {
+        ballot_id: entry
+        for ballot_id, entry in manifest.items()
+        if batch.tasks[ballot_id].state in DONE
+    }
+    removed = remove_orphans(new_ballot_dir, previous, manifest)
+    if incremental:
+        logging.info(
+            f"{len(unchanged)} ballot styles unchanged, "
+            f"{removed} PDFs removed."
+        )
+    write_manifest(new_ballot_dir, manifest)
+    # the manifest has it all now
+    journal.remove()
+    batch.end()
+    batch.report()
+    return batch
@@ -0,0 +1,148 @@
+# combined.py
+# Many ballot styles in one PDF, for a print vendor. Fonts, images and
+# the drawing of each distinct ballot are stored once, as forms, and
+# drawn on the pages of every style that uses them; each style has an
+# outline entry, and an index lists its pages.
+
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Union
+
+from electos.ballotmaker.ballots.ballot_layout import (
+    PageFormCanvas,
+    layout_ballot_forms,
+)
+from electos.ballotmaker.ballots.batch import FAILED, RENDERED, BallotBatch
+from electos.ballotmaker.ballots.build_ballots import make_ballot_dir
+from electos.ballotmaker.ballots.fingerprint import (
+    ballot_fingerprint,
+    get_election_header,
+)
+from electos.ballotmaker.data.models import BallotStyleData, ElectionData
+from electos.ballotmaker.timing import span
+
+COMBINED_NAME = "ballots"
+
+
+def write_combined(
+    ballot_styles: List[BallotStyleData],
+    election_header: dict,
+    output: Union[str, Path, BinaryIO],
+    dedup: bool = True,
+) -> List[Dict]:
+    """Render ballot styles one after another in one PDF
+    Requires:
+        ballot_styles: the ballot styles, in page order
+        election_header: shared header data, see 'get_election_header'
+        output: PDF file name, or a writable binary stream
+    Optional:
+        dedup: draw identical ballot styles from the same forms
+    Returns:
+        The index: the ID and first and last page of each ballot style
+    """
+    canvas = PageFormCanvas(output)
+    # page forms by ballot fingerprint
+    laid_out = {}
+    index = []
+    for number, ballot_data in enumerate(ballot_styles, start=1):
+        fingerprint = (
+            ballot_fingerprint(ballot_data, election_header)
+            if dedup
+            else ballot_data.id
+        )
+        page_forms = laid_out.get(fingerprint)
+        if page_forms is None:
+            page_forms = layout_ballot_forms(
+                ballot_data,
+                election_header,
+                canvas,
+                form_prefix=f"Ballot{len(laid_out) + 1}Page",
+            )
+            laid_out[fingerprint] = page_forms
+        else:
+            logging.info(f"Ballot for {ballot_data.id} is the same as before")
+        first_page = canvas.getPageNumber()
+        # style IDs needn't be valid PDF names, the outline shows them
+        key = f"BallotStyle{number}"
+        canvas.bookmarkPage(key)
+        canvas.addOutlineEntry(ballot_data.id, key, level=0)
+        for page_form in page_forms:
+            canvas.doForm(page_form)
+            canvas.showPage()
+        index.append(
+            {
+                "id": ballot_data.id,
+                "first_page": first_page,
+                "last_page": first_page + len(page_forms) - 1,
+            }
+        )
+    canvas.setTitle(f"Ballots for {election_header['Name']}")
+    canvas.showOutline()
+    canvas.save()
+    return index
+
+
+def build_combined(
+    election: ElectionData,
+    output_dir: Path = None,
+    dedup: bool = True,
+) -> BallotBatch:
+    """Render every ballot style in an election in one PDF
+    The PDF and its index, a JSON file of the same name listing the
+    pages of each ballot style, are named for the time of the run.
+    Optional:
+        output_dir: write the PDF here instead of a new time-stamped
+            directory
+        dedup: draw identical ballot styles from the same forms
+    Returns:
+        The batch, with one task: the combined PDF; with no tasks if the
+            election has no ballot styles
+    """
+    date_time = datetime.now().strftime("%Y_%m_%dT%H%M%S")
+    if output_dir is None:
+        output_dir = make_ballot_dir(date_time)
+    else:
+        output_dir = Path(output_dir)
+        logging.info(f"Ballots will be saved in {output_dir}")
+        output_dir.mkdir(parents=True, exist_ok=True)
+    batch = BallotBatch(output_dir)
+    if not election.ballot_styles:
+        # an empty shard, say: no PDF, and nothing failed
+        logging.warning("No ballot styles to combine, no PDF made")
+        batch.end()
+        return batch
+    election_header = get_election_header(election)
+    combined_file = Path(output_dir, f"{COMBINED_NAME}_{date_time}.pdf")
+    batch.add(combined_file.name, combined_file.name)
+
+    start = time.perf_counter()
+    try:
+        with span("render", ballot_styles=len(election.ballot_styles)):
+            index = write_combined(
+                election.ballot_styles, election_header, combined_file, dedup
+            )
+    except Exception as ex:
+        logging.exception(f"Rendering {combined_file.name} failed")
+        combined_file.unlink(missing_ok=True)
+        error = f"{type(ex).__name__}: {ex}"
+        batch.finish(
+            combined_file.name, FAILED, time.perf_counter() - start, error
+        )
+    else:
+        combined_file.with_suffix(".json").write_text(
+            json.dumps(
+                {"file": combined_file.name, "ballot_styles": index}, indent=4
+            )
+        )
+        batch.finish(combined_file.name, RENDERED, time.perf_counter() - start)
+    batch.end()
+    if batch.ok:
+        logging.info(
+            f"Made {len(election.ballot_styles)} ballot styles in "
+            f"{combined_file.name}, {index[-1]['last_page']} pages, "
+            f"in {batch.seconds:.2f} s"
+        )
+    return batch
@@ -1,12 +1,13 @@
 # format a ballot contest.
 import logging
+from collections import OrderedDict
 
+from electos.ballotmaker.ballots.fingerprint import content_hash
 from electos.ballotmaker.ballots.page_layout import PageLayout
 from electos.ballotmaker.data.models import (
     BallotMeasureContestData,
     CandidateContestData,
 )
-from reportlab.graphics.shapes import Drawing, Ellipse, _DrawingEditorMixin
 from reportlab.lib.colors import black, white, yellow
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfbase import pdfform
@@ -43,6 +44,9 @@ ANNOTATION_FLAGS = "noview hidden"
 
 BALLOT_MEASURE_INSTRUCT = "Vote yes or no"
 
+# built contest tables kept for reuse by later ballots
+CONTEST_CACHE_SIZE = 2048
+
 # define styles
 # fill colors
 light = PageLayout.light
@@ -115,8 +119,34 @@ def build_contest_list(
     return contest_list
 
 
+class ContestTable(Table):
+    """
+    A contest table that can be laid out again in other documents
+    """
+
+    def __init__(
+        self, data, colWidths=None, rowHeights=None, style=None, **kw
+    ):
+        Table.__init__(self, data, colWidths, rowHeights, style=style, **kw)
+        self.contest_style = style
+
+    def clone(self):
+        """
+        Copy the table for use in another document. The cells are shared.
+        Once this table has been laid out, the copy takes its column
+        widths and row heights, so the cells aren't measured again.
+        """
+        return ContestTable(
+            self._cellvalues,
+            colWidths=self._colWidths,
+            rowHeights=self._rowHeights,
+            style=self.contest_style,
+            normalizedData=1,
+        )
+
+
 def build_candidate_table(contest_list):
-    return Table(
+    return ContestTable(
         data=contest_list,
         colWidths=(OVAL_WIDTH * 3, None),
         style=[
@@ -143,7 +173,7 @@ def build_candidate_table(contest_list):
 
 
 def build_ballot_measure_table(contest_list):
-    return Table(
+    return ContestTable(
         data=contest_list,
         colWidths=(OVAL_WIDTH * 3, None),
         style=[
@@ -172,26 +202,54 @@ def build_ballot_measure_table(contest_list):
     )
 
 
-class SelectionOval(_DrawingEditorMixin, Drawing):
-    def __init__(self, width=400, height=200, shift_up=False, *args, **kw):
-        Drawing.__init__(self, width, height, *args, **kw)
+# name of the oval's Form XObject, defined once in each document
+OVAL_FORM = "SelectionOval"
+
+
+def define_oval_form(canv):
+    """
+    Draw the selection oval into a reusable Form XObject,
+    from (0, 0) to twice the oval radii, plus half the line width
+    """
+    half_line = sm_line / 2
+    canv.beginForm(
+        OVAL_FORM,
+        -half_line,
+        -half_line,
+        (OVAL_WIDTH * 2) + half_line,
+        (OVAL_HEIGHT * 2) + half_line,
+    )
+    canv.setFillColor(white)  # yellow, white or black
+    canv.setStrokeColor(black)
+    canv.setLineWidth(sm_line)
+    canv.ellipse(0, 0, OVAL_WIDTH * 2, OVAL_HEIGHT * 2, stroke=1, fill=1)
+    canv.endForm()
+
+
+class SelectionOval(Flowable):
+    """
+    The oval to fill in for a selection. Every oval in a
+    document is a reference to the same Form XObject.
+    """
 
+    def __init__(self, shift_up=False):
         self.width = OVAL_WIDTH + PageLayout.border_pad
         self.height = OVAL_HEIGHT + PageLayout.border_pad
-        _vertical_shift = OVAL_UP if shift_up else OVAL_DOWN
+        self.shift_up = shift_up
+
+    def wrap(self, *args):
+        return (self.width, self.height)
+
+    def draw(self):
+        if not self.canv.hasForm(OVAL_FORM):
+            define_oval_form(self.canv)
+        _vertical_shift = OVAL_UP if self.shift_up else OVAL_DOWN
         oval_cx = (self.width / 2) + OVAL_INDENT
         oval_cy = (self.height / 2) - _vertical_shift
-        self._add(
-            self,
-            Ellipse(oval_cx, oval_cy, OVAL_WIDTH, OVAL_HEIGHT),
-            name="oval",
-            validate=None,
-            desc=None,
-        )
-        self.oval.fillColor = white  # yellow, white or black
-        self.oval.fillOpacity = SOLID_FILL
-        self.oval.strokeColor = black
-        self.oval.strokeWidth = sm_line
+        self.canv.saveState()
+        self.canv.translate(oval_cx - OVAL_WIDTH, oval_cy - OVAL_HEIGHT)
+        self.canv.doForm(OVAL_FORM)
+        self.canv.restoreState()
 
 
 class formCheckButton(Flowable):
@@ -329,7 +387,6 @@ class BallotMeasureLayout:
         self.choices = contest_data.choices
         logging.info(f"Ballot measure: {self.title}")
 
-        oval = SelectionOval()
         _selections = []
         for choose in self.choices:
             choice_text = f"<b>{choose.choice}</b>"
@@ -346,3 +403,32 @@ class BallotMeasureLayout:
             self.title, self.instruct, _selections, self.text
         )
         self.contest_table = build_ballot_measure_table(self.contest_list)
+
+
+_contest_tables = OrderedDict()
+
+
+def contest_table(contest_data) -> ContestTable:
+    """
+    Get the table flowable for a contest, building it once per run.
+    Statewide contests appear on many ballot styles with the same data,
+    so tables are cached by contest ID and a hash of the contest data.
+    ReportLab keeps layout state on flowables while building a document,
+    so every ballot gets its own clone of the most recent table.
+    """
+    key = (contest_data.id, content_hash(contest_data))
+    table = _contest_tables.get(key)
+    if table is None:
+        if isinstance(contest_data, CandidateContestData):
+            table = CandidateContestLayout(contest_data).contest_table
+        elif isinstance(contest_data, BallotMeasureContestData):
+            table = BallotMeasureLayout(contest_data).contest_table
+        else:
+            raise ValueError(f"Unknown contest type: {contest_data.type}")
+    else:
+        table = table.clone()
+    _contest_tables[key] = table
+    _contest_tables.move_to_end(key)
+    if len(_contest_tables) > CONTEST_CACHE_SIZE:
+        _contest_tables.popitem(last=False)
+    return table
@@ -0,0 +1,218 @@
+# copies.py
+# Print runs of a ballot style: each copy has its own serial number and
+# barcode. The style is laid out once per PDF, its pages kept as forms,
+# and each copy's pages draw those forms and stamp the serial number;
+# see 'layout_ballot_forms'.
+
+import json
+import logging
+import os
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, List, Union
+
+from electos.ballotmaker.ballots.ballot_layout import (
+    PageFormCanvas,
+    layout_ballot_forms,
+)
+from electos.ballotmaker.ballots.batch import (
+    FAILED,
+    PENDING,
+    RENDERED,
+    BallotBatch,
+)
+from electos.ballotmaker.ballots.build_ballots import make_ballot_dir
+from electos.ballotmaker.ballots.fingerprint import get_election_header
+from electos.ballotmaker.ballots.page_layout import PageLayout
+from electos.ballotmaker.ballots.workers import run_parallel
+from electos.ballotmaker.constants import COPIES_PER_FILE
+from electos.ballotmaker.data.models import BallotStyleData, ElectionData
+from electos.ballotmaker.timing import span
+from reportlab.graphics.barcode.code128 import Code128
+from reportlab.lib.units import inch
+from reportlab.pdfgen.canvas import Canvas
+
+SERIALS_NAME = "serials.json"
+SERIAL_DIGITS = 8
+
+# the serial number and its barcode go in the bottom margin
+STAMP_FONT_SIZE = 8
+BARCODE_HEIGHT = 0.25 * inch
+BARCODE_BOTTOM = 0.1 * inch
+
+
+def serial_numbers(first: int, count: int) -> List[str]:
+    return [f"{_:0{SERIAL_DIGITS}d}" for _ in range(first, first + count)]
+
+
+def copies_file_name(ballot_id: str, serials: List[str]) -> str:
+    return f"{ballot_id}_{serials[0]}-{serials[-1]}.pdf"
+
+
+def stamp_serial(canvas: Canvas, serial: str):
+    """Print a copy's serial number and its barcode"""
+    page_width = canvas._pagesize[0]
+    margin = PageLayout.margin * inch
+    canvas.setFont(PageLayout.font_normal, STAMP_FONT_SIZE)
+    canvas.drawString(margin, BARCODE_BOTTOM, f"Ballot {serial}")
+    barcode = Code128(serial, barHeight=BARCODE_HEIGHT, humanReadable=False)
+    barcode.drawOn(canvas, page_width - margin - barcode.width, BARCODE_BOTTOM)
+
+
+def write_copies(
+    ballot_data: BallotStyleData,
+    election_header: dict,
+    output: Union[str, Path, BinaryIO],
+    serials: List[str],
+):
+    """Write copies of a ballot style to one PDF, a serial number each
+    Requires:
+        ballot_data: the ballot style
+        election_header: shared header data, see 'get_election_header'
+        output: PDF file name, or a writable binary stream
+        serials: the serial number of each copy
+    """
+    ballot_label = ballot_data.id
+    canvas = PageFormCanvas(output)
+    page_forms = layout_ballot_forms(ballot_data, election_header, canvas)
+    with span("stamp_copies", ballot_style=ballot_label, copies=len(serials)):
+        for serial in serials:
+            # the stamp is the same on every page of a copy: draw it once
+            stamp = f"Serial{serial}"
+            canvas.beginForm(stamp)
+            stamp_serial(canvas, serial)
+            canvas.endForm()
+            for page_form in page_forms:
+                canvas.doForm(page_form)
+                canvas.doForm(stamp)
+                canvas.showPage()
+        canvas.save()
+
+
+def _try_write_copies(task: tuple) -> tuple:
+    """Write one PDF of copies, returning any error rather than raising it
+    Returns:
+        The task, the error (None if the PDF was made), seconds taken
+    """
+    ballot_data, election_header, copies_file, serials = task
+    start = time.perf_counter()
+    error = None
+    try:
+        with span("write_copies", ballot_style=ballot_data.id):
+            write_copies(ballot_data, election_header, copies_file, serials)
+    except Exception as ex:
+        logging.exception(f"Writing {Path(copies_file).name} failed")
+        error = f"{type(ex).__name__}: {ex}"
+    return task, error, time.perf_counter() - start
+
+
+def build_copies(
+    election: ElectionData,
+    copies: int,
+    output_dir: Path = None,
+    jobs: int = 1,
+    copies_per_file: int = COPIES_PER_FILE,
+    first_serial: int = 1,
+    keep_going: bool = False,
+    style_order: List[str] = None,
+) -> BallotBatch:
+    """Make a print run of copies of every ballot style in an election
+    Each copy has the next serial number, in ballot style order, starting
+    from first_serial. 'serials.json' in the output directory lists the
+    serial numbers in each PDF.
+    Requires:
+        copies: the number of copies of each ballot style
+    Optional:
+        output_dir: write the PDFs here instead of a new time-stamped
+            directory
+        jobs: number of rendering processes; 0 = one per CPU
+        copies_per_file: the most copies in one PDF; 0 = all of a style
+        keep_going: write every PDF it can, recording the ones that
+            fail, instead of stopping at the first failure
+        style_order: the IDs of every ballot style of the print run, in
+            order, when this makes only some of them (a shard); serial
+            numbers follow this order, so each shard has its own
+    Returns:
+        The batch, with a task for each PDF
+    """
+    date_time = datetime.now().strftime("%Y_%m_%dT%H%M%S")
+    if output_dir is None:
+        output_dir = make_ballot_dir(date_time)
+    else:
+        output_dir = Path(output_dir)
+        logging.info(f"Ballots will be saved in {output_dir}")
+        output_dir.mkdir(parents=True, exist_ok=True)
+    election_header = get_election_header(election)
+    if copies_per_file < 1:
+        copies_per_file = max(copies, 1)
+
+    batch = BallotBatch(output_dir)
+    tasks = []
+    serials = []
+    if style_order is None:
+        style_order = [_.id for _ in election.ballot_styles]
+    position = {ballot_id: _ for _, ballot_id in enumerate(style_order)}
+    for ballot_data in election.ballot_styles:
+        style_serial = first_serial + position[ballot_data.id] * copies
+        for first in range(0, copies, copies_per_file):
+            count = min(copies_per_file, copies - first)
+            chunk = serial_numbers(style_serial + first, count)
+            file_name = copies_file_name(ballot_data.id, chunk)
+            batch.add(file_name, file_name)
+            tasks.append(
+                (
+                    ballot_data,
+                    election_header,
+                    Path(output_dir, file_name),
+                    chunk,
+                )
+            )
+            serials.append(
+                {
+                    "id": ballot_data.id,
+                    "file": file_name,
+                    "first": chunk[0],
+                    "last": chunk[-1],
+                }
+            )
+
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(tasks))
+    with span("render", jobs=jobs):
+        if jobs > 1:
+            logging.info(
+                f"Writing {len(tasks)} PDFs of copies with {jobs} processes"
+            )
+            results = run_parallel(_try_write_copies, tasks, jobs)
+        else:
+            results = (_try_write_copies(task) for task in tasks)
+        with closing(results):
+            for task, error, seconds in results:
+                state = RENDERED if error is None else FAILED
+                batch.finish(Path(task[2]).name, state, seconds, error)
+                if error is not None and not keep_going:
+                    break
+
+    # only the PDFs that were finished
+    for task in batch.in_state(PENDING, FAILED):
+        Path(output_dir, task.file).unlink(missing_ok=True)
+    serials = [_ for _ in serials if batch.tasks[_["file"]].state == RENDERED]
+    Path(output_dir, SERIALS_NAME).write_text(
+        json.dumps({"copies": serials}, indent=4)
+    )
+    batch.end()
+    made = sum(int(_["last"]) - int(_["first"]) + 1 for _ in serials)
+    rate = f" ({made / batch.seconds:.0f} copies/s)" if batch.seconds else ""
+    logging.info(
+        f"Made {made} copies of {len(election.ballot_styles)} ballot styles "
+        f"in {len(serials)} PDFs in {batch.seconds:.2f} s{rate}"
+    )
+    if not batch.ok:
+        logging.error(
+            f"{len(batch.failed)} PDFs of copies failed, "
+            f"{len(batch.in_state(PENDING))} not made."
+        )
+    return batch
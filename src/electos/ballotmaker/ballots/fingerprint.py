@@ -0,0 +1,86 @@
+# fingerprint.py
+# Content hashes of ballot data: ballots with the same
+# fingerprint render to the same PDF
+
+import hashlib
+import json
+from dataclasses import asdict, is_dataclass
+from functools import lru_cache
+
+from electos.ballotmaker.ballots.files import FileTools
+from electos.ballotmaker.ballots.page_layout import PageLayout
+from electos.ballotmaker.constants import VERSION
+from electos.ballotmaker.data.models import BallotStyleData, ElectionData
+
+ASSET_PATH = "assets/img"
+
+
+def content_hash(*items) -> str:
+    """
+    Hash a sequence of dataclasses and JSON-compatible values
+    """
+    content = [asdict(item) if is_dataclass(item) else item for item in items]
+    text = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_election_header(election: ElectionData) -> dict:
+    """extract the shared data for ballot headers"""
+    name = election.name
+    end_date = election.end_date
+    election_type = election.type
+    return {
+        "Name": name,
+        "EndDate": end_date,
+        "Type": election_type,
+    }
+
+
+def ballot_fingerprint(
+    ballot_data: BallotStyleData, election_header: dict
+) -> str:
+    """
+    Hash everything printed on a ballot: the header, scope text,
+    contests and candidate order. The style ID only names the file.
+    """
+    ballot_content = asdict(ballot_data)
+    del ballot_content["id"]
+    return content_hash(election_header, ballot_content)
+
+
+def _asset_hashes() -> dict:
+    """Hash each image file a ballot may embed"""
+    img_dir = FileTools(rel_path=ASSET_PATH).full_path
+    return {
+        path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(img_dir.iterdir())
+        if path.is_file()
+    }
+
+
+def _layout_settings() -> dict:
+    """The PageLayout settings, including those without annotations"""
+    return {
+        name: value
+        for name, value in vars(PageLayout).items()
+        if not name.startswith("_") and not callable(value)
+    }
+
+
+@lru_cache(maxsize=None)
+def layout_hash() -> str:
+    """
+    Hash what every ballot shares besides its data: the program version,
+    page layout settings and asset files
+    """
+    return content_hash(VERSION, _layout_settings(), _asset_hashes())
+
+
+def ballot_inputs_hash(
+    ballot_data: BallotStyleData, election_header: dict
+) -> str:
+    """
+    Hash all the inputs of a ballot style's PDF, the style ID included:
+    if it's unchanged since the last build, so is the PDF
+    """
+    return content_hash(ballot_data, election_header, layout_hash())
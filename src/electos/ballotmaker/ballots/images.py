@@ -1,6 +1,8 @@
 # images.py
 # work with images, including embedding images into
 # Paragraph flowables
+from functools import lru_cache
+
 from electos.ballotmaker.ballots.files import FileTools
 
 # from reportlab.platypus import Image
@@ -9,6 +11,19 @@ from reportlab.lib import utils
 PROJECT_NAME = "ballotlab"
 
 
+@lru_cache(maxsize=None)
+def image_info(image_name, rel_img_path) -> tuple:
+    """Return the absolute path, width and height of an image file"""
+    image_file = FileTools(image_name, rel_img_path)
+    if image_file.file_found is False:
+        file_error = f"File {image_name} not found in {rel_img_path}"
+        raise FileNotFoundError(file_error)
+    image_full_path = image_file.abs_path_to_file
+    img = utils.ImageReader(image_full_path)
+    img_width, img_height = img.getSize()
+    return image_full_path, img_width, img_height
+
+
 class EmbeddedImage:
     """
     EmbeddedImage creates a text string with
@@ -21,24 +36,15 @@ class EmbeddedImage:
         self.rel_img_path = "assets/img"
         self.embed_text = ""
 
-        image_file = FileTools(self.image_name, self.rel_img_path)
-        self.file_check(image_file)
-        # retrieve the image and measure it
-        self.image_full_path = image_file.abs_path_to_file
-        img = utils.ImageReader(self.image_full_path)
-        img_width, img_height = img.getSize()
+        # find the image and measure it, once per image file
+        self.image_full_path, img_width, img_height = image_info(
+            self.image_name, self.rel_img_path
+        )
         aspect = img_height / float(img_width)
         # resize based on the new width
         self.new_height = round(new_width * aspect)
         self.embed_text = f'<para leading="{round(self.new_height / 1.9)}" spaceBefore="6" spaceAfter="12"><br /><img src="{self.image_full_path}" width="{round(new_width)}" height="{self.new_height}" valign="middle"/></para>'
 
-    def file_check(self, image_file):
-        if image_file.file_found is False:
-            file_error = (
-                f"File {self.image_name} not found in {self.rel_img_path}"
-            )
-            raise FileNotFoundError(file_error)
-
 
 if __name__ == "__main__":
     embed_img = EmbeddedImage("filled_bubble.png")
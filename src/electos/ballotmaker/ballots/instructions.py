@@ -1,6 +1,8 @@
 # instructions.py
 # Build the ballot instructions
 
+from functools import lru_cache
+
 from electos.ballotmaker.ballots.images import EmbeddedImage
 from electos.ballotmaker.ballots.page_layout import PageLayout
 from reportlab.lib.styles import getSampleStyleSheet
@@ -190,6 +192,15 @@ class Instructions:
         build_instruction_list()
 
 
+@lru_cache(maxsize=None)
+def get_instructions() -> Instructions:
+    """
+    The instructions are the same on every ballot:
+    build them once per process and share the flowables
+    """
+    return Instructions()
+
+
 if __name__ == "__main__":
     instruct = Instructions()
     print(instruct.instruction_list)
@@ -0,0 +1,97 @@
+# journal.py
+# Record each ballot style as a build finishes it, so an interrupted
+# build can be resumed
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+JOURNAL_NAME = "journal.jsonl"
+
+log = logging.getLogger(__name__)
+
+
+def read_journal(output_dir: Path) -> Dict[str, dict]:
+    """
+    Read the entries of the ballot styles an interrupted build finished,
+    in the form of manifest entries; empty if there's no journal
+    """
+    journal_path = Path(output_dir, JOURNAL_NAME)
+    entries = {}
+    try:
+        lines = journal_path.read_text().splitlines()
+    except FileNotFoundError:
+        return entries
+    except (OSError, ValueError) as ex:
+        log.warning(f"Ignoring unreadable journal {journal_path}: {ex}")
+        return entries
+    for number, line in enumerate(lines, start=1):
+        try:
+            record = json.loads(line)
+            ballot_id = record.pop("id")
+            state = record.pop("state")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # the last line of a build that was killed may be cut short
+            log.warning(f"Ignoring line {number} of journal {journal_path}")
+            continue
+        record.pop("error", None)
+        if state == "failed":
+            entries.pop(ballot_id, None)
+        else:
+            entries[ballot_id] = record
+    return entries
+
+
+class BallotJournal:
+    """
+    The ballot styles a build has finished, one JSON line each, appended
+    and flushed to disk as each is done
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = Path(output_dir, JOURNAL_NAME)
+        self._file = None
+
+    def start(self, entries: Dict[str, dict]):
+        """Start a journal with the entries carried over from earlier builds"""
+        # write then rename so a journal is never lost half written
+        partial = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with partial.open("w") as journal:
+            for ballot_id, entry in entries.items():
+                journal.write(self._line(ballot_id, "unchanged", entry))
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(partial, self.path)
+        self._file = self.path.open("a")
+
+    def _line(
+        self, ballot_id: str, state: str, entry: dict, error: str = None
+    ) -> str:
+        record = {"id": ballot_id, "state": state, **entry}
+        if error is not None:
+            record["error"] = error
+        return f"{json.dumps(record)}\n"
+
+    def record(
+        self,
+        ballot_id: str,
+        state: str,
+        entry: dict,
+        error: Optional[str] = None,
+    ):
+        """Add a finished ballot style: one line, written in one call"""
+        self._file.write(self._line(ballot_id, state, entry, error))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the journal once the manifest records the build"""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,77 @@
+# manifest.py
+# Record which PDF holds each ballot style in an output directory
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
+
+log = logging.getLogger(__name__)
+
+
+def write_manifest(output_dir: Path, ballots: dict) -> Path:
+    """
+    Write the manifest, a mapping of ballot style ID to its entry:
+        file: PDF file name, relative to the output directory
+        fingerprint: ballot content hash
+        source: ID of the style that was rendered for this file
+        inputs: hash of everything the PDF was made from, see
+            'ballot_inputs_hash'
+    """
+    manifest_path = Path(output_dir, MANIFEST_NAME)
+    manifest = {"ballots": ballots}
+    # write then rename: a build that's stopped part way through writing
+    # leaves the last manifest, not half of this one
+    partial = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+    partial.write_text(json.dumps(manifest, indent=4))
+    os.replace(partial, manifest_path)
+    return manifest_path
+
+
+def read_manifest(output_dir: Path) -> dict:
+    """
+    Read the ballot entries of an output directory's manifest;
+    empty if there's no manifest or it can't be read
+    """
+    manifest_path = Path(output_dir, MANIFEST_NAME)
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        ballots = manifest["ballots"]
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError, TypeError) as ex:
+        log.warning(f"Ignoring unreadable manifest {manifest_path}: {ex}")
+        return {}
+    return ballots if isinstance(ballots, dict) else {}
+
+
+def alias_ballot(source: Path, alias: Path):
+    """Give an identical ballot its own file name, without rendering it"""
+    # an earlier build may have left a file with this name
+    alias.unlink(missing_ok=True)
+    try:
+        os.link(source, alias)
+    except OSError:
+        # no hard links on this file system
+        shutil.copyfile(source, alias)
+
+
+def remove_orphans(output_dir: Path, previous: dict, manifest: dict) -> int:
+    """Delete the PDFs of an earlier build that no ballot style uses now"""
+    in_use = {entry["file"] for entry in manifest.values()}
+    removed = 0
+    for entry in previous.values():
+        file_name = Path(entry.get("file", "")).name
+        if not file_name or file_name in in_use:
+            continue
+        orphan = Path(output_dir, file_name)
+        if orphan.is_file():
+            log.info(f"Removing {file_name}, no longer needed")
+            orphan.unlink()
+            removed += 1
+        # styles sharing a file share its name, remove it once
+        in_use.add(file_name)
+    return removed
@@ -0,0 +1,191 @@
+# shards.py
+# Split ballot production across build machines: a plan assigns each
+# ballot style to one of N shards, each shard is made on its own, and
+# the shards' output directories are merged
+
+import heapq
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from electos.ballotmaker.ballots.fingerprint import (
+    ballot_fingerprint,
+    get_election_header,
+)
+from electos.ballotmaker.ballots.journal import JOURNAL_NAME
+from electos.ballotmaker.ballots.manifest import (
+    alias_ballot,
+    read_manifest,
+    remove_orphans,
+    write_manifest,
+)
+from electos.ballotmaker.data.models import (
+    BallotStyleData,
+    CandidateContestData,
+    ElectionData,
+)
+
+PLAN_VERSION = 1
+
+log = logging.getLogger(__name__)
+
+
+def style_cost(ballot_data: BallotStyleData) -> int:
+    """
+    Estimate the work of rendering a ballot style: a page, then each
+    contest and each of its candidates or choices
+    """
+    selections = sum(
+        len(contest.candidates)
+        if isinstance(contest, CandidateContestData)
+        else len(contest.choices)
+        for contest in ballot_data.contests
+    )
+    return 1 + len(ballot_data.contests) + selections
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Read a shard as 'k/N': shard k (counting from 1) of N"""
+    try:
+        number, count = (int(_) for _ in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"A shard is k/N, like 2/8, not '{shard}'")
+    if not 1 <= number <= count:
+        raise ValueError(
+            f"Shard {shard} isn't one of 1/{count} to {count}/{count}"
+        )
+    return number, count
+
+
+def plan_shards(
+    election: ElectionData, shards: int, edf_hash: str = None
+) -> dict:
+    """
+    Assign the ballot styles of an election to shards of about the same
+    estimated cost
+    Identical ballot styles go to the same shard, where they are
+    rendered once; the groups are placed most costly first, each on the
+    shard with the least work so far.
+    """
+    if shards < 1:
+        raise ValueError(f"Can't plan {shards} shards")
+    header = get_election_header(election)
+    styles = []
+    groups = {}
+    for ballot_data in election.ballot_styles:
+        fingerprint = ballot_fingerprint(ballot_data, header)
+        style = {
+            "id": ballot_data.id,
+            "contests": len(ballot_data.contests),
+            "candidates": sum(
+                len(_.candidates) for _ in ballot_data.candidate_contests
+            ),
+            "cost": style_cost(ballot_data),
+            "fingerprint": fingerprint,
+        }
+        styles.append(style)
+        groups.setdefault(fingerprint, []).append(style)
+
+    # (work so far, shard number): the lowest shard number breaks ties,
+    # so the same styles always make the same plan
+    loads = [(0, number) for number in range(1, shards + 1)]
+    order = sorted(groups.values(), key=lambda _: (-_[0]["cost"], _[0]["id"]))
+    for group in order:
+        load, number = heapq.heappop(loads)
+        for style in group:
+            style["shard"] = number
+        heapq.heappush(loads, (load + group[0]["cost"], number))
+
+    return {
+        "version": PLAN_VERSION,
+        "edf_hash": edf_hash,
+        "election": election.name,
+        "shards": shards,
+        "shard_costs": [load for load, _ in sorted(loads, key=lambda _: _[1])],
+        "ballot_styles": styles,
+    }
+
+
+def shard_styles(plan: dict, number: int) -> Set[str]:
+    """The IDs of the ballot styles of one shard of a plan"""
+    return {_["id"] for _ in plan["ballot_styles"] if _["shard"] == number}
+
+
+def select_shard(election: ElectionData, plan: dict, number: int):
+    """Keep only the ballot styles of one shard of the plan"""
+    selected = shard_styles(plan, number)
+    election.ballot_styles = [
+        _ for _ in election.ballot_styles if _.id in selected
+    ]
+
+
+def write_plan(plan_path: Path, plan: dict) -> Path:
+    plan_path = Path(plan_path)
+    # write then rename, like the manifest: each machine reads the plan
+    partial = plan_path.with_suffix(f".{os.getpid()}.tmp")
+    partial.write_text(json.dumps(plan, indent=4))
+    os.replace(partial, plan_path)
+    return plan_path
+
+
+def read_plan(plan_path: Path) -> dict:
+    """Read a plan; ValueError if it isn't one"""
+    plan = json.loads(Path(plan_path).read_text())
+    if not isinstance(plan, dict) or plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"{plan_path} isn't a ballot plan")
+    return plan
+
+
+def merge_shards(
+    shard_dirs: List[Path], output_dir: Path, plan: dict = None
+) -> Tuple[Dict[str, dict], List[str]]:
+    """
+    Combine the ballots made by each shard in one output directory, with
+    one manifest; the PDFs are linked, or copied if they can't be
+    Returns:
+        The merged manifest
+        The IDs of the ballot styles in the plan that no shard made
+    Raises:
+        ValueError if two shards made the same ballot style
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(output_dir)
+    merged = {}
+    made_by = {}
+    for shard_dir in shard_dirs:
+        shard_dir = Path(shard_dir)
+        if Path(shard_dir, JOURNAL_NAME).exists():
+            log.warning(f"The build in {shard_dir} didn't finish")
+        manifest = read_manifest(shard_dir)
+        if not manifest:
+            log.warning(f"No ballots listed in {shard_dir}")
+        for ballot_id, entry in manifest.items():
+            if ballot_id in merged:
+                raise ValueError(
+                    f"Ballot style {ballot_id} was made in both "
+                    f"{made_by[ballot_id]} and {shard_dir}"
+                )
+            # only file names are recorded, never paths outside the directory
+            file_name = Path(entry.get("file", "")).name
+            source = Path(shard_dir, file_name)
+            if not file_name or not source.is_file():
+                log.error(
+                    f"No PDF for ballot style {ballot_id} in {shard_dir}"
+                )
+                continue
+            target = Path(output_dir, file_name)
+            if not target.exists() or not target.samefile(source):
+                alias_ballot(source, target)
+            merged[ballot_id] = dict(entry, file=file_name)
+            made_by[ballot_id] = shard_dir
+    missing = []
+    if plan is not None:
+        missing = [
+            _["id"] for _ in plan["ballot_styles"] if _["id"] not in merged
+        ]
+    write_manifest(output_dir, merged)
+    remove_orphans(output_dir, previous, merged)
+    return merged, missing
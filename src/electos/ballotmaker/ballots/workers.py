@@ -0,0 +1,107 @@
+# workers.py
+# Ballot rendering processes. Each task runs in a worker that has already
+# built the ReportLab styles and frames; its log records and timing spans
+# go back to the parent with its result, to replay there in task order.
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator
+
+from electos.ballotmaker.ballots.ballot_layout import (
+    build_ballot,
+    render_ballot,
+)
+from electos.ballotmaker.timing import span, timings
+
+
+class RecordCollector(logging.Handler):
+    """Hold log records in a worker until they are sent to the parent"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        # format now: args and tracebacks may not survive pickling
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        self.records.append(record)
+
+
+collector = RecordCollector()
+
+
+def init_worker():
+    """Set up a ballot rendering process, run once per worker"""
+    # ballot_layout and contest_layout build their ReportLab styles
+    # and frames at import time; import them here, not per ballot
+    from electos.ballotmaker.ballots import ballot_layout  # noqa: F401
+
+    # route all logging to the collector, the parent emits it in order
+    root = logging.getLogger()
+    root.handlers = [collector]
+    root.setLevel(logging.INFO)
+    # each task's spans go back to the parent, which keeps them if it's
+    # profiling
+    timings.enabled = True
+
+
+def run_task(function: Callable, task: tuple) -> tuple:
+    """Run a task in a worker process
+    Returns:
+        function(task), with the task's log records and timing spans
+    """
+    collector.records = []
+    timings.clear()
+    result = function(task)
+    return result, collector.records, timings.spans
+
+
+def replay(outcome: tuple):
+    """Emit a task's log records and keep its spans, in the parent
+    Requires:
+        outcome: what 'run_task' returned
+    Returns:
+        The task's result
+    """
+    result, records, spans = outcome
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+    timings.extend(spans)
+    return result
+
+
+def run_parallel(function: Callable, tasks: list, jobs: int) -> Iterator:
+    """Run function(task) in a pool of worker processes for each task,
+    yielding the results in task order
+    Closing the generator early cancels the tasks not yet started.
+    """
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker
+    ) as executor:
+        futures = [executor.submit(run_task, function, _) for _ in tasks]
+        try:
+            # in task order, so logs replay as they would serially
+            for future in futures:
+                yield replay(future.result())
+        finally:
+            # stopped early: don't start the tasks still waiting
+            for future in futures:
+                future.cancel()
+
+
+def build_ballot_task(task: tuple) -> str:
+    """Render one ballot style to its PDF file, see 'build_ballot'"""
+    with span("build_ballot", ballot_style=task[0].id):
+        return build_ballot(*task)
+
+
+def render_ballot_task(task: tuple) -> bytes:
+    """Render one ballot style to PDF bytes, see 'render_ballot'"""
+    with span("build_ballot", ballot_style=task[0].id):
+        return render_ballot(*task)
@@ -3,16 +3,86 @@ import logging
 import sys
 from os import strerror
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
-from electos.ballotmaker import demo_ballots, make_ballots, validate_edf
-from electos.ballotmaker.constants import NO_ERRORS, PROGRAM_NAME, VERSION
+from electos.ballotmaker import timing
+from electos.ballotmaker.constants import (
+    COPIES_PER_FILE,
+    NO_DATA,
+    NO_ERRORS,
+    PROGRAM_NAME,
+    RENDER_FAILED,
+    SERVE_PORT,
+    VERSION,
+)
 
 EDF_HELP = "EDF file with ballot data (JSON format)"
-PDF_OUTPUT_HELP = "EDF file with ballot data (JSON format)"
-STYLE_HELP = "Stylesheet file for ballot generation"
+PDF_OUTPUT_HELP = "Directory for the ballot PDF files"
+STYLE_HELP = "Stylesheet file for ballot generation (not used yet)"
+STYLE_ID_HELP = "Only make ballot styles with this ID (wildcards allowed)"
+GP_UNIT_HELP = (
+    "Only make ballot styles for GP units with this name (wildcards allowed)"
+)
 VERSION_HELP = "Print the version number."
+JOBS_HELP = "Number of processes for rendering ballots (0 = one per CPU)"
+CACHE_HELP = "Reuse ballot data extracted from the same EDF in earlier runs"
+DEDUP_HELP = "Render identical ballot styles once and link the copies"
+INCREMENTAL_HELP = (
+    "Re-render only the ballot styles that changed since the last build "
+    "in --output-dir"
+)
+RESUME_HELP = (
+    "Resume the interrupted build in this directory, keeping the ballots "
+    "it finished"
+)
+KEEP_GOING_HELP = (
+    "Render every ballot style, recording the ones that fail, "
+    "instead of stopping at the first"
+)
+CHECK_HELP = (
+    "Check the EDF against the NIST schema and its @id references first"
+)
+SHARD_HELP = "Only make shard k of N of the ballot styles, given as k/N"
+PLAN_HELP = "Shard plan to take the ballot styles of --shard from"
+SHARDS_HELP = "Number of shards to divide the ballot styles into"
+PLAN_OUTPUT_HELP = "File to write the shard plan to (JSON format)"
+SHARD_DIRS_HELP = "Output directories of the shards to merge"
+MERGE_OUTPUT_HELP = "Directory for the merged ballots"
+MERGE_PLAN_HELP = "Shard plan to check that every ballot style was made"
+COPIES_HELP = (
+    "Make this many copies of each ballot style, each with its own serial "
+    "number and barcode"
+)
+COPIES_PER_FILE_HELP = "The most copies in one PDF (0 = all of a style)"
+FIRST_SERIAL_HELP = "Serial number of the first copy"
+COMBINED_HELP = (
+    "Make one PDF of all the ballot styles, with an outline and an index "
+    "of their pages, instead of a PDF each"
+)
+PROFILE_HELP = "Print the time spent in each stage and on each ballot style"
+PROFILE_STATS_HELP = "Write cProfile statistics (for pstats) to this file"
+TIMING_REPORT_HELP = "Write the stage and ballot style timings as JSON"
+VALIDATE_EDF_HELP = (
+    "EDF file, or directory of EDF files, to validate; repeat for more"
+)
+VALIDATE_JOBS_HELP = "Number of processes validating EDFs (0 = one per CPU)"
+DUMP_HELP = "Write the ballot data of each EDF before its summary line"
+SCHEMA_HELP = "Check each EDF against the NIST schema before extracting it"
+REFERENCES_HELP = (
+    "Check that each @id reference is to an object of the right type"
+)
+HOST_HELP = "Loopback address to listen on; there's no authentication"
+PORT_HELP = "Port to listen on"
+SERVE_JOBS_HELP = "Number of warm rendering processes (0 = one per CPU)"
+SERVE_OUTPUT_HELP = "Directory for the ballots of each render job"
+ROOT_HELP = (
+    "Directory with the EDFs and output directories jobs can name "
+    "(jobs can't name files without it)"
+)
+
+# Command modules are imported by their commands: they bring in ReportLab
+# and the NIST models, which '--version' and 'validate' don't need.
 
 # configure logging
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
@@ -25,6 +95,31 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+def exclusive_with(other: str):
+    """A callback for an option that can't be used with option 'other'"""
+
+    def callback(ctx: typer.Context, value):
+        # options are processed in command line order, each checks
+        if value is not None and ctx.params.get(other) is not None:
+            option = other.replace("_", "-")
+            raise typer.BadParameter(f"can't be used with --{option}")
+        return value
+
+    return callback
+
+
+def shard_callback(value: Optional[str]):
+    """Read --shard k/N as (k, N)"""
+    if value is None:
+        return None
+    from electos.ballotmaker.ballots.shards import parse_shard
+
+    try:
+        return parse_shard(value)
+    except ValueError as ex:
+        raise typer.BadParameter(str(ex))
+
+
 # to display help when no arguments are provided,
 # main needs to be a callback, not a command
 app = typer.Typer(no_args_is_help=True)
@@ -32,18 +127,63 @@ app = typer.Typer(no_args_is_help=True)
 
 @app.callback()
 def main(
+    ctx: typer.Context = None,
     version: Optional[bool] = typer.Option(
         None, "--version", callback=version_callback, help=VERSION_HELP
     ),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_HELP),
+    profile_stats: Path = typer.Option(None, help=PROFILE_STATS_HELP),
+    timing_report: Path = typer.Option(None, help=TIMING_REPORT_HELP),
 ):
+    # called directly rather than from the command line: nothing to time
+    if ctx is None:
+        return NO_ERRORS
+    if profile or profile_stats or timing_report:
+        # reported when the command finishes
+        ctx.with_resource(
+            timing.profile_run(profile, profile_stats, timing_report)
+        )
     return NO_ERRORS
 
 
 @app.command()
-def demo():
+def demo(
+    jobs: int = typer.Option(1, help=JOBS_HELP),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help=CACHE_HELP),
+    dedup: bool = typer.Option(True, "--dedup/--no-dedup", help=DEDUP_HELP),
+    style: List[str] = typer.Option(None, help=STYLE_ID_HELP),
+    gp_unit: List[str] = typer.Option(None, help=GP_UNIT_HELP),
+    output_dir: Path = typer.Option(
+        None, callback=exclusive_with("resume"), help=PDF_OUTPUT_HELP
+    ),
+    incremental: bool = typer.Option(False, help=INCREMENTAL_HELP),
+    resume: Path = typer.Option(
+        None,
+        exists=True,
+        file_okay=False,
+        callback=exclusive_with("output_dir"),
+        help=RESUME_HELP,
+    ),
+    keep_going: bool = typer.Option(False, help=KEEP_GOING_HELP),
+):
     """Make ballots from previously extracted EDF data"""
-    ballot_output_dir = demo_ballots.main()
-    typer.echo(f"Ballots created in output directory: {ballot_output_dir}")
+    if incremental and output_dir is None:
+        raise typer.BadParameter("--incremental needs an --output-dir")
+    if resume is not None:
+        # resuming is an incremental build of the same directory
+        output_dir, incremental = resume, True
+    from electos.ballotmaker import demo_ballots
+    from electos.ballotmaker.data.style_filter import BallotStyleFilter
+
+    style_filter = BallotStyleFilter(style, gp_unit)
+    batch = demo_ballots.main(
+        jobs, cache, dedup, style_filter, output_dir, incremental, keep_going
+    )
+    if batch is None:
+        raise typer.Exit(NO_DATA)
+    typer.echo(f"Ballots created in output directory: {batch.output_dir}")
+    if not batch.ok:
+        raise typer.Exit(RENDER_FAILED)
     return NO_ERRORS
 
 
@@ -53,33 +193,165 @@ def make(
         ...,
         help=EDF_HELP,
     ),
-    output_dir: Path = typer.Option(None, help=PDF_OUTPUT_HELP),
-    style: Path = typer.Option(None, help=STYLE_HELP),
+    output_dir: Path = typer.Option(
+        None, callback=exclusive_with("resume"), help=PDF_OUTPUT_HELP
+    ),
+    stylesheet: Path = typer.Option(None, help=STYLE_HELP),
+    style: List[str] = typer.Option(None, help=STYLE_ID_HELP),
+    gp_unit: List[str] = typer.Option(None, help=GP_UNIT_HELP),
+    jobs: int = typer.Option(1, help=JOBS_HELP),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help=CACHE_HELP),
+    dedup: bool = typer.Option(True, "--dedup/--no-dedup", help=DEDUP_HELP),
+    incremental: bool = typer.Option(False, help=INCREMENTAL_HELP),
+    resume: Path = typer.Option(
+        None,
+        exists=True,
+        file_okay=False,
+        callback=exclusive_with("output_dir"),
+        help=RESUME_HELP,
+    ),
+    keep_going: bool = typer.Option(False, help=KEEP_GOING_HELP),
+    check: bool = typer.Option(False, "--check", help=CHECK_HELP),
+    shard: str = typer.Option(None, callback=shard_callback, help=SHARD_HELP),
+    plan: Path = typer.Option(
+        None, exists=True, dir_okay=False, help=PLAN_HELP
+    ),
+    copies: int = typer.Option(0, min=0, help=COPIES_HELP),
+    copies_per_file: int = typer.Option(
+        COPIES_PER_FILE, min=0, help=COPIES_PER_FILE_HELP
+    ),
+    first_serial: int = typer.Option(1, min=0, help=FIRST_SERIAL_HELP),
+    combined: bool = typer.Option(False, "--combined", help=COMBINED_HELP),
 ):
     """Make ballots from EDF file"""
-    make_ballots_result = make_ballots.make_ballots(edf, output_dir, style)
+    if incremental and output_dir is None:
+        raise typer.BadParameter("--incremental needs an --output-dir")
+    if plan is not None and shard is None:
+        raise typer.BadParameter("--plan needs a --shard")
+    if resume is not None:
+        # resuming is an incremental build of the same directory
+        output_dir, incremental = resume, True
+    from electos.ballotmaker import make_ballots
+
+    make_ballots_result = make_ballots.make_ballots(
+        edf,
+        output_dir,
+        _styles=stylesheet,
+        _style_ids=style,
+        _gp_units=gp_unit,
+        jobs=jobs,
+        use_cache=cache,
+        dedup=dedup,
+        incremental=incremental,
+        check=check,
+        keep_going=keep_going,
+        shard=shard,
+        plan=plan,
+        copies=copies,
+        copies_per_file=copies_per_file,
+        first_serial=first_serial,
+        combined=combined,
+    )
     if make_ballots_result != NO_ERRORS:
         log.error(
             f"Code {make_ballots_result} in make - {strerror(make_ballots_result)}"
         )
+        raise typer.Exit(make_ballots_result)
     return make_ballots_result
 
 
 @app.command()
-def validate(
+def plan(
     edf: Path = typer.Option(
         ...,
         help=EDF_HELP,
     ),
+    shards: int = typer.Option(..., min=1, help=SHARDS_HELP),
+    plan: Path = typer.Option(
+        Path("ballot_plan.json"), dir_okay=False, help=PLAN_OUTPUT_HELP
+    ),
+    style: List[str] = typer.Option(None, help=STYLE_ID_HELP),
+    gp_unit: List[str] = typer.Option(None, help=GP_UNIT_HELP),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help=CACHE_HELP),
 ):
-    """Validate data in EDF file by extracting data needed for ballot generation"""
-    validate_edf_result = validate_edf.validate_edf(edf)
+    """Divide the ballot styles of an EDF into shards to make on separate machines"""
+    from electos.ballotmaker import shard_ballots
+
+    plan_result = shard_ballots.plan_ballots(
+        edf, plan, shards, style, gp_unit, cache
+    )
+    if plan_result != NO_ERRORS:
+        log.error(f"Code {plan_result} in plan - {strerror(plan_result)}")
+        raise typer.Exit(plan_result)
+    return plan_result
+
+
+@app.command()
+def merge(
+    shard_dir: List[Path] = typer.Argument(
+        ..., exists=True, file_okay=False, help=SHARD_DIRS_HELP
+    ),
+    output_dir: Path = typer.Option(..., help=MERGE_OUTPUT_HELP),
+    plan: Path = typer.Option(
+        None, exists=True, dir_okay=False, help=MERGE_PLAN_HELP
+    ),
+):
+    """Merge the ballots made by each shard into one output directory"""
+    from electos.ballotmaker import shard_ballots
+
+    merge_result = shard_ballots.merge_ballots(shard_dir, output_dir, plan)
+    if merge_result != NO_ERRORS:
+        log.error(f"Code {merge_result} in merge - {strerror(merge_result)}")
+        raise typer.Exit(merge_result)
+    return merge_result
+
+
+@app.command()
+def validate(
+    edf: List[Path] = typer.Option(
+        ...,
+        help=VALIDATE_EDF_HELP,
+    ),
+    jobs: int = typer.Option(1, help=VALIDATE_JOBS_HELP),
+    dump: bool = typer.Option(False, "--dump", help=DUMP_HELP),
+    schema: bool = typer.Option(
+        True, "--schema/--no-schema", help=SCHEMA_HELP
+    ),
+    references: bool = typer.Option(
+        True, "--references/--no-references", help=REFERENCES_HELP
+    ),
+):
+    """Validate EDF files against the NIST schema and by extracting the data needed for ballot generation"""
+    from electos.ballotmaker import validate_edf
+
+    # the summary lines are the output, keep progress logs out of them
+    logging.getLogger().setLevel(logging.WARNING)
+    validate_edf_result = validate_edf.validate_edfs(
+        edf, jobs, dump, schema=schema, references=references
+    )
     if validate_edf_result != NO_ERRORS:
-        log.error(
-            f"Code {validate_edf_result} in validate - {strerror(validate_edf_result)}"
-        )
+        # the errors are in the summary lines
+        raise typer.Exit(validate_edf_result)
     return validate_edf_result
 
 
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help=HOST_HELP),
+    port: int = typer.Option(SERVE_PORT, help=PORT_HELP),
+    jobs: int = typer.Option(0, help=SERVE_JOBS_HELP),
+    output_dir: Path = typer.Option(None, help=SERVE_OUTPUT_HELP),
+    root: Path = typer.Option(None, file_okay=False, help=ROOT_HELP),
+):
+    """Render ballots on request, from warm processes"""
+    from electos.ballotmaker import serve_ballots
+
+    serve_result = serve_ballots.serve(host, port, jobs, output_dir, root)
+    if serve_result != NO_ERRORS:
+        log.error(f"Code {serve_result} in serve - {strerror(serve_result)}")
+        raise typer.Exit(serve_result)
+    return serve_result
+
+
 if __name__ == "__main__":
     app()  # pragma: no cover
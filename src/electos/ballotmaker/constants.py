@@ -9,3 +9,12 @@ VERSION = "0.1.3"  # incremented September 20, 2022
 NO_ERRORS = 0
 NO_FILE = errno.ENOENT
 NO_DATA = errno.ENODATA
+INVALID_DATA = errno.EINVAL
+# some ballot styles couldn't be rendered
+RENDER_FAILED = errno.EIO
+
+# ballot copies with serial numbers written to each PDF, by default
+COPIES_PER_FILE = 1000
+
+# localhost port for 'ballotmaker serve'
+SERVE_PORT = 8642
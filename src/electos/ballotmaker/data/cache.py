@@ -0,0 +1,108 @@
+"""Persistent cache of extracted ballot data.
+
+Entries are keyed by a hash of the EDF bytes and the extractor version, and
+hold the pickled ballot data models, so a warm run skips EDF validation and
+extraction altogether. The cache is bounded in size: the least recently used
+entries are removed first.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from electos.ballotmaker.constants import PROGRAM_NAME
+from electos.ballotmaker.data.extractor import EXTRACTOR_VERSION
+from electos.ballotmaker.data.models import ElectionData
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = "cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_SUFFIX = ".pickle"
+
+_READ_SIZE = 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Cache directory in the program's directory under the user's home."""
+    return Path(Path.home(), PROGRAM_NAME, CACHE_DIR_NAME)
+
+
+def edf_cache_key(edf: Path) -> str:
+    """Hash the EDF contents and the extractor version."""
+    digest = hashlib.sha256(EXTRACTOR_VERSION.encode())
+    with edf.open("rb") as input:
+        for chunk in iter(lambda: input.read(_READ_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BallotDataCache:
+
+    """Size-bounded, least recently used store of extracted ballot data."""
+
+    def __init__(
+        self, cache_dir: Path = None, max_bytes: int = CACHE_MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir or default_cache_dir())
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return Path(self.cache_dir, f"{key}{CACHE_SUFFIX}")
+
+    def get(self, key: str) -> Optional[List[ElectionData]]:
+        """Return cached ballot data, or 'None' if there isn't any."""
+        entry = self._entry(key)
+        try:
+            data = entry.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            ballot_data = pickle.loads(data)
+        except Exception as ex:
+            # Unreadable entries (truncated, or from older models) are dropped.
+            log.warning(f"Discarding unreadable cache entry {entry}: {ex}")
+            entry.unlink(missing_ok=True)
+            return None
+        self._touch(entry)
+        return ballot_data
+
+    def put(self, key: str, ballot_data: List[ElectionData]):
+        """Store ballot data, then evict entries beyond the size limit."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(key)
+        # Write then rename so readers never see a partial entry.
+        partial = entry.with_suffix(f".{os.getpid()}.tmp")
+        partial.write_bytes(
+            pickle.dumps(ballot_data, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        os.replace(partial, entry)
+        self._touch(entry)
+        self.evict()
+
+    def _touch(self, entry: Path):
+        """Record use of an entry in its modification time, for eviction."""
+        # Set it explicitly: file system time stamps can be coarse.
+        now = time.time_ns()
+        os.utime(entry, ns=(now, now))
+
+    def evict(self):
+        """Remove least recently used entries until under the size limit."""
+        entries = []
+        for entry in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            log.debug(f"Evicting cache entry {entry}")
+            entry.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,228 @@
+"""Read the parts of an EDF that ballots need, without the rest.
+
+Election reports can carry results: vote counts for every selection in
+every reporting unit, ballot counts, map data. Ballots need none of it,
+but 'json.loads' on the file text holds the whole text and the whole
+dictionary in memory at once.
+
+'load_edf' reads the file in chunks. It decodes the values the ballot
+pipeline uses and steps over the others (counts, people, spatial data)
+without building them, so the text it has read is released as it goes.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict
+
+CHUNK_SIZE = 1024 * 1024
+
+# Rules for reading a value:
+# - SKIP: step over the value.
+# - A dictionary: read an object key by key, using the rule for each key.
+#   Keys without a rule are decoded whole.
+# - A list holding one rule: read an array, using the rule for each item.
+# - None: decode the value whole.
+SKIP = object()
+
+# The parts of an election report used by 'ElectionReport' and the
+# ballot data extractor.
+BALLOT_RULES = {
+    "Election": [
+        {
+            "BallotCounts": SKIP,
+            "BallotStyle": [None],
+            "Candidate": [None],
+            "Contest": [
+                {
+                    "ContestSelection": [{"VoteCounts": SKIP}],
+                    "CountStatus": SKIP,
+                    "OtherCounts": SKIP,
+                }
+            ],
+            "CountStatus": SKIP,
+        }
+    ],
+    "GpUnit": [
+        {
+            "CountStatus": SKIP,
+            "PartyRegistration": SKIP,
+            "SpatialDimension": SKIP,
+        }
+    ],
+    "Header": [None],
+    "Office": [None],
+    "OfficeGroup": SKIP,
+    "Party": [None],
+    "Person": SKIP,
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_PATTERN = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+# Text with no arrays or nested objects: scalars, strings, and objects
+# holding only those, like vote counts, skipped in one step. Written so
+# each character can match only one way, which keeps it from backtracking.
+_OTHER = r'[^{}\[\]"]*'
+_FLAT_OBJECT = rf"\{{{_OTHER}(?:{_STRING_PATTERN}{_OTHER})*\}}"
+_FLAT = re.compile(
+    rf"{_OTHER}(?:(?:{_STRING_PATTERN}|{_FLAT_OBJECT}){_OTHER})*", re.DOTALL
+)
+
+
+class _Reader:
+    """A JSON text read a chunk at a time"""
+
+    def __init__(self, stream, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = None) -> bool:
+        """Drop the text already read and read more, False at the end"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(size or 0, self.chunk_size))
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def _error(self, message: str):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """The next character that isn't white space, or '' at the end"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def decode(self):
+        """Decode the next value whole"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                # the value doesn't fit the buffer: at least double it
+                self._fill(len(self.buffer))
+                continue
+            # a number at the end of the buffer may continue in the file
+            if end < len(self.buffer) or not self._fill():
+                self.pos = end
+                return value
+
+    def _skip_string(self):
+        while True:
+            match = _STRING.match(self.buffer, self.pos)
+            if match:
+                self.pos = match.end()
+                return
+            if not self._fill():
+                raise self._error("Unterminated string")
+
+    def skip(self):
+        """Step over the next value without building it"""
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in "{[":
+            self.decode()
+            return
+        # step into the value, so '_FLAT' stops at its closing bracket
+        self.pos += 1
+        depth = 1
+        while True:
+            self.pos = _FLAT.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer):
+                if not self._fill():
+                    raise self._error("Unexpected end of data")
+                continue
+            char = self.buffer[self.pos]
+            if char == '"':
+                # split by the end of the buffer
+                self._skip_string()
+                continue
+            self.pos += 1
+            depth += 1 if char in "{[" else -1
+            if depth == 0:
+                return
+
+    def read(self, rule=None):
+        """Read the next value using a rule (see 'BALLOT_RULES')"""
+        if rule is SKIP:
+            self.skip()
+            return None
+        if isinstance(rule, dict) and self.peek() == "{":
+            return self._read_object(rule)
+        if isinstance(rule, list) and self.peek() == "[":
+            return self._read_array(rule[0])
+        return self.decode()
+
+    def _read_object(self, rules: dict) -> dict:
+        value = {}
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return value
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name")
+            key = self.decode()
+            self.expect(":")
+            rule = rules.get(key)
+            if rule is SKIP:
+                self.skip()
+            else:
+                value[key] = self.read(rule)
+            if self.peek() == "}":
+                self.pos += 1
+                return value
+            self.expect(",")
+
+    def _read_array(self, rule) -> list:
+        value = []
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return value
+        while True:
+            value.append(self.read(rule))
+            if self.peek() == "]":
+                self.pos += 1
+                return value
+            self.expect(",")
+
+
+def load_edf(
+    edf: Path, rules: dict = BALLOT_RULES, chunk_size: int = CHUNK_SIZE
+) -> Dict:
+    """Read an EDF, keeping only the parts ballots use
+    Requires:
+        EDF file (JSON format) edf: Path,
+    Optional:
+        rules: what to read and what to skip, see 'BALLOT_RULES'
+        chunk_size: characters to read at a time
+    Raises:
+        json.JSONDecodeError if the file isn't valid JSON
+    """
+    with open(edf, encoding="utf-8") as stream:
+        reader = _Reader(stream, chunk_size)
+        data = reader.read(rules)
+        if reader.peek():
+            raise reader._error("Extra data")
+    return data
@@ -0,0 +1,134 @@
+"""Check the references between the objects of an EDF.
+
+EDF objects refer to each other by '@id': a candidate to its party, a
+contest to its district, a ballot style to its contests. A reference to
+an '@id' that isn't there, or to an object of the wrong type, only shows
+up when ballot data is extracted, as an error deep in the extractor, and
+only the first one.
+
+'reference_errors' finds all of them in one walk over the EDF: it
+records every object by '@id' with its '@type', like 'ElementIndex', and
+every reference, then checks each reference. The fields that hold
+references, and the types they can refer to, are the ones the NIST
+schema marks with 'refTypes'.
+"""
+
+import json
+from functools import lru_cache
+from typing import Dict, FrozenSet, List
+
+from electos.ballotmaker.data.edf_schema import (
+    SchemaError,
+    format_path,
+    schema_file,
+)
+from electos.ballotmaker.timing import span
+
+# {object type: {field: the types it can refer to}}
+ReferenceFields = Dict[str, Dict[str, FrozenSet[str]]]
+
+
+def _ref_types(schema: dict):
+    ref_types = schema.get("refTypes")
+    if ref_types is None:
+        ref_types = schema.get("items", {}).get("refTypes")
+    return ref_types
+
+
+@lru_cache(maxsize=None)
+def reference_fields() -> ReferenceFields:
+    """The reference fields of each type in the bundled schema"""
+    schema = json.loads(schema_file().read_bytes())
+    fields = {}
+    for type_, definition in schema.get("definitions", {}).items():
+        for name, property_ in definition.get("properties", {}).items():
+            ref_types = _ref_types(property_)
+            if ref_types:
+                fields.setdefault(type_, {})[name] = frozenset(ref_types)
+    return fields
+
+
+class _Walk:
+    """The objects and references in an EDF, in one walk over it"""
+
+    def __init__(self, fields: ReferenceFields):
+        self.fields = fields
+        # {@id: (@type, path)}
+        self.objects = {}
+        # [(path, field value, allowed types)]: a field's references are
+        # checked together once the walk is done
+        self.references = []
+        self.errors = []
+
+    def value(self, value, path: tuple):
+        if isinstance(value, dict):
+            self.object(value, path)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, (dict, list)):
+                    self.value(item, (path, index))
+
+    def object(self, value: dict, path: tuple):
+        type_ = value.get("@type")
+        id_ = value.get("@id")
+        if isinstance(id_, str):
+            if id_ in self.objects:
+                other = format_path(self.objects[id_][1])
+                self.errors.append(
+                    (path, f"duplicate @id '{id_}', also at {other}")
+                )
+            else:
+                self.objects[id_] = type_, path
+        fields = self.fields.get(type_, {}) if isinstance(type_, str) else {}
+        for key, item in value.items():
+            allowed = fields.get(key)
+            if allowed is not None:
+                self.references.append(((path, key), item, allowed))
+            elif isinstance(item, (dict, list)):
+                self.value(item, (path, key))
+
+    def check(self) -> List[tuple]:
+        objects = self.objects
+        for path, item, allowed in self.references:
+            refs = item if isinstance(item, list) else [item]
+            for index, ref in enumerate(refs):
+                target = objects.get(ref) if isinstance(ref, str) else None
+                if target is None or target[0] not in allowed:
+                    if refs is item:
+                        self.error((path, index), ref, target, allowed)
+                    else:
+                        self.error(path, ref, target, allowed)
+        # in document order
+        self.errors.sort(key=lambda _: _path_key(_[0]))
+        return self.errors
+
+    def error(self, path: tuple, ref, target, allowed: FrozenSet[str]):
+        if not isinstance(ref, str):
+            # a reference that isn't a string is a schema error
+            return
+        if target is None:
+            message = f"refers to unknown @id '{ref}'"
+        else:
+            expected = " or ".join(sorted(allowed))
+            message = f"refers to {target[0]} '{ref}', not {expected}"
+        self.errors.append((path, message))
+
+
+def _path_key(path: tuple) -> list:
+    parts = []
+    while path:
+        path, part = path
+        parts.append((isinstance(part, str), part))
+    return parts[::-1]
+
+
+def reference_errors(edf_data: dict) -> List[SchemaError]:
+    """Check the references between the objects of EDF data
+    Returns:
+        Every dangling reference, reference to an object of the wrong
+        type and duplicate @id, as (JSON pointer, message) pairs
+    """
+    with span("reference_check"):
+        walk = _Walk(reference_fields())
+        walk.value(edf_data, ())
+        return [(format_path(path), message) for path, message in walk.check()]
@@ -0,0 +1,415 @@
+"""Validate EDFs against the bundled NIST election results JSON Schema.
+
+The schema is compiled to Python code: one function per definition, with
+every check the schema makes written out in line. Validation is then a
+single walk over the EDF that collects every error rather than stopping
+at the first. The code is compiled in memory, once per process: it's
+never read back from a file, so nothing else can change what it runs.
+
+The compiler handles the parts of JSON Schema (draft 4) the NIST schema
+uses: 'type', '$ref' to its definitions, 'properties', 'required',
+'additionalProperties' (boolean), 'items' (one schema), 'minItems',
+'enum', 'oneOf', 'pattern', 'maxLength' and the 'date', 'date-time' and
+'time' formats. Any other keyword or format raises 'SchemaCompileError',
+so a schema is never reported as checked when part of it isn't.
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from electos.ballotmaker.ballots.files import FileTools
+from electos.ballotmaker.timing import span
+
+SCHEMA_NAME = "NIST_V2_election_results_reporting.json"
+SCHEMA_PATH = "assets/schema"
+
+# The keywords the compiler writes checks for.
+KEYWORDS = frozenset(
+    {
+        "$ref",
+        "additionalProperties",
+        "enum",
+        "format",
+        "items",
+        "maxLength",
+        "minItems",
+        "oneOf",
+        "pattern",
+        "properties",
+        "required",
+        "type",
+    }
+)
+# Keywords that don't constrain a value. 'refTypes', the NIST extension
+# naming the types a reference can refer to, is checked by
+# 'data.edf_references'.
+ANNOTATIONS = frozenset(
+    {"$schema", "definitions", "description", "title", "refTypes"}
+)
+
+# Checks for the formats the NIST schema uses.
+FORMATS = {
+    "date": r"[0-9]{4}-[0-9]{2}-[0-9]{2}",
+    "date-time": (
+        r"[0-9]{4}-[0-9]{2}-[0-9]{2}[Tt ][0-9]{2}:[0-9]{2}:[0-9]{2}"
+        r"(\.[0-9]+)?([Zz]|[+-][0-9]{2}:[0-9]{2})?"
+    ),
+    "time": (
+        r"[0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]+)?([Zz]|[+-][0-9]{2}:[0-9]{2})?"
+    ),
+}
+# Formats accepted as they are, without a check.
+UNCHECKED_FORMATS = frozenset({"uri"})
+
+# 'isinstance' checks for JSON types: JSON booleans aren't numbers.
+_TYPE_CHECKS = {
+    "array": "isinstance({0}, list)",
+    "boolean": "isinstance({0}, bool)",
+    "integer": "(isinstance({0}, int) and not isinstance({0}, bool))",
+    "null": "{0} is None",
+    "number": "(isinstance({0}, (int, float)) and not isinstance({0}, bool))",
+    "object": "isinstance({0}, dict)",
+    "string": "isinstance({0}, str)",
+}
+
+SchemaError = Tuple[str, str]
+
+
+class SchemaCompileError(ValueError):
+
+    """The schema uses something the compiler doesn't handle."""
+
+
+class _Compiler:
+
+    """Generate the source of a validator for a schema."""
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self.lines = []
+        # values the generated code uses, by name: sets, patterns
+        self.constants = {}
+        # function names for definitions, and those still to write
+        self.functions = {}
+        self.pending = []
+        self.names = 0
+
+    def _name(self, prefix: str) -> str:
+        self.names += 1
+        return f"{prefix}{self.names}"
+
+    def _constant(self, prefix: str, value) -> str:
+        name = self._name(prefix)
+        self.constants[name] = value
+        return name
+
+    def _emit(self, indent: int, line: str):
+        self.lines.append(f"{'    ' * indent}{line}")
+
+    def _error(self, indent: int, path: str, message: str):
+        self._emit(indent, f"errors.append(({path}, {message!r}))")
+
+    def _definition(self, ref: str) -> str:
+        """The function validating a '$ref', written later if it's new"""
+        if not ref.startswith("#/definitions/"):
+            raise SchemaCompileError(f"Unsupported reference: {ref}")
+        if ref not in self.functions:
+            name = ref[len("#/definitions/") :]
+            if name not in self.schema.get("definitions", {}):
+                raise SchemaCompileError(f"Undefined reference: {ref}")
+            self.functions[ref] = self._name("_validate_")
+            self.pending.append(ref)
+        return self.functions[ref]
+
+    def _type_of(self, ref: str):
+        """The one '@type' a definition allows, if it has one"""
+        name = ref[len("#/definitions/") :]
+        definition = self.schema["definitions"][name]
+        enum = definition.get("properties", {}).get("@type", {}).get("enum")
+        return enum[0] if enum and len(enum) == 1 else None
+
+    def compile(self) -> str:
+        """Python source defining 'validate(value, errors)'"""
+        self._emit(0, "def validate(value, errors):")
+        self._emit(1, "path = ()")
+        self._subschema(self.schema, "value", "path", 1)
+        while self.pending:
+            ref = self.pending.pop()
+            name = ref[len("#/definitions/") :]
+            self._emit(0, "")
+            self._emit(0, f"def {self.functions[ref]}(value, path, errors):")
+            before = len(self.lines)
+            self._subschema(
+                self.schema["definitions"][name], "value", "path", 1
+            )
+            if len(self.lines) == before:
+                self._emit(1, "pass")
+        return "\n".join(self.lines) + "\n"
+
+    def _check_keywords(self, schema: dict):
+        """Raise 'SchemaCompileError' for anything that wouldn't be checked"""
+        if not isinstance(schema, dict):
+            raise SchemaCompileError(f"Unsupported schema: {schema!r}")
+        unknown = schema.keys() - KEYWORDS - ANNOTATIONS
+        if unknown:
+            raise SchemaCompileError(
+                f"Unsupported keywords: {', '.join(sorted(unknown))}"
+            )
+        # draft 4 ignores other keywords beside a reference
+        beside_ref = (schema.keys() & KEYWORDS) - {"$ref"}
+        if "$ref" in schema and beside_ref:
+            raise SchemaCompileError(
+                f"Keywords beside '$ref': {', '.join(sorted(beside_ref))}"
+            )
+        if not isinstance(schema.get("additionalProperties", True), bool):
+            raise SchemaCompileError(
+                "Unsupported 'additionalProperties': not true or false"
+            )
+        if not isinstance(schema.get("items", {}), dict):
+            raise SchemaCompileError("Unsupported 'items': not one schema")
+        format_ = schema.get("format")
+        if format_ is not None and format_ not in FORMATS:
+            if format_ not in UNCHECKED_FORMATS:
+                raise SchemaCompileError(f"Unsupported format: {format_}")
+
+    def _subschema(self, schema: dict, value: str, path: str, indent: int):
+        self._check_keywords(schema)
+        if "$ref" in schema:
+            function = self._definition(schema["$ref"])
+            self._emit(indent, f"{function}({value}, {path}, errors)")
+            return
+        if "oneOf" in schema:
+            self._one_of(schema["oneOf"], value, path, indent)
+        type_ = schema.get("type")
+        if type_ is None:
+            self._typed(schema, list(_TYPE_CHECKS), value, path, indent)
+            if "enum" in schema:
+                self._enum(schema["enum"], value, path, indent)
+            return
+        types = [type_] if isinstance(type_, str) else list(type_)
+        unknown = set(types) - set(_TYPE_CHECKS)
+        if unknown:
+            raise SchemaCompileError(f"Unsupported types: {unknown}")
+        check = " or ".join(_TYPE_CHECKS[_].format(value) for _ in types)
+        self._emit(indent, f"if not ({check}):")
+        self._error(indent + 1, path, f"is not of type {' or '.join(types)}")
+        self._emit(indent, "else:")
+        before = len(self.lines)
+        self._typed(schema, types, value, path, indent + 1)
+        if "enum" in schema:
+            self._enum(schema["enum"], value, path, indent + 1)
+        if len(self.lines) == before:
+            # nothing more to check
+            self.lines.pop()
+
+    def _typed(self, schema: dict, types: list, value, path, indent: int):
+        """Checks that apply to values of a type, guarded if need be"""
+        for type_, write in (
+            ("string", self._string),
+            ("array", self._array),
+            ("object", self._object),
+        ):
+            if type_ not in types:
+                continue
+            guarded = len(types) > 1
+            before = len(self.lines)
+            if guarded:
+                self._emit(indent, f"if {_TYPE_CHECKS[type_].format(value)}:")
+            write(schema, value, path, indent + guarded)
+            if guarded and len(self.lines) == before + 1:
+                self.lines.pop()
+
+    def _enum(self, enum: list, value: str, path: str, indent: int):
+        if all(isinstance(_, str) for _ in enum):
+            allowed = self._constant("_ENUM_", frozenset(enum))
+            check = f"isinstance({value}, str) and {value} in {allowed}"
+        else:
+            allowed = self._constant("_ENUM_", tuple(enum))
+            check = f"any(_equal({value}, _) for _ in {allowed})"
+        self._emit(indent, f"if not ({check}):")
+        self._error(
+            indent + 1, path, f"is not one of {sorted(map(str, enum))}"
+        )
+
+    def _string(self, schema: dict, value: str, path: str, indent: int):
+        if "maxLength" in schema:
+            length = int(schema["maxLength"])
+            self._emit(indent, f"if len({value}) > {length}:")
+            self._error(indent + 1, path, f"is longer than {length}")
+        patterns = []
+        if "pattern" in schema:
+            # a schema pattern matches anywhere in the string
+            re.compile(schema["pattern"])
+            patterns.append(("search", schema["pattern"], "pattern"))
+        format_ = schema.get("format")
+        if format_ in FORMATS:
+            patterns.append(("fullmatch", FORMATS[format_], format_))
+        for kind, pattern, description in patterns:
+            match = self._constant("_MATCH_", (kind, pattern))
+            self._emit(indent, f"if {match}({value}) is None:")
+            self._error(
+                indent + 1, path, f"does not match the {description} format"
+            )
+
+    def _array(self, schema: dict, value: str, path: str, indent: int):
+        min_items = int(schema.get("minItems", 0))
+        if min_items:
+            self._emit(indent, f"if len({value}) < {min_items}:")
+            self._error(indent + 1, path, f"has fewer than {min_items} items")
+        items = schema.get("items")
+        if items:
+            item = self._name("item")
+            index = self._name("index")
+            self._emit(indent, f"for {index}, {item} in enumerate({value}):")
+            before = len(self.lines)
+            self._subschema(items, item, f"({path}, {index})", indent + 1)
+            if len(self.lines) == before:
+                self.lines.pop()
+
+    def _object(self, schema: dict, value: str, path: str, indent: int):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            self._emit(indent, f"if {name!r} not in {value}:")
+            self._error(indent + 1, f"({path}, {name!r})", "is required")
+        if schema.get("additionalProperties") is False:
+            known = self._constant("_KEYS_", frozenset(properties))
+            extra = self._name("extra")
+            self._emit(indent, f"for {extra} in {value}.keys() - {known}:")
+            self._error(
+                indent + 1, f"({path}, {extra})", "is not a known property"
+            )
+        for name, subschema in properties.items():
+            item = self._name("item")
+            self._emit(indent, f"{item} = {value}.get({name!r}, _MISSING)")
+            self._emit(indent, f"if {item} is not _MISSING:")
+            before = len(self.lines)
+            self._subschema(subschema, item, f"({path}, {name!r})", indent + 1)
+            if len(self.lines) == before:
+                self.lines.pop()
+                self.lines.pop()
+
+    def _one_of(self, choices: list, value: str, path: str, indent: int):
+        refs = [_.get("$ref") for _ in choices]
+        types = [self._type_of(_) if _ else None for _ in refs]
+        if all(types) and len(set(types)) == len(types):
+            # every choice is an object with its own '@type':
+            # validate against the one it names
+            table = self._constant("_ONE_OF_", {})
+            for type_, ref in zip(types, refs):
+                self.constants[table][type_] = self._definition(ref)
+            function = self._name("function")
+            self._emit(indent, f"{function} = _choice({table}, {value})")
+            self._emit(indent, f"if {function} is None:")
+            self._error(
+                indent + 1, path, f"'@type' is not one of {sorted(types)}"
+            )
+            self._emit(indent, "else:")
+            self._emit(indent + 1, f"{function}({value}, {path}, errors)")
+            return
+        # otherwise, count the choices that match
+        matches = self._name("matches")
+        self._emit(indent, f"{matches} = 0")
+        for choice in choices:
+            choice_errors = self._name("choice_errors")
+            saved = self._name("errors")
+            self._emit(indent, f"{choice_errors} = []")
+            self._emit(indent, f"{saved}, errors = errors, {choice_errors}")
+            self._subschema(choice, value, path, indent)
+            self._emit(indent, f"errors = {saved}")
+            self._emit(indent, f"{matches} += not {choice_errors}")
+        self._emit(indent, f"if {matches} != 1:")
+        self._error(indent + 1, path, "does not match exactly one choice")
+
+
+def _choice(table: dict, value):
+    """The function for the '@type' of an object, if there is one"""
+    if isinstance(value, dict):
+        type_ = value.get("@type")
+        if isinstance(type_, str):
+            return table.get(type_)
+    return None
+
+
+def _equal(value, allowed) -> bool:
+    """JSON equality: 'true' isn't 1"""
+    return type(value) is type(allowed) and value == allowed
+
+
+def format_path(path: tuple) -> str:
+    """A JSON pointer for a validator's path: ((((), 'a'), 0), 'b')"""
+    parts = []
+    while path:
+        path, part = path
+        parts.append(str(part).replace("~", "~0").replace("/", "~1"))
+    return "/" + "/".join(reversed(parts))
+
+
+def compile_schema(schema: dict) -> Tuple[str, dict]:
+    """Compile a schema to Python source and the constants it uses"""
+    compiler = _Compiler(schema)
+    source = compiler.compile()
+    return source, compiler.constants
+
+
+def _load(code, constants: dict) -> Callable:
+    """Run compiled validator code, with its constants"""
+    namespace = {"_MISSING": object(), "_choice": _choice, "_equal": _equal}
+    for name, value in constants.items():
+        if name.startswith("_MATCH_"):
+            kind, pattern = value
+            value = getattr(re.compile(pattern), kind)
+        namespace[name] = value
+    exec(code, namespace)
+    # 'oneOf' tables name the functions for each '@type'
+    for name, value in constants.items():
+        if name.startswith("_ONE_OF_"):
+            namespace[name] = {
+                type_: namespace[function] for type_, function in value.items()
+            }
+    return namespace["validate"]
+
+
+def schema_file() -> Path:
+    """The bundled NIST election results schema"""
+    return FileTools(SCHEMA_NAME, SCHEMA_PATH).abs_path_to_file
+
+
+@lru_cache(maxsize=None)
+def load_validator(
+    schema_path: Path = None,
+) -> Callable[[dict], List[SchemaError]]:
+    """A validator for a schema, compiled the first time it's asked for
+    Optional:
+        schema_path: the schema, the bundled NIST schema by default
+    Returns:
+        A function taking a JSON value and returning its errors as
+        (JSON pointer, message) pairs, empty if it's valid
+    Raises:
+        SchemaCompileError if the schema uses what the compiler doesn't
+        handle
+    """
+    schema_path = Path(schema_path or schema_file())
+    with span("compile_schema"):
+        source, constants = compile_schema(
+            json.loads(schema_path.read_bytes())
+        )
+        code = compile(source, f"<schema {schema_path.name}>", "exec")
+        return _validator(_load(code, constants))
+
+
+def _validator(validate: Callable) -> Callable[[dict], List[SchemaError]]:
+    def schema_errors(value) -> List[SchemaError]:
+        errors = []
+        validate(value, errors)
+        return [(format_path(path), message) for path, message in errors]
+
+    return schema_errors
+
+
+def schema_errors(edf_data: dict) -> List[SchemaError]:
+    """Check EDF data against the bundled schema, returning all errors"""
+    with span("schema_validation"):
+        return load_validator()(edf_data)
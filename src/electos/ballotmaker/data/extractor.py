@@ -1,6 +1,9 @@
+import logging
 from typing import Dict, List, Union
 
 from electos.ballotmaker.data.models import ElectionData
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
+from electos.ballotmaker.timing import span
 from electos.datamodels.nist.indexes import ElementIndex
 from electos.datamodels.nist.models.edf import (
     BallotMeasureContest,
@@ -16,6 +19,13 @@ from electos.datamodels.nist.models.edf import (
     OrderedHeader,
 )
 
+# Part of the ballot data cache key: change it whenever the extracted data
+# changes shape or content, so stale cache entries are not reused.
+EXTRACTOR_VERSION = "3"
+
+log = logging.getLogger(__name__)
+
+
 # --- Base Types
 #
 # Schema expresses these as union types not subclasses
@@ -64,7 +74,25 @@ class BallotDataExtractor:
     """Extract election data from an EDF."""
 
     def __init__(self):
-        pass
+        self._style_filter = BallotStyleFilter()
+        self._reset_memos()
+
+    def _reset_memos(self):
+        """Forget the entities resolved by an earlier extraction."""
+        # Contests, candidates and parties appear on many ballot styles;
+        # resolve each once per extraction, keyed by their IDs.
+        self._contest_memo = {}
+        self._candidate_memo = {}
+        self._party_memo = {}
+        self._gp_unit_name_memo = {}
+
+    def _gp_unit_name(self, id_: str):
+        """Get the name of a geo-political unit, e.g. a contest's district."""
+        name = self._gp_unit_name_memo.get(id_)
+        if name is None:
+            name = _text_content(self._index.by_id(id_).name)
+            self._gp_unit_name_memo[id_] = name
+        return name
 
     def _ballot_style_external_id(self, ballot_style: BallotStyle):
         """Get the text of a ballot style's external identifier if any."""
@@ -77,12 +105,6 @@ class BallotDataExtractor:
             name = ""
         return name
 
-    def _ballot_style_gp_units(self, ballot_style: BallotStyle):
-        """Yield geo-political units for a ballot style."""
-        for id_ in ballot_style.gp_unit_ids:
-            gp_unit = self._index.by_id(id_)
-            yield gp_unit
-
     def _ballot_style_contests(self, ballot_style: BallotStyle):
         """Yield the contests of a ballot style."""
         for item in _walk_ordered_contests(ballot_style.ordered_content):
@@ -101,6 +123,8 @@ class BallotDataExtractor:
         """
         # Note: party ID is returned to allow de-duplicating parties in callers.
         id_ = candidate.party_id
+        if id_ in self._party_memo:
+            return self._party_memo[id_], id_
         party = self._index.by_id(id_)
         name = _text_content(party.name) if party else None
         abbreviation = (
@@ -113,8 +137,20 @@ class BallotDataExtractor:
             result["name"] = name
         if abbreviation:
             result["abbreviation"] = abbreviation
+        self._party_memo[id_] = result
         return result, id_
 
+    def _candidate(self, id_: str):
+        """Get the ballot name and party of a candidate, by ID."""
+        entry = self._candidate_memo.get(id_)
+        if entry is None:
+            candidate = self._index.by_id(id_)
+            name = self._candidate_name(candidate)
+            party, party_id = self._candidate_party(candidate)
+            entry = name, party, party_id
+            self._candidate_memo[id_] = entry
+        return entry
+
     def _candidate_contest_candidates(self, contest: CandidateContest):
         """Get candidates for contest, grouped by slate/ticket.
 
@@ -142,11 +178,9 @@ class BallotDataExtractor:
             _party_ids = set()
             if selection.candidate_ids:
                 for id_ in selection.candidate_ids:
-                    candidate = self._index.by_id(id_)
-                    name = self._candidate_name(candidate)
+                    name, party, _party_id = self._candidate(id_)
                     if name:
                         names.append(name)
-                    party, _party_id = self._candidate_party(candidate)
                     if party:
                         parties.append(party)
                         _party_ids.add(_party_id)
@@ -185,8 +219,7 @@ class BallotDataExtractor:
 
     def _contest_election_district(self, contest: Contest):
         """Get the district name of a contest."""
-        district = self._index.by_id(contest.election_district_id)
-        district = _text_content(district.name)
+        district = self._gp_unit_name(contest.election_district_id)
         return district
 
     def _candidate_contest_of(self, contest: CandidateContest):
@@ -238,26 +271,37 @@ class BallotDataExtractor:
     def _contests(self, ballot_style: BallotStyle):
         """Extract contest subset needed for ballots."""
         for contest in self._ballot_style_contests(ballot_style):
+            # Contests on several ballot styles are extracted once and shared:
+            # the data models built from them are never modified.
+            entry = self._contest_memo.get(contest.model__id)
+            if entry is not None:
+                yield entry
+                continue
             if isinstance(contest, CandidateContest):
                 entry = self._candidate_contest_of(contest)
             elif isinstance(contest, BallotMeasureContest):
                 entry = self._ballot_measure_contest_of(contest)
             else:
                 # Ignore other contest types
-                print(f"Skipping contest of type {contest.model__type}")
+                log.warning(f"Skipping contest of type {contest.model__type}")
+                continue
+            self._contest_memo[contest.model__id] = entry
             yield entry
 
     def _election_ballot_styles(self, election: Election):
-        """Extract all ballot styles."""
+        """Extract the selected ballot styles."""
         for ballot_style in election.ballot_style:
-            data = {
-                "id": self._ballot_style_external_id(ballot_style),
-                "scopes": [
-                    _text_content(self._index.by_id(_.model__id).name)
-                    for _ in self._ballot_style_gp_units(ballot_style)
-                ],
-                "contests": [_ for _ in self._contests(ballot_style)],
-            }
+            id_ = self._ballot_style_external_id(ballot_style)
+            scopes = [self._gp_unit_name(_) for _ in ballot_style.gp_unit_ids]
+            # select before resolving any contests or candidates
+            if not self._style_filter.matches(id_, scopes):
+                continue
+            with span("extract_ballot_style", ballot_style=id_):
+                data = {
+                    "id": id_,
+                    "scopes": scopes,
+                    "contests": [_ for _ in self._contests(ballot_style)],
+                }
             yield data
 
     def _elections(self, election_report: ElectionReport):
@@ -276,23 +320,45 @@ class BallotDataExtractor:
             }
             yield data
 
-    def extract(self, data: Dict, index: ElementIndex = None) -> ElectionData:
+    def extract(
+        self,
+        data: Union[Dict, ElectionReport],
+        index: ElementIndex = None,
+        style_filter: BallotStyleFilter = None,
+    ) -> List[ElectionData]:
         """Extract election data.
 
         This is the primary entry point for the extractor.
 
         Parameters:
-            data: An EDF / election report dictionary.
+            data: An EDF / election report dictionary, or an already
+                constructed election report.
+                Pass the report if there is one, to avoid validating the EDF twice.
             index: An ElementIndex.
                 If empty (the default), create a new index from the election report.
                 Use this parameter only if there's already an existing index.
+            style_filter: Extract only the ballot styles it selects.
+                If empty (the default), extract all of them.
 
         Returns:
-            Election data model for use in ballot rendering.
+            Election data models for use in ballot rendering.
         """
-        election_report = ElectionReport(**data)
-        self._index = index or ElementIndex(election_report, "ElectionResults")
-        election_data = [
-            ElectionData(**_) for _ in self._elections(election_report)
-        ]
+        if isinstance(data, ElectionReport):
+            election_report = data
+        else:
+            with span("election_report"):
+                election_report = ElectionReport(**data)
+        if index is None:
+            with span("element_index"):
+                index = ElementIndex(election_report, "ElectionResults")
+        self._index = index
+        self._style_filter = style_filter or BallotStyleFilter()
+        self._reset_memos()
+        with span("extract"):
+            election_data = [
+                ElectionData.from_extracted(_)
+                for _ in self._elections(election_report)
+            ]
+        # the models hold what they need, release the rest
+        self._reset_memos()
         return election_data
@@ -1,8 +1,7 @@
 """Ballot data models."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
-from functools import cached_property
 from typing import List, Union
 
 
@@ -39,6 +38,43 @@ def _check_type_list(instance, field, type_):
         )
 
 
+_FIELD_NAMES = {}
+
+
+def _field_names(cls):
+    """The names of the fields of model 'cls', inherited ones included."""
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = frozenset(_.name for _ in fields(cls))
+    return names
+
+
+def _trusted(cls, values: dict):
+    """Create a model from field values without '__post_init__' checks.
+
+    The values must already be of the right types, nested models included.
+    Raise 'TypeError' if a field is missing or unknown, as the checked
+    constructor does: a slotted model with an unset field fails much later.
+    """
+    names = _field_names(cls)
+    if values.keys() != names:
+        missing = sorted(names - values.keys())
+        unknown = sorted(values.keys() - names)
+        if missing:
+            raise TypeError(
+                f"{cls.__name__}() missing required fields: "
+                + ", ".join(f"'{_}'" for _ in missing)
+            )
+        raise TypeError(
+            f"{cls.__name__}() got unexpected fields: "
+            + ", ".join(f"'{_}'" for _ in unknown)
+        )
+    instance = object.__new__(cls)
+    for field, value in values.items():
+        setattr(instance, field, value)
+    return instance
+
+
 # --- Contest model base type
 
 @dataclass
@@ -46,6 +82,8 @@ class ContestData:
 
     """Shared data for contests."""
 
+    __slots__ = ("id", "type", "title", "district")
+
     id: str
     type: str
     title: str
@@ -72,6 +110,8 @@ class BallotChoiceData:
 
     """Data for ballot measure selections."""
 
+    __slots__ = ("id", "choice")
+
     id: str
     choice: str
 
@@ -79,12 +119,18 @@ class BallotChoiceData:
         _check_type(self, "id", str)
         _check_type(self, "choice", str)
 
+    @classmethod
+    def from_extracted(cls, data: dict):
+        return _trusted(cls, data)
+
 
 @dataclass
 class BallotMeasureContestData(ContestData):
 
     """Data for ballot measure contests."""
 
+    __slots__ = ("text", "choices")
+
     text: str
     choices: List[BallotChoiceData]
 
@@ -94,6 +140,11 @@ class BallotMeasureContestData(ContestData):
         _check_type_hint(self, "choices", List)
         self.choices = [BallotChoiceData(**_) for _ in self.choices]
 
+    @classmethod
+    def from_extracted(cls, data: dict):
+        choices = [BallotChoiceData.from_extracted(_) for _ in data["choices"]]
+        return _trusted(cls, dict(data, choices=choices))
+
 
 # --- Candidate contest data models
 
@@ -103,6 +154,8 @@ class PartyData:
 
     """Data for parties candidates are in."""
 
+    __slots__ = ("name", "abbreviation")
+
     name: str
     abbreviation: str
 
@@ -110,12 +163,18 @@ class PartyData:
         _check_type(self, "name", str)
         _check_type(self, "abbreviation", str)
 
+    @classmethod
+    def from_extracted(cls, data: dict):
+        return _trusted(cls, data)
+
 
 @dataclass
 class CandidateChoiceData:
 
     """Data for candidate contest selections."""
 
+    __slots__ = ("id", "name", "party", "is_write_in")
+
     id: str
     name: List[str]
     party: List[PartyData]
@@ -129,12 +188,19 @@ class CandidateChoiceData:
         self.party = [PartyData(**_) for _ in self.party]
         _check_type(self, "is_write_in", bool)
 
+    @classmethod
+    def from_extracted(cls, data: dict):
+        party = [PartyData.from_extracted(_) for _ in data["party"]]
+        return _trusted(cls, dict(data, party=party))
+
 
 @dataclass
 class CandidateContestData(ContestData):
 
     """Data for candidate contests."""
 
+    __slots__ = ("vote_type", "votes_allowed", "candidates")
+
     vote_type: str
     votes_allowed: str
     candidates: List[CandidateChoiceData]
@@ -146,6 +212,19 @@ class CandidateContestData(ContestData):
         _check_type_hint(self, "candidates", List)
         self.candidates = [CandidateChoiceData(**_) for _ in self.candidates]
 
+    @classmethod
+    def from_extracted(cls, data: dict):
+        candidates = [
+            CandidateChoiceData.from_extracted(_) for _ in data["candidates"]
+        ]
+        return _trusted(cls, dict(data, candidates=candidates))
+
+
+_CONTEST_MODELS = {
+    ContestType.BALLOT_MEASURE.value: BallotMeasureContestData,
+    ContestType.CANDIDATE.value: CandidateContestData,
+}
+
 
 @dataclass
 class BallotStyleData:
@@ -156,6 +235,8 @@ class BallotStyleData:
     # There's no guarantee the types will be clearly separated in an EDF.
     # (The NIST SP-1500-100 JSON Schema uses unions too.)
 
+    __slots__ = ("id", "scopes", "contests")
+
     id: str
     scopes: List[str]
     contests: List[Union[BallotMeasureContestData, CandidateContestData]]
@@ -181,15 +262,29 @@ class BallotStyleData:
             contests.append(contest)
         self.contests = contests
 
-
-    @cached_property
+    @classmethod
+    def from_extracted(cls, data: dict, shared: dict = None):
+        # The extractor shares the data of a contest between the ballot
+        # styles it's on; share its model too, keyed by the data's identity.
+        shared = {} if shared is None else shared
+        contests = []
+        for contest in data["contests"]:
+            model = shared.get(id(contest))
+            if model is None:
+                model_type = _CONTEST_MODELS[contest["type"]]
+                model = model_type.from_extracted(contest)
+                shared[id(contest)] = model
+            contests.append(model)
+        return _trusted(cls, dict(data, contests=contests))
+
+    # Slotted models have no '__dict__' for 'cached_property' to use.
+    @property
     def ballot_measure_contests(self):
         return [
             _ for _ in self.contests if _.type == ContestType.BALLOT_MEASURE.value
         ]
 
-
-    @cached_property
+    @property
     def candidate_contests(self):
         return [
             _ for _ in self.contests if _.type == ContestType.CANDIDATE.value
@@ -204,6 +299,8 @@ class ElectionData:
     # Dates are not 'datetime' for simplicity and because it's assumed the date
     # is formatter correctly. That can be changed.
 
+    __slots__ = ("name", "type", "start_date", "end_date", "ballot_styles")
+
     name: str
     type: str
     start_date: str
@@ -218,3 +315,17 @@ class ElectionData:
         _check_type(self, "end_date", str)
         _check_type_hint(self, "ballot_styles", List)
         self.ballot_styles = [BallotStyleData(**_) for _ in self.ballot_styles]
+
+    @classmethod
+    def from_extracted(cls, data: dict):
+        """Create election data from 'BallotDataExtractor' output.
+
+        The extractor only produces values of the right types, so this skips
+        the per-field checks every other model construction makes.
+        """
+        shared = {}
+        ballot_styles = [
+            BallotStyleData.from_extracted(_, shared)
+            for _ in data["ballot_styles"]
+        ]
+        return _trusted(cls, dict(data, ballot_styles=ballot_styles))
@@ -0,0 +1,76 @@
+"""Select ballot styles by ID or by geo-political unit name.
+
+Patterns are shell-style wildcards ('fnmatch'), matched case-sensitively.
+A ballot style is selected if its ID matches any of the style patterns
+and any of its geo-political units' names matches any of the GP unit
+patterns. An empty list of patterns matches everything.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import List
+
+from electos.ballotmaker.data.models import BallotStyleData, ElectionData
+
+
+def _matches_any(value: str, patterns: List[str]) -> bool:
+    return any(fnmatchcase(value, _) for _ in patterns)
+
+
+@dataclass
+class BallotStyleFilter:
+
+    """Ballot style ID and GP unit name patterns."""
+
+    styles: List[str] = field(default_factory=list)
+    gp_units: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        # a single pattern is a list of one, not a list of characters
+        if isinstance(self.styles, str):
+            self.styles = [self.styles]
+        if isinstance(self.gp_units, str):
+            self.gp_units = [self.gp_units]
+        self.styles = list(self.styles or [])
+        self.gp_units = list(self.gp_units or [])
+
+    def __bool__(self):
+        """False if the filter selects everything."""
+        return bool(self.styles or self.gp_units)
+
+    def matches(self, ballot_style_id: str, gp_unit_names: List[str]) -> bool:
+        """Is a ballot style with this ID and these GP units selected?"""
+        if self.styles and not _matches_any(ballot_style_id, self.styles):
+            return False
+        if self.gp_units and not any(
+            _matches_any(_, self.gp_units) for _ in gp_unit_names
+        ):
+            return False
+        return True
+
+    def matches_style(self, ballot_style: BallotStyleData) -> bool:
+        return self.matches(ballot_style.id, ballot_style.scopes)
+
+    def select(self, elections: List[ElectionData]) -> List[ElectionData]:
+        """Elections with only the selected ballot styles.
+
+        For ballot data that has already been extracted. The elections
+        passed in are left as they are.
+        """
+        selected = []
+        for election in elections:
+            election = copy.copy(election)
+            election.ballot_styles = [
+                _ for _ in election.ballot_styles if self.matches_style(_)
+            ]
+            selected.append(election)
+        return selected
+
+    def __str__(self):
+        criteria = []
+        if self.styles:
+            criteria.append(f"styles {', '.join(self.styles)}")
+        if self.gp_units:
+            criteria.append(f"GP units {', '.join(self.gp_units)}")
+        return "; ".join(criteria) or "all ballot styles"
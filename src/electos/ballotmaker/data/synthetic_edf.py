@@ -0,0 +1,312 @@
+"""Generate synthetic NIST SP-1500-100 election reports (EDFs) of any size.
+
+The generated EDFs have the same shape as the test cases in 'assets/data':
+one election, a state with one precinct per ballot style, parties, offices,
+people and candidates, candidate contests and ballot measures. Contests are
+drawn from a shared pool so, like real EDFs, most contests appear on many
+ballot styles.
+
+Run it to write an EDF:
+
+    python synthetic_edf.py --ballot-styles 3000 --output county.json
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict
+
+ELECTION_DATE = "2024-11-05"
+
+WORDS = (
+    "amend authorize balloon budget bond charter city commission county "
+    "district fund helium library municipal ordinance park property public "
+    "road school sewer state tax transit utility water zoning"
+).split()
+
+# 'generate_edf' parameters for elections of typical sizes, used by the
+# benchmarks
+SCALES = {
+    "small": dict(
+        ballot_styles=10,
+        contests_per_style=6,
+        candidates_per_contest=4,
+    ),
+    "county": dict(
+        ballot_styles=500,
+        contests_per_style=20,
+        candidates_per_contest=5,
+        gp_units=400,
+        measures_per_style=3,
+    ),
+    "state": dict(
+        ballot_styles=5000,
+        contests_per_style=40,
+        candidates_per_contest=6,
+        gp_units=4000,
+        measures_per_style=6,
+        measure_text_length=2000,
+    ),
+}
+
+
+def _text(content: str, label: str = None) -> Dict:
+    """Internationalized text with a single English string."""
+    text = {
+        "@type": "ElectionResults.InternationalizedText",
+        "Text": [
+            {
+                "@type": "ElectionResults.LanguageString",
+                "Content": content,
+                "Language": "en",
+            }
+        ],
+    }
+    if label:
+        text["Label"] = label
+    return text
+
+
+def _external_id(value: str) -> Dict:
+    return {
+        "@type": "ElectionResults.ExternalIdentifier",
+        "Type": "other",
+        "Value": value,
+        "OtherType": "TTV",
+        "Label": value,
+    }
+
+
+def _gp_unit(id_: str, type_: str, name: str) -> Dict:
+    return {
+        "@type": "ElectionResults.ReportingUnit",
+        "@id": id_,
+        "Type": type_,
+        "Name": _text(name),
+    }
+
+
+def generate_edf(
+    ballot_styles: int = 10,
+    contests_per_style: int = 6,
+    candidates_per_contest: int = 4,
+    gp_units: int = None,
+    measures_per_style: int = 1,
+    measure_text_length: int = 800,
+    parties: int = 3,
+    seed: int = 0,
+) -> Dict:
+    """Generate an election report dictionary.
+
+    Parameters:
+        ballot_styles: Number of ballot styles.
+        contests_per_style: Contests on each ballot style, including
+            ballot measures.
+        candidates_per_contest: Candidates in each candidate contest, not
+            counting the write-in.
+        gp_units: Number of precincts. Defaults to one per ballot style;
+            if fewer, precincts are shared by several ballot styles.
+        measures_per_style: Ballot measures on each ballot style.
+        measure_text_length: Approximate length of ballot measure text.
+        parties: Number of parties.
+        seed: Random seed. The same parameters and seed give the same EDF.
+
+    Returns:
+        An EDF / election report dictionary.
+    """
+    rng = random.Random(seed)
+    gp_units = gp_units or ballot_styles
+    measures_per_style = min(measures_per_style, contests_per_style)
+    candidate_contests_per_style = contests_per_style - measures_per_style
+
+    # Geo-political units: a state containing the precincts.
+    state_id = "gp-state"
+    gp_unit_list = [_gp_unit(state_id, "state", "The State of Synthesis")]
+    precinct_ids = []
+    for number in range(1, gp_units + 1):
+        id_ = f"gp-precinct-{number}"
+        precinct_ids.append(id_)
+        gp_unit_list.append(_gp_unit(id_, "precinct", f"Precinct {number}"))
+
+    party_list = []
+    for number in range(1, parties + 1):
+        party_list.append(
+            {
+                "@type": "ElectionResults.Party",
+                "@id": f"party-{number}",
+                "Name": _text(f"The Synthetic Party {number}"),
+                "Abbreviation": _text(f"SP{number}"),
+            }
+        )
+
+    # Twice as many contests as fit on a ballot: each ballot style takes
+    # a window of the pool, so contests overlap between styles.
+    office_list = []
+    person_list = []
+    candidate_list = []
+    candidate_contests = []
+    for number in range(1, (candidate_contests_per_style * 2) + 1):
+        contest_id = f"candidate-contest-{number}"
+        office_id = f"office-{number}"
+        office_list.append(
+            {
+                "@type": "ElectionResults.Office",
+                "@id": office_id,
+                "IsPartisan": True,
+                "Name": _text(f"Office {number}"),
+            }
+        )
+        selections = []
+        for choice in range(1, candidates_per_contest + 1):
+            person_id = f"person-{number}-{choice}"
+            candidate_id = f"candidate-{number}-{choice}"
+            first_name = rng.choice(WORDS).title()
+            last_name = rng.choice(WORDS).title()
+            person_list.append(
+                {
+                    "@type": "ElectionResults.Person",
+                    "@id": person_id,
+                    "FirstName": first_name,
+                    "LastName": last_name,
+                }
+            )
+            candidate = {
+                "@type": "ElectionResults.Candidate",
+                "@id": candidate_id,
+                "PersonId": person_id,
+                "BallotName": _text(f"{first_name} {last_name}"),
+            }
+            if party_list:
+                party = party_list[(choice - 1) % len(party_list)]
+                candidate["PartyId"] = party["@id"]
+            candidate_list.append(candidate)
+            selections.append(
+                {
+                    "@type": "ElectionResults.CandidateSelection",
+                    "@id": f"{contest_id}--{candidate_id}",
+                    "CandidateIds": [candidate_id],
+                }
+            )
+        selections.append(
+            {
+                "@type": "ElectionResults.CandidateSelection",
+                "@id": f"{contest_id}--write-in",
+                "IsWriteIn": True,
+            }
+        )
+        candidate_contests.append(
+            {
+                "@type": "ElectionResults.CandidateContest",
+                "@id": contest_id,
+                "Name": f"Contest for Office {number}",
+                "OfficeIds": [office_id],
+                "VoteVariation": "plurality",
+                "VotesAllowed": 1,
+                "ElectionDistrictId": state_id,
+                "ContestSelection": selections,
+            }
+        )
+
+    ballot_measures = []
+    for number in range(1, (measures_per_style * 2) + 1):
+        contest_id = f"ballot-measure-{number}"
+        words = []
+        while sum(len(_) + 1 for _ in words) < measure_text_length:
+            words.append(rng.choice(WORDS))
+        ballot_measures.append(
+            {
+                "@type": "ElectionResults.BallotMeasureContest",
+                "@id": contest_id,
+                "ElectionDistrictId": state_id,
+                "Name": f"Ballot Measure {number}",
+                "FullText": _text(" ".join(words).capitalize() + "."),
+                "ContestSelection": [
+                    {
+                        "@type": "ElectionResults.BallotMeasureSelection",
+                        "@id": f"{contest_id}--{choice.lower()}",
+                        "Selection": _text(choice),
+                    }
+                    for choice in ("Yes", "No")
+                ],
+            }
+        )
+
+    def _window(pool, count, start):
+        return [pool[(start + _) % len(pool)] for _ in range(count)]
+
+    ballot_style_list = []
+    for number in range(ballot_styles):
+        contests = _window(
+            candidate_contests, candidate_contests_per_style, number
+        ) + _window(ballot_measures, measures_per_style, number)
+        ballot_style_list.append(
+            {
+                "@type": "ElectionResults.BallotStyle",
+                "GpUnitIds": [precinct_ids[number % len(precinct_ids)]],
+                "OrderedContent": [
+                    {
+                        "@type": "ElectionResults.OrderedContest",
+                        "ContestId": contest["@id"],
+                        "OrderedContestSelectionIds": [
+                            _["@id"] for _ in contest["ContestSelection"]
+                        ],
+                    }
+                    for contest in contests
+                ],
+                "ExternalIdentifier": [
+                    _external_id(f"ballot_style_{number + 1}")
+                ],
+            }
+        )
+
+    return {
+        "@type": "ElectionResults.ElectionReport",
+        "Format": "precinct-level",
+        "GeneratedDate": f"{ELECTION_DATE}T00:00:00Z",
+        "VendorApplicationId": "BallotMaker synthetic EDF",
+        "Issuer": "TrustTheVote",
+        "IssuerAbbreviation": "TTV",
+        "Status": "pre-election",
+        "SequenceStart": 1,
+        "SequenceEnd": 1,
+        "Election": [
+            {
+                "@type": "ElectionResults.Election",
+                "ElectionScopeId": state_id,
+                "StartDate": ELECTION_DATE,
+                "EndDate": ELECTION_DATE,
+                "Type": "general",
+                "Name": _text("Synthetic General Election"),
+                "Contest": candidate_contests + ballot_measures,
+                "BallotStyle": ballot_style_list,
+                "Candidate": candidate_list,
+            }
+        ],
+        "GpUnit": gp_unit_list,
+        "Party": party_list,
+        "Office": office_list,
+        "Person": person_list,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ballot-styles", type=int, default=10)
+    parser.add_argument("--contests-per-style", type=int, default=6)
+    parser.add_argument("--candidates-per-contest", type=int, default=4)
+    parser.add_argument("--gp-units", type=int, default=None)
+    parser.add_argument("--measures-per-style", type=int, default=1)
+    parser.add_argument("--measure-text-length", type=int, default=800)
+    parser.add_argument("--parties", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path, required=True, help="EDF file to write"
+    )
+    opts = vars(parser.parse_args())
+    output = opts.pop("output")
+    output.write_text(json.dumps(generate_edf(**opts), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
-import json
 import logging
+from pathlib import Path
 
+from electos.ballotmaker import election_data
 from electos.ballotmaker.ballots.build_ballots import build_ballots
 from electos.ballotmaker.ballots.files import FileTools
-from electos.ballotmaker.data.extractor import BallotDataExtractor
 from electos.ballotmaker.data.models import ElectionData
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
 
 
-def main():
+def main(
+    jobs: int = 1,
+    use_cache: bool = True,
+    dedup: bool = True,
+    style_filter: BallotStyleFilter = None,
+    output_dir: Path = None,
+    incremental: bool = False,
+    keep_going: bool = False,
+):
     # set up logging for ballot creation
     # format output and point to log
     logging.getLogger(__name__)
@@ -25,23 +34,33 @@ def main():
     data_file = FileTools(data_file_name, relative_path)
     full_data_path = data_file.abs_path_to_file
 
-    return build_ballots(get_election_data(full_data_path))
+    ballot_election = get_election_data(
+        full_data_path, use_cache, style_filter
+    )
+    if not ballot_election.ballot_styles:
+        logging.error(f"No ballot styles match {style_filter}")
+        return None
+    return build_ballots(
+        ballot_election, jobs, dedup, output_dir, incremental, keep_going
+    )
 
 
-def get_election_data(edf_file: str) -> ElectionData:
+def get_election_data(
+    edf_file: Path,
+    use_cache: bool = True,
+    style_filter: BallotStyleFilter = None,
+) -> ElectionData:
     logging.info(f"Using EDF {edf_file}")
-    with edf_file.open() as input:
-        text = input.read()
-        data = json.loads(text)
-
-    extractor = BallotDataExtractor()
-    election_report = extractor.extract(data)
+    # parse and index the EDF once (or not at all, if it's cached)
+    ballot_data = election_data.load_ballot_data(
+        edf_file, use_cache, style_filter
+    )
     # because we're hard-coding the EDF file, we know it only
     # contains data for one election!
-    election_data = election_report[0]
-    # assert isinstance(election_data, ElectionData)
-    logging.info(f"Found ballots for {election_data.name}")
-    return election_data
+    ballot_election = ballot_data[0]
+    # assert isinstance(ballot_election, ElectionData)
+    logging.info(f"Found ballots for {ballot_election.name}")
+    return ballot_election
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,9 +1,16 @@
-import json
 import logging
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
+from functools import cached_property
 from pathlib import Path
+from typing import List
 
 from electos.ballotmaker.constants import NO_DATA, NO_ERRORS, NO_FILE
+from electos.ballotmaker.data import models
+from electos.ballotmaker.data.cache import BallotDataCache, edf_cache_key
+from electos.ballotmaker.data.edf_reader import load_edf
+from electos.ballotmaker.data.extractor import BallotDataExtractor
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
+from electos.ballotmaker.timing import span
 from electos.datamodels.nist.indexes.element_index import ElementIndex
 from electos.datamodels.nist.models.edf import ElectionReport
 
@@ -12,7 +19,14 @@ log = logging.getLogger(__name__)
 
 @dataclass
 class ElectionData:
+    """
+    A loaded EDF: parsed, validated and indexed once,
+    then shared by the header summary, extractor and renderer
+    """
+
     edf: Path
+    # the EDF already parsed, as 'json.load' would, to save reading it again
+    edf_data: InitVar[dict] = None
     # properties retrieved from the EDF
     edf_error: int = field(init=False)
     election_report: ElectionReport = field(init=False)
@@ -33,7 +47,23 @@ class ElectionData:
         log.debug(f"GP Unit IDs: {gp_unit_ids}; GP Units: {gp_unit_list}")
         return gp_unit_list
 
-    def __post_init__(self):
+    @cached_property
+    def ballot_data(self) -> List[models.ElectionData]:
+        """Ballot data for each election, extracted from the loaded report"""
+        return self.extract()
+
+    def extract(
+        self, style_filter: BallotStyleFilter = None
+    ) -> List[models.ElectionData]:
+        """Ballot data for each election, with only the selected styles"""
+        if self.edf_error != NO_ERRORS:
+            return []
+        extractor = BallotDataExtractor()
+        return extractor.extract(
+            self.election_report, self.index, style_filter
+        )
+
+    def __post_init__(self, edf_data: dict):
         # let's assume there are no errors
         self.edf_error = NO_ERRORS
         # haven't found any ballots yet
@@ -49,9 +79,12 @@ class ElectionData:
             self.edf_error = NO_FILE
             return
 
-        # Open the specified EDF file
-        edf_data = json.loads(self.edf.read_text())
-        self.election_report = ElectionReport(**edf_data)
+        # Read the specified EDF file, leaving out results and counts
+        if edf_data is None:
+            with span("load_edf"):
+                edf_data = load_edf(self.edf)
+        with span("election_report"):
+            self.election_report = ElectionReport(**edf_data)
 
         # get election header data
         self.election_name = (
@@ -66,7 +99,8 @@ class ElectionData:
         log.info(f"{self.election_type}")
 
         # index the election report to retrieve lists
-        self.index = ElementIndex(self.election_report, "ElectionResults")
+        with span("element_index"):
+            self.index = ElementIndex(self.election_report, "ElectionResults")
 
         # how many ballots?
         self.ballot_styles = self.index.by_type("ElectionResults.BallotStyle")
@@ -78,3 +112,34 @@ class ElectionData:
             log.info(f"Ballot: {ballot_value}; GP Units: {ballot_gp_units}")
         self.ballot_count = count
         log.info(f"Found {self.ballot_count} ballot styles in {self.edf}")
+
+
+def load_ballot_data(
+    edf: Path,
+    use_cache: bool = True,
+    style_filter: BallotStyleFilter = None,
+) -> List[models.ElectionData]:
+    """Ballot data for an EDF, from the cache when it has been seen before
+    Requires:
+        EDF file (JSON format) edf: Path,
+    Optional:
+        use_cache: False skips reading and writing the cache
+        style_filter: only the ballot styles it selects; the cache holds
+            whole EDFs, so a filtered extraction isn't stored
+    """
+    if use_cache:
+        cache = BallotDataCache()
+        with span("cache_lookup"):
+            key = edf_cache_key(edf)
+            ballot_data = cache.get(key)
+        if ballot_data is not None:
+            log.info(f"Using cached ballot data for {edf}")
+            if style_filter:
+                return style_filter.select(ballot_data)
+            return ballot_data
+    if style_filter:
+        return ElectionData(edf).extract(style_filter)
+    ballot_data = ElectionData(edf).ballot_data
+    if use_cache:
+        cache.put(key, ballot_data)
+    return ballot_data
@@ -1,13 +1,49 @@
+import json
 import logging
 from pathlib import Path
+from typing import List, Optional, Tuple
 
-from electos.ballotmaker.election_data import ElectionData
+from electos.ballotmaker.ballots.shards import (
+    plan_shards,
+    read_plan,
+    select_shard,
+)
+from electos.ballotmaker.constants import (
+    COPIES_PER_FILE,
+    INVALID_DATA,
+    NO_DATA,
+    NO_ERRORS,
+    NO_FILE,
+    RENDER_FAILED,
+)
+from electos.ballotmaker.data.cache import edf_cache_key
+from electos.ballotmaker.data.models import ElectionData
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
+from electos.ballotmaker.election_data import load_ballot_data
+from electos.ballotmaker.timing import span
 
 log = logging.getLogger(__name__)
 
 
 def make_ballots(
-    _edf: Path, _output_dir: Path = None, _styles: Path = None
+    _edf: Path,
+    _output_dir: Path = None,
+    *,
+    _styles: Path = None,
+    _style_ids: List[str] = None,
+    _gp_units: List[str] = None,
+    jobs: int = 1,
+    use_cache: bool = True,
+    dedup: bool = True,
+    incremental: bool = False,
+    check: bool = False,
+    keep_going: bool = False,
+    shard: Tuple[int, int] = None,
+    plan: Path = None,
+    copies: int = 0,
+    copies_per_file: int = COPIES_PER_FILE,
+    first_serial: int = 1,
+    combined: bool = False,
 ) -> int:
     """Generate ballots from EDF data
     Requires:
@@ -15,8 +51,154 @@ def make_ballots(
     Optional:
         Output directory for generated PDF files
         Styles file for ballot formatting
+        Ballot styles to make, by ID or GP unit name (fnmatch patterns)
+        jobs: number of rendering processes; 0 = one per CPU
+        use_cache: reuse ballot data extracted from the EDF before
+        dedup: render identical ballot styles once, link the others
+        incremental: re-render only the ballot styles that changed since
+            the last build in the output directory
+        check: check the EDF against the NIST schema and its references
+            before extracting its ballot data
+        keep_going: make every ballot style it can rather than stopping
+            at the first that fails
+        shard: (k, N) to make only the ballot styles of shard k of N
+        plan: the shard plan to take shard k from, see 'plan_ballots';
+            without one the styles are divided as 'plan_shards' would
+        copies: make a print run of this many copies of each ballot
+            style, each with its own serial number and barcode, rather
+            than one PDF per style
+        copies_per_file: the most copies in one PDF; 0 = all of a style
+        first_serial: the serial number of the first copy
+        combined: make one PDF of all the ballot styles, with an outline
+            and an index of their pages, rather than one PDF per style
     """
-    # was a valid output directory provided?
-    # was a styles file provided
-    election_data = ElectionData(_edf)
-    return election_data.edf_error
+    if _edf is None or not _edf.is_file():
+        log.error(f"EDF {_edf} is not a file")
+        return NO_FILE
+    if copies and incremental:
+        # each run numbers its copies afresh, none are kept
+        log.error("A print run of copies can't be incremental or resumed")
+        return INVALID_DATA
+    if combined and (copies or incremental):
+        log.error("A combined PDF can't be incremental, resumed or copied")
+        return INVALID_DATA
+    if combined and (jobs != 1 or keep_going):
+        # one document, made in one process, that fails as a whole
+        log.error("A combined PDF can't use --jobs or --keep-going")
+        return INVALID_DATA
+    if _styles is not None:
+        # the layout modules build their styles when they are imported
+        log.warning(
+            f"Stylesheets aren't supported yet, ignoring {_styles}; "
+            "using the default ballot layout"
+        )
+    if check:
+        from electos.ballotmaker.validate_edf import edf_errors
+
+        try:
+            errors = edf_errors(json.loads(_edf.read_bytes()))
+        except (OSError, ValueError) as ex:
+            errors = [f"Can't read EDF: {ex}"]
+        if errors:
+            for error in errors:
+                log.error(f"{_edf}: {error}")
+            return INVALID_DATA
+
+    shard_plan = None
+    if plan is not None:
+        shard_plan, error = read_shard_plan(plan, _edf, shard[1])
+        if error:
+            return error
+
+    style_filter = BallotStyleFilter(_style_ids, _gp_units)
+    election, error = load_election(_edf, use_cache, style_filter)
+    if error:
+        return error
+    style_order = None
+    if shard is not None:
+        number, count = shard
+        if shard_plan is None:
+            # every machine divides the same styles the same way
+            shard_plan = plan_shards(election, count)
+        # and numbers the copies of each the same way
+        style_order = [_["id"] for _ in shard_plan["ballot_styles"]]
+        select_shard(election, shard_plan, number)
+        if not election.ballot_styles:
+            log.warning(f"Shard {number}/{count} has no ballot styles")
+    log.info(
+        f"Making {len(election.ballot_styles)} ballot styles "
+        f"for {election.name}"
+    )
+
+    # imported here: ReportLab isn't needed to find a missing EDF
+    if combined:
+        from electos.ballotmaker.ballots.combined import build_combined
+
+        # one document, made in one process
+        batch = build_combined(election, _output_dir, dedup)
+    elif copies:
+        from electos.ballotmaker.ballots.copies import build_copies
+
+        batch = build_copies(
+            election,
+            copies,
+            _output_dir,
+            jobs,
+            copies_per_file,
+            first_serial,
+            keep_going,
+            style_order,
+        )
+    else:
+        from electos.ballotmaker.ballots.build_ballots import build_ballots
+
+        batch = build_ballots(
+            election, jobs, dedup, _output_dir, incremental, keep_going
+        )
+    log.info(f"Ballots are in {batch.output_dir}")
+    if not batch.ok:
+        return RENDER_FAILED
+    return NO_ERRORS
+
+
+def load_election(
+    edf: Path, use_cache: bool = True, style_filter: BallotStyleFilter = None
+) -> Tuple[Optional[ElectionData], int]:
+    """The election in an EDF with the ballot styles to make, or an error"""
+    with span("make_ballots"):
+        try:
+            elections = load_ballot_data(edf, use_cache, style_filter)
+        except (OSError, ValueError) as ex:
+            # unreadable, not JSON, or not a valid election report
+            log.error(f"Can't extract ballot data from {edf}: {ex}")
+            return None, INVALID_DATA
+        except Exception:
+            log.exception(f"Extracting ballot data from {edf} failed")
+            return None, INVALID_DATA
+    if not elections or not elections[0].ballot_styles:
+        log.error(f"No ballot styles match {style_filter}")
+        return None, NO_DATA
+    if len(elections) > 1:
+        log.warning(
+            f"{edf} has {len(elections)} elections, "
+            "making ballots for the first"
+        )
+    return elections[0], NO_ERRORS
+
+
+def read_shard_plan(
+    plan: Path, edf: Path, shards: int
+) -> Tuple[Optional[dict], int]:
+    """A shard plan, if it was made for this EDF and number of shards"""
+    try:
+        shard_plan = read_plan(plan)
+    except (OSError, ValueError) as ex:
+        log.error(f"Can't read shard plan {plan}: {ex}")
+        return None, INVALID_DATA
+    if shard_plan["edf_hash"] != edf_cache_key(edf):
+        log.error(f"Shard plan {plan} was made for a different EDF")
+        return None, INVALID_DATA
+    if shard_plan["shards"] != shards:
+        log.error(f"Shard plan {plan} has {shard_plan['shards']} shards")
+        return None, INVALID_DATA
+    return shard_plan, NO_ERRORS
@@ -0,0 +1,355 @@
+"""Render ballots on request from a warm process.
+
+'ballotmaker serve' starts a pool of rendering processes that have already
+imported ReportLab and built the ballot frames and styles, then listens
+for render jobs on a localhost HTTP port. Each job only pays for layout
+and PDF output.
+
+There's no authentication, so the server only listens on a loopback
+address, and a job can only name files in the root directory the server
+is given ('--root'). Without one, jobs can't name files at all.
+
+Render the ballot styles of an EDF file selected by ID and GP unit name
+patterns (fnmatch wildcards; leave out "styles" and "gp_units" for all of
+them). A relative path is in the root directory:
+
+    POST /render
+    {"edf": "county/edf.json", "styles": ["precinct_4_*"]}
+
+Or POST the EDF itself, with the patterns in the query string:
+
+    POST /render/edf?style=precinct_4_*&gp_unit=Bedrock*
+
+Both answer with the PDF file for each ballot style rendered:
+
+    {"ballots": {"precinct_4_bedrock": "/.../precinct_4_bedrock_....pdf"}}
+
+Add "output_dir" to the job (or the query string) to choose where in the
+root directory the PDFs go; by default each job gets a new directory
+under ~/BallotMaker/serve. Or add "format": "pdf" (format=pdf) to get the
+PDF itself as the response, rendered in memory; the job must match one
+ballot style. 'GET /status' reports the version and pool size.
+"""
+
+import ipaddress
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from electos.ballotmaker.ballots.fingerprint import get_election_header
+from electos.ballotmaker.ballots.workers import (
+    build_ballot_task,
+    init_worker,
+    render_ballot_task,
+    replay,
+    run_task,
+)
+from electos.ballotmaker.constants import (
+    INVALID_DATA,
+    NO_ERRORS,
+    NO_FILE,
+    PROGRAM_NAME,
+    SERVE_PORT,
+    VERSION,
+)
+from electos.ballotmaker.data.cache import edf_cache_key
+from electos.ballotmaker.data.models import ElectionData
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
+from electos.ballotmaker.election_data import load_ballot_data
+
+log = logging.getLogger(__name__)
+
+SERVE_DIR_NAME = "serve"
+# elections kept in memory, by EDF contents
+ELECTION_CACHE_SIZE = 16
+
+
+def _warm_worker():
+    """Nothing to do: starting the worker is the point"""
+
+
+def is_loopback(host: str) -> bool:
+    """Does every address of the host name belong to this machine alone?"""
+    try:
+        addresses = socket.getaddrinfo(host, None)
+    except (socket.gaierror, UnicodeError):
+        return False
+    return bool(addresses) and all(
+        # leave out any IPv6 scope, 'fe80::1%eth0'
+        ipaddress.ip_address(address[4][0].split("%")[0]).is_loopback
+        for address in addresses
+    )
+
+
+class BallotServer(ThreadingHTTPServer):
+
+    """HTTP server with a warm pool of ballot rendering processes"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple,
+        jobs: int = 0,
+        output_dir: Path = None,
+        root: Path = None,
+    ):
+        """
+        Raises:
+            ValueError if the address isn't a loopback address
+        """
+        if not is_loopback(address[0]):
+            raise ValueError(
+                f"Not a loopback address: '{address[0]}'; the server has "
+                "no authentication"
+            )
+        super().__init__(address, _RenderHandler)
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.output_dir = Path(
+            output_dir or Path(Path.home(), PROGRAM_NAME, SERVE_DIR_NAME)
+        )
+        self.root = Path(root).resolve() if root is not None else None
+        self._elections = {}
+        self._lock = threading.Lock()
+        self._job_numbers = count(1)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=init_worker
+        )
+        # start every worker now, not on the first requests
+        wait([self.executor.submit(_warm_worker) for _ in range(self.jobs)])
+        log.info(f"Started {self.jobs} rendering processes")
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown()
+
+    def job_path(self, name: str) -> Path:
+        """
+        A file or directory named by a job, which must be in the root
+        directory; a relative path is in the root directory
+        Raises:
+            PermissionError if it isn't
+        """
+        if self.root is None:
+            raise PermissionError(
+                "Jobs can't name files: the server has no root directory"
+            )
+        path = Path(self.root, name).resolve()
+        # symbolic links are followed, so they can't lead out of the root
+        if path != self.root and self.root not in path.parents:
+            raise PermissionError(f"Not in the root directory: {name}")
+        return path
+
+    def elections(self, edf: Path) -> List[ElectionData]:
+        """Ballot data for an EDF, kept in memory for later jobs"""
+        key = edf_cache_key(edf)
+        with self._lock:
+            elections = self._elections.get(key)
+        if elections is None:
+            elections = load_ballot_data(edf)
+            if not elections:
+                raise FileNotFoundError(f"No ballot data in EDF {edf}")
+            with self._lock:
+                if len(self._elections) >= ELECTION_CACHE_SIZE:
+                    self._elections.pop(next(iter(self._elections)))
+                self._elections[key] = elections
+        return elections
+
+    def _job_dir(self) -> Path:
+        now = datetime.now()
+        date_time = now.strftime("%Y_%m_%dT%H%M%S")
+        with self._lock:
+            job_number = next(self._job_numbers)
+        return Path(self.output_dir, f"{date_time}_{job_number}")
+
+    def _matching(
+        self,
+        elections: List[ElectionData],
+        style_filter: BallotStyleFilter = None,
+    ) -> List[tuple]:
+        """The matching ballot styles, each with its election's header"""
+        style_filter = style_filter or BallotStyleFilter()
+        matching = [
+            (ballot_data, get_election_header(election))
+            for election in elections
+            for ballot_data in election.ballot_styles
+            if style_filter.matches_style(ballot_data)
+        ]
+        if not matching:
+            raise LookupError(f"No ballot styles match {style_filter}")
+        return matching
+
+    def render(
+        self,
+        elections: List[ElectionData],
+        style_filter: BallotStyleFilter = None,
+        output_dir: Path = None,
+    ) -> Dict[str, str]:
+        """Render the matching ballot styles, return their PDF files"""
+        output_dir = Path(output_dir or self._job_dir())
+        date_time = datetime.now().strftime("%Y_%m_%dT%H%M%S")
+        tasks = [
+            (ballot_data, election_header, output_dir, date_time)
+            for ballot_data, election_header in self._matching(
+                elections, style_filter
+            )
+        ]
+        output_dir.mkdir(parents=True, exist_ok=True)
+        futures = [
+            self.executor.submit(run_task, build_ballot_task, task)
+            for task in tasks
+        ]
+        return {
+            task[0].id: replay(future.result())
+            for task, future in zip(tasks, futures)
+        }
+
+    def render_pdf(
+        self,
+        elections: List[ElectionData],
+        style_filter: BallotStyleFilter = None,
+    ) -> bytes:
+        """Render the one matching ballot style, return the PDF itself"""
+        tasks = self._matching(elections, style_filter)
+        if len(tasks) > 1:
+            raise ValueError(
+                f"{len(tasks)} ballot styles match {style_filter}, "
+                "a PDF response holds one"
+            )
+        future = self.executor.submit(run_task, render_ballot_task, tasks[0])
+        return replay(future.result())
+
+    def edf_elections(self, edf: bytes) -> List[ElectionData]:
+        """Ballot data for an EDF sent with the job"""
+        with tempfile.TemporaryDirectory() as edf_dir:
+            edf_file = Path(edf_dir, "edf.json")
+            edf_file.write_bytes(edf)
+            return self.elections(edf_file)
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+
+    server_version = f"{PROGRAM_NAME}/{VERSION}"
+
+    def log_message(self, format, *args):
+        log.info(f"{self.address_string()} - {format % args}")
+
+    def _reply(self, status: int, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/status":
+            self._reply(404, {"error": f"Not found: {self.path}"})
+            return
+        self._reply(
+            200,
+            {
+                "program": PROGRAM_NAME,
+                "version": VERSION,
+                "jobs": self.server.jobs,
+            },
+        )
+
+    def _job(self, url, body: bytes) -> tuple:
+        """The job's elections, style filter, output directory and format"""
+        if url.path == "/render":
+            job = json.loads(body)
+            if "edf" not in job:
+                raise ValueError("Render job has no EDF")
+            elections = self.server.elections(self.server.job_path(job["edf"]))
+        else:
+            query = parse_qs(url.query)
+            job = {name: values[0] for name, values in query.items()}
+            job["styles"] = query.get("style")
+            job["gp_units"] = query.get("gp_unit")
+            elections = self.server.edf_elections(body)
+        output_dir = job.get("output_dir")
+        if output_dir is not None:
+            output_dir = self.server.job_path(output_dir)
+        return (
+            elections,
+            BallotStyleFilter(job.get("styles"), job.get("gp_units")),
+            output_dir,
+            job.get("format", "files"),
+        )
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if url.path not in ("/render", "/render/edf"):
+            self._reply(404, {"error": f"Not found: {self.path}"})
+            return
+        try:
+            elections, style_filter, output_dir, response = self._job(
+                url, body
+            )
+            if response == "pdf":
+                pdf = self.server.render_pdf(elections, style_filter)
+                self._reply(200, pdf, "application/pdf")
+                return
+            ballots = self.server.render(elections, style_filter, output_dir)
+        except PermissionError as ex:
+            self._reply(403, {"error": str(ex)})
+            return
+        except (LookupError, OSError) as ex:
+            self._reply(404, {"error": str(ex)})
+            return
+        except (TypeError, ValueError) as ex:
+            self._reply(400, {"error": str(ex)})
+            return
+        except Exception as ex:
+            log.exception(f"Render job failed: {self.path}")
+            self._reply(500, {"error": str(ex)})
+            return
+        self._reply(200, {"ballots": ballots})
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = SERVE_PORT,
+    jobs: int = 0,
+    output_dir: Path = None,
+    root: Path = None,
+) -> int:
+    """Serve render jobs until interrupted
+    Optional:
+        host, port: where to listen, a loopback address; port 0 picks a
+            free port
+        jobs: number of rendering processes; 0 = one per CPU
+        output_dir: directory for each job's PDF directory
+        root: the directory with the files jobs can name; without it, a
+            job can't name any
+    Returns:
+        An error code if the server can't start
+    """
+    if root is not None and not Path(root).is_dir():
+        log.error(f"Root directory {root} is not a directory")
+        return NO_FILE
+    try:
+        server = BallotServer((host, port), jobs, output_dir, root)
+    except ValueError as ex:
+        log.error(str(ex))
+        return INVALID_DATA
+    with server:
+        host, port = server.server_address[:2]
+        log.info(f"Serving ballots on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            log.info("Stopping ballot server")
+    return NO_ERRORS
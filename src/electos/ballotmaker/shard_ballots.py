@@ -0,0 +1,91 @@
+import logging
+from pathlib import Path
+from typing import List
+
+from electos.ballotmaker.ballots.shards import (
+    merge_shards,
+    plan_shards,
+    read_plan,
+    write_plan,
+)
+from electos.ballotmaker.constants import (
+    INVALID_DATA,
+    NO_ERRORS,
+    NO_FILE,
+    RENDER_FAILED,
+)
+from electos.ballotmaker.data.cache import edf_cache_key
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
+from electos.ballotmaker.make_ballots import load_election
+
+log = logging.getLogger(__name__)
+
+
+def plan_ballots(
+    edf: Path,
+    plan: Path,
+    shards: int,
+    style_ids: List[str] = None,
+    gp_units: List[str] = None,
+    use_cache: bool = True,
+) -> int:
+    """Divide the ballot styles of an EDF into shards to make separately
+    Requires:
+        EDF file (JSON format) edf: Path,
+        File to write the plan to (JSON format) plan: Path,
+        Number of shards
+    Optional:
+        Ballot styles to make, by ID or GP unit name (fnmatch patterns)
+        use_cache: reuse ballot data extracted from the EDF before
+    """
+    if edf is None or not edf.is_file():
+        log.error(f"EDF {edf} is not a file")
+        return NO_FILE
+    style_filter = BallotStyleFilter(style_ids, gp_units)
+    election, error = load_election(edf, use_cache, style_filter)
+    if error:
+        return error
+    shard_plan = plan_shards(election, shards, edf_cache_key(edf))
+    write_plan(plan, shard_plan)
+    for number, cost in enumerate(shard_plan["shard_costs"], start=1):
+        styles = sum(_["shard"] == number for _ in shard_plan["ballot_styles"])
+        log.info(
+            f"Shard {number}/{shards}: {styles} ballot styles, cost {cost}"
+        )
+    log.info(f"Shard plan written to {plan}")
+    return NO_ERRORS
+
+
+def merge_ballots(
+    shard_dirs: List[Path], output_dir: Path, plan: Path = None
+) -> int:
+    """Put the ballots made by each shard in one output directory
+    Requires:
+        The output directories of the shards
+        Output directory for the merged ballots
+    Optional:
+        The shard plan, to check that every ballot style was made
+    """
+    shard_plan = None
+    if plan is not None:
+        try:
+            shard_plan = read_plan(plan)
+        except (OSError, ValueError) as ex:
+            log.error(f"Can't read shard plan {plan}: {ex}")
+            return INVALID_DATA
+    try:
+        merged, missing = merge_shards(shard_dirs, output_dir, shard_plan)
+    except ValueError as ex:
+        log.error(str(ex))
+        return INVALID_DATA
+    log.info(
+        f"Merged {len(merged)} ballot styles from {len(shard_dirs)} shards "
+        f"into {output_dir}"
+    )
+    if missing:
+        log.error(
+            f"{len(missing)} ballot styles in {plan} weren't made: "
+            f"{', '.join(missing)}"
+        )
+        return RENDER_FAILED
+    return NO_ERRORS
@@ -0,0 +1,134 @@
+"""Timing spans for the stages of ballot production.
+
+Stages are timed wherever they run with 'span', and collected in the
+module's 'timings'. Rendering processes send their spans back to the
+parent, so a report covers the whole run.
+
+The module's 'timings' only keeps spans during 'profile_run': a process
+that runs for a long time, like 'serve', doesn't collect them for ever.
+"""
+import cProfile
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+
+class Timings:
+    """Collect timed spans and summarize them by stage
+    Optional:
+        enabled: keep spans; when it's false, 'span' and 'extend' do nothing
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans = []
+
+    @contextmanager
+    def span(self, stage: str, **details):
+        """Time the enclosed block as a stage, with optional details"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.spans.append({"stage": stage, "seconds": seconds, **details})
+
+    def clear(self):
+        self.spans = []
+
+    def extend(self, spans: list):
+        """Add spans recorded elsewhere, e.g. in a worker process"""
+        if self.enabled:
+            self.spans.extend(spans)
+
+    def summary(self) -> dict:
+        """Count, total, mean and maximum seconds for each stage"""
+        stages = {}
+        for span in self.spans:
+            stage = stages.setdefault(
+                span["stage"], {"count": 0, "total": 0.0, "max": 0.0}
+            )
+            stage["count"] += 1
+            stage["total"] += span["seconds"]
+            stage["max"] = max(stage["max"], span["seconds"])
+        for stage in stages.values():
+            stage["mean"] = stage["total"] / stage["count"]
+        return stages
+
+    def ballot_styles(self) -> dict:
+        """Seconds spent building each ballot style"""
+        return {
+            span["ballot_style"]: span["seconds"]
+            for span in self.spans
+            if span["stage"] == "build_ballot"
+        }
+
+    def format_summary(self) -> str:
+        lines = [
+            "Stage                    count     total      mean       max"
+        ]
+        for name, stage in self.summary().items():
+            lines.append(
+                f"{name:<22} {stage['count']:>7} {stage['total']:>9.3f}"
+                f" {stage['mean']:>9.3f} {stage['max']:>9.3f}"
+            )
+        ballot_styles = self.ballot_styles()
+        if ballot_styles:
+            lines.append("")
+            lines.append("Ballot style                           seconds")
+            for ballot_style, seconds in ballot_styles.items():
+                lines.append(f"{ballot_style:<36} {seconds:>9.3f}")
+        return "\n".join(lines)
+
+    def report(self) -> dict:
+        """Machine-readable report: stage summary plus every span"""
+        return {
+            "stages": self.summary(),
+            "ballot_styles": self.ballot_styles(),
+            "spans": self.spans,
+        }
+
+
+timings = Timings(enabled=False)
+span = timings.span
+
+
+@contextmanager
+def profile_run(
+    show: bool = False, stats_file: Path = None, report_file: Path = None
+):
+    """
+    Collect timings for a command and report them afterwards
+    Optional:
+        show: print the stage summary and ballot style timings
+        stats_file: dump cProfile statistics (readable by pstats)
+        report_file: write the timings as JSON
+    """
+    timings.clear()
+    enabled = timings.enabled
+    timings.enabled = True
+    profiler = cProfile.Profile() if stats_file else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield timings
+    finally:
+        timings.enabled = enabled
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(stats_file)
+            log.info(f"Profile statistics written to {stats_file}")
+        if show:
+            print(timings.format_summary())
+        if report_file:
+            Path(report_file).write_text(
+                json.dumps(timings.report(), indent=4)
+            )
+            log.info(f"Timing report written to {report_file}")
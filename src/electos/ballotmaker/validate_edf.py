@@ -1,19 +1,34 @@
 import json
 import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict
+from functools import partial
 from pathlib import Path
+from typing import Iterator, List, Optional, TextIO, Tuple
 
-from electos.ballotmaker.constants import NO_ERRORS
-from electos.ballotmaker.data.extractor import BallotDataExtractor
+from electos.ballotmaker.constants import (
+    INVALID_DATA,
+    NO_DATA,
+    NO_ERRORS,
+    NO_FILE,
+)
+from electos.ballotmaker.data.edf_references import reference_errors
+from electos.ballotmaker.data.edf_schema import schema_errors
+from electos.ballotmaker.election_data import ElectionData
 
 log = logging.getLogger(__name__)
 
+EDF_PATTERN = "*.json"
+# schema and reference errors listed in an EDF's summary
+MAX_SCHEMA_ERRORS = 100
 
-def report(data, **opts):
+
+def report(election_data: ElectionData, **opts):
     """Generate data needed by BallotLab."""
-    extractor = BallotDataExtractor()
-    ballot_data = extractor.extract(data)
-    ballot_data = [asdict(_) for _ in ballot_data]
+    ballot_data = [asdict(_) for _ in election_data.ballot_data]
     print(json.dumps(ballot_data, indent=4))
 
 
@@ -24,8 +39,178 @@ def validate_edf(
     Requires:
         EDF file (JSON format) edf_file: Path,
     """
-    with _edf.open() as input:
-        text = input.read()
-        data = json.loads(text)
-    report(data)
+    election_data = ElectionData(_edf)
+    if election_data.edf_error != NO_ERRORS:
+        return election_data.edf_error
+    report(election_data)
     return NO_ERRORS
+
+
+def edf_files(paths: List[Path]) -> Iterator[Path]:
+    """The EDF files to validate: the files given, and the JSON files in
+    the directories given (and their subdirectories), in name order"""
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(path.rglob(EDF_PATTERN))
+        else:
+            # a missing file is reported like any other invalid EDF
+            yield path
+
+
+def _exception_errors(ex: Exception) -> List[str]:
+    """Error messages for an exception: one per field for a model's
+    validation errors, which are all reported at once"""
+    errors = getattr(ex, "errors", None)
+    if callable(errors):
+        return [
+            f"{'.'.join(str(_) for _ in error['loc'])}: {error['msg']}"
+            for error in errors()
+        ]
+    return [f"{type(ex).__name__}: {ex}"]
+
+
+def edf_errors(
+    edf_data: dict, schema: bool = True, references: bool = True
+) -> List[str]:
+    """Check an EDF against the NIST schema, then the references between
+    its objects if it matches
+    Requires:
+        edf_data: the parsed EDF
+    Returns:
+        Its first MAX_SCHEMA_ERRORS errors as "pointer: message", with a
+            count of the rest
+    """
+    errors = schema_errors(edf_data) if schema else []
+    if references and not errors:
+        errors = reference_errors(edf_data)
+    messages = [
+        f"{pointer}: {message}"
+        for pointer, message in errors[:MAX_SCHEMA_ERRORS]
+    ]
+    if len(errors) > MAX_SCHEMA_ERRORS:
+        messages.append(f"... and {len(errors) - MAX_SCHEMA_ERRORS} more")
+    return messages
+
+
+def _extract(
+    edf: Path, summary: dict, dump: bool, edf_data: dict = None
+) -> Optional[str]:
+    """Count an EDF's ballot styles and contests by extracting its ballot
+    data, which is returned as indented JSON if 'dump' is set"""
+    election_data = ElectionData(edf, edf_data)
+    summary["error_code"] = election_data.edf_error
+    ballot_data = election_data.ballot_data
+    ballot_styles = [
+        _ for election in ballot_data for _ in election.ballot_styles
+    ]
+    summary["ballot_styles"] = len(ballot_styles)
+    summary["contests"] = len(
+        {_.id for style in ballot_styles for _ in style.contests}
+    )
+    if not ballot_styles:
+        summary["error_code"] = NO_DATA
+        summary["errors"].append("EDF has no ballot styles")
+    if dump:
+        return json.dumps([asdict(_) for _ in ballot_data], indent=4)
+    return None
+
+
+def validate_file(
+    edf: Path, dump: bool = False, schema: bool = True, references: bool = True
+) -> Tuple[dict, Optional[str]]:
+    """Validate an EDF against the NIST schema, then by extracting its
+    ballot data
+    Optional:
+        dump: also return the ballot data
+        schema: check the schema first; an EDF that doesn't match it isn't
+            extracted
+        references: check that every reference between the EDF's objects
+            is to an '@id' of the right type before extracting
+    Returns:
+        A summary: EDF file, status ("ok" or "error"), error code,
+            ballot style and contest counts, errors and seconds taken
+        The ballot data as indented JSON if 'dump' is set, else None
+    """
+    start = time.perf_counter()
+    summary = {
+        "edf": str(edf),
+        "status": "ok",
+        "error_code": NO_ERRORS,
+        "ballot_styles": 0,
+        "contests": 0,
+        "errors": [],
+    }
+    text = None
+    try:
+        if not edf.is_file():
+            summary["error_code"] = NO_FILE
+            summary["errors"].append(f"EDF {edf} is not a file")
+        elif schema or references:
+            # parsed once, for the checks and the extraction
+            edf_data = json.loads(edf.read_bytes())
+            errors = edf_errors(edf_data, schema, references)
+            if errors:
+                summary["error_code"] = INVALID_DATA
+                summary["errors"].extend(errors)
+            else:
+                text = _extract(edf, summary, dump, edf_data)
+        else:
+            text = _extract(edf, summary, dump)
+    except Exception as ex:
+        summary["error_code"] = INVALID_DATA
+        summary["errors"].extend(_exception_errors(ex))
+    if summary["error_code"] != NO_ERRORS:
+        summary["status"] = "error"
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    return summary, text
+
+
+def _write_summaries(results: Iterator[tuple], output: TextIO) -> int:
+    result = NO_ERRORS
+    for summary, text in results:
+        if text is not None:
+            output.write(f"{text}\n")
+        output.write(f"{json.dumps(summary)}\n")
+        output.flush()
+        if result == NO_ERRORS:
+            result = summary["error_code"]
+    return result
+
+
+def validate_edfs(
+    paths: List[Path],
+    jobs: int = 1,
+    dump: bool = False,
+    output: TextIO = None,
+    schema: bool = True,
+    references: bool = True,
+) -> int:
+    """Validate EDF files, writing a JSON summary line for each
+    Requires:
+        paths: EDF files, and directories of them
+    Optional:
+        jobs: number of validating processes; 0 = one per CPU
+        dump: write each EDF's ballot data before its summary
+        output: where to write; standard output by default
+        schema: check each EDF against the NIST schema before extracting
+        references: check the references between each EDF's objects
+    Returns:
+        The error code of the first EDF that isn't valid, if any
+    """
+    output = output or sys.stdout
+    files = list(edf_files(paths))
+    if not files:
+        log.error(f"No EDF files found in {', '.join(map(str, paths))}")
+        return NO_FILE
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(files))
+    validate = partial(
+        validate_file, dump=dump, schema=schema, references=references
+    )
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map() keeps file order and yields each result as it's ready,
+            # so the summary streams out while the rest are validated
+            return _write_summaries(executor.map(validate, files), output)
+    return _write_summaries(map(validate, files), output)
@@ -0,0 +1,94 @@
+"""Ballot data shared by the tests
+
+The tests import these helpers: 'from conftest import ballot_style'.
+The model benchmark builds its extracted data with them too.
+"""
+
+from electos.ballotmaker.data.models import ElectionData
+
+ELECTION_HEADER = {
+    "Name": "General Election",
+    "EndDate": "2024-11-05",
+    "Type": "general",
+}
+
+
+def candidate_contest(
+    title: str = "Mayor",
+    candidates: int = 1,
+    party: dict = None,
+    write_in: bool = True,
+    number: int = 1,
+) -> dict:
+    """A candidate contest, each candidate in the party if one is given"""
+    choices = [
+        {
+            "id": f"contest-{number}--candidate-{candidate}",
+            "name": [f"Candidate {candidate}"],
+            "party": [party] if party else [],
+            "is_write_in": False,
+        }
+        for candidate in range(1, candidates + 1)
+    ]
+    if write_in:
+        choices.append(
+            {
+                "id": f"contest-{number}--write-in",
+                "name": [],
+                "party": [],
+                "is_write_in": True,
+            }
+        )
+    return {
+        "id": f"contest-{number}",
+        "type": "candidate",
+        "title": title,
+        "district": "Spacetown",
+        "vote_type": "plurality",
+        "votes_allowed": 1,
+        "candidates": choices,
+    }
+
+
+def ballot_measure(number: int = 1, title: str = None) -> dict:
+    return {
+        "id": f"ballot-measure-{number}",
+        "type": "ballot measure",
+        "title": title or f"Ballot Measure #{number}",
+        "district": "Spacetown",
+        "text": "Ballot measure text",
+        "choices": [
+            {"id": f"ballot-measure-{number}--yes", "choice": "yes"},
+            {"id": f"ballot-measure-{number}--no", "choice": "no"},
+        ],
+    }
+
+
+def ballot_style(
+    id: str,
+    title: str = "Ballot Measure #1",
+    contests: list = None,
+    scope: str = "Spacetown Precinct",
+) -> dict:
+    """
+    A ballot style; by default a candidate contest and a ballot measure
+    with the given title, so styles with different titles differ
+    """
+    if contests is None:
+        contests = [candidate_contest(), ballot_measure(title=title)]
+    return {"id": id, "scopes": [scope], "contests": contests}
+
+
+def election_data(*ballot_styles: dict, name: str = None) -> dict:
+    """An election as the extractor produces it"""
+    return {
+        "name": name or ELECTION_HEADER["Name"],
+        "type": ELECTION_HEADER["Type"],
+        "start_date": ELECTION_HEADER["EndDate"],
+        "end_date": ELECTION_HEADER["EndDate"],
+        "ballot_styles": list(ballot_styles),
+    }
+
+
+def election(*ballot_styles: dict, name: str = None) -> ElectionData:
+    return ElectionData(**election_data(*ballot_styles, name=name))
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import pytest
 
 from pytest import raises
@@ -369,3 +372,70 @@ def test_election_fields():
     for actual, expected in zip(item.ballot_styles, data["ballot_styles"]):
         actual = asdict(actual)
         assert actual == expected
+
+
+def test_election_from_extracted():
+    data = copy.deepcopy(ELECTION_TESTS[0][0])
+    data["ballot_styles"][0]["contests"].append(
+        {
+            "id": "ballot-measure-1",
+            "type": "ballot measure",
+            "title": "Ballot Measure #1",
+            "district": "Orbit City",
+            "text": "Ballot measure text",
+            "choices": [
+                {"id": "ballot-measure-1--yes", "choice": "yes"},
+                {"id": "ballot-measure-1--no", "choice": "no"},
+            ],
+        },
+    )
+    item = ElectionData.from_extracted(data)
+    # Same models as the checked path builds
+    assert item == ElectionData(**data)
+    assert asdict(item) == data
+    ballot_style = item.ballot_styles[0]
+    assert isinstance(ballot_style, BallotStyleData)
+    assert len(ballot_style.candidate_contests) == 1
+    assert len(ballot_style.ballot_measure_contests) == 1
+    # Slotted: no per-instance dictionaries
+    assert not hasattr(item, "__dict__")
+    assert not hasattr(ballot_style.contests[0].candidates[0], "__dict__")
+    # The ballot data cache pickles models
+    assert pickle.loads(pickle.dumps(item)) == item
+
+
+def test_election_from_extracted_shared_contests():
+    data = copy.deepcopy(ELECTION_TESTS[0][0])
+    ballot_style = data["ballot_styles"][0]
+    # The extractor shares a contest's data between ballot styles
+    data["ballot_styles"].append(
+        dict(ballot_style, id = "precinct_3_spacetown")
+    )
+    item = ElectionData.from_extracted(data)
+    first, second = item.ballot_styles
+    assert first.id != second.id
+    assert first.contests[0] is second.contests[0]
+    # Unshared data makes separate models
+    data["ballot_styles"][1] = copy.deepcopy(data["ballot_styles"][1])
+    first, second = ElectionData.from_extracted(data).ballot_styles
+    assert first.contests[0] is not second.contests[0]
+    assert first.contests[0] == second.contests[0]
+
+
+def test_election_from_extracted_party_without_abbreviation():
+    data = copy.deepcopy(ELECTION_TESTS[0][0])
+    candidate = data["ballot_styles"][0]["contests"][0]["candidates"][0]
+    # The extractor leaves out a party's missing name or abbreviation
+    candidate["party"] = [{"name": "Lepton"}]
+    with raises(TypeError, match = "missing required fields: 'abbreviation'"):
+        ElectionData.from_extracted(data)
+    # As the checked path does
+    with raises(TypeError, match = "'abbreviation'"):
+        ElectionData(**data)
+
+
+def test_election_from_extracted_unknown_field():
+    data = copy.deepcopy(ELECTION_TESTS[0][0])
+    data["ballot_styles"][0]["precinct"] = "spacetown-precinct"
+    with raises(TypeError, match = "got unexpected fields: 'precinct'"):
+        ElectionData.from_extracted(data)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from conftest import election
+from electos.ballotmaker.data.cache import BallotDataCache, edf_cache_key
+
+test_dir = Path(__file__).parent.resolve()
+test_file = Path("june_test_case.json")
+full_test_path = Path(test_dir, test_file)
+
+
+def test_cache_key():
+    key = edf_cache_key(full_test_path)
+    assert key == edf_cache_key(full_test_path)
+    assert key != edf_cache_key(Path(test_dir, "empty.json"))
+
+
+def test_cache_round_trip(tmp_path):
+    cache = BallotDataCache(tmp_path)
+    assert cache.get("missing") is None
+    cache.put("key", [election()])
+    assert cache.get("key") == [election()]
+
+
+def test_cache_unreadable_entry(tmp_path):
+    cache = BallotDataCache(tmp_path)
+    Path(tmp_path, "bad.pickle").write_bytes(b"not a pickle")
+    assert cache.get("bad") is None
+    assert not Path(tmp_path, "bad.pickle").exists()
+
+
+def test_cache_eviction(tmp_path):
+    cache = BallotDataCache(tmp_path)
+    cache.put("first", [election(name="First")])
+    size = Path(tmp_path, "first.pickle").stat().st_size
+    # room for two entries: adding a third evicts the least recently used
+    cache.max_bytes = size * 2 + 8
+    cache.put("second", [election(name="Second")])
+    cache.get("first")
+    cache.put("third", [election(name="Third")])
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
@@ -0,0 +1,38 @@
+from io import BytesIO
+
+from conftest import (
+    ELECTION_HEADER,
+    ballot_measure,
+    ballot_style,
+    candidate_contest,
+)
+from electos.ballotmaker.ballots.ballot_layout import (
+    build_ballot,
+    render_ballot,
+    write_ballot,
+)
+from electos.ballotmaker.data.models import BallotStyleData
+from reportlab import rl_config
+
+BALLOT_STYLE = ballot_style(
+    "precinct_1",
+    contests=[
+        candidate_contest(party={"name": "Lepton", "abbreviation": "LEP"}),
+        ballot_measure(),
+    ],
+)
+
+
+def test_render_ballot(tmp_path, monkeypatch):
+    # same bytes for the same ballot, whatever the output
+    monkeypatch.setattr(rl_config, "invariant", 1)
+    ballot_data = BallotStyleData(**BALLOT_STYLE)
+    pdf = render_ballot(ballot_data, ELECTION_HEADER)
+    assert pdf.startswith(b"%PDF")
+    stream = BytesIO()
+    write_ballot(ballot_data, ELECTION_HEADER, stream)
+    assert stream.getvalue() == pdf
+    ballot_name = build_ballot(ballot_data, ELECTION_HEADER, tmp_path, "now")
+    assert ballot_name == f"{tmp_path}/precinct_1_now.pdf"
+    with open(ballot_name, "rb") as ballot_file:
+        assert ballot_file.read() == pdf
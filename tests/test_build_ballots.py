@@ -0,0 +1,162 @@
+import json
+from pathlib import Path
+
+import pytest
+from conftest import ballot_style, election
+from electos.ballotmaker.ballots import build_ballots, workers
+from electos.ballotmaker.ballots.journal import JOURNAL_NAME, read_journal
+from electos.ballotmaker.ballots.manifest import MANIFEST_NAME, read_manifest
+
+
+def build(monkeypatch, output_dir: Path, *ballot_styles: dict) -> list:
+    """Build incrementally, return the IDs of the styles rendered"""
+    rendered = []
+    build_ballot = workers.build_ballot
+
+    def counting_build_ballot(ballot_data, *args):
+        rendered.append(ballot_data.id)
+        return build_ballot(ballot_data, *args)
+
+    monkeypatch.setattr(workers, "build_ballot", counting_build_ballot)
+    build_ballots.build_ballots(
+        election(*ballot_styles), output_dir=output_dir, incremental=True
+    )
+    return rendered
+
+
+def pdf_files(output_dir: Path) -> set:
+    return {_.name for _ in output_dir.glob("*.pdf")}
+
+
+def test_incremental(tmp_path, monkeypatch):
+    a, b, c = ballot_style("a"), ballot_style("b"), ballot_style("c")
+    assert build(monkeypatch, tmp_path, a, b, c) == ["a"]
+    manifest = read_manifest(tmp_path)
+    assert [_["source"] for _ in manifest.values()] == ["a", "a", "a"]
+    # nothing changed, nothing rendered
+    assert build(monkeypatch, tmp_path, a, b, c) == []
+    assert read_manifest(tmp_path) == manifest
+    # only the changed style is rendered
+    b = ballot_style("b", title="Ballot Measure #2")
+    assert build(monkeypatch, tmp_path, a, b, c) == ["b"]
+    manifest = read_manifest(tmp_path)
+    assert pdf_files(tmp_path) == {_["file"] for _ in manifest.values()}
+    # PDFs of dropped styles are deleted
+    assert build(monkeypatch, tmp_path, b) == []
+    manifest = read_manifest(tmp_path)
+    assert list(manifest) == ["b"]
+    assert pdf_files(tmp_path) == {manifest["b"]["file"]}
+
+
+def test_missing_pdf_rendered(tmp_path, monkeypatch):
+    a = ballot_style("a")
+    build(monkeypatch, tmp_path, a)
+    Path(tmp_path, read_manifest(tmp_path)["a"]["file"]).unlink()
+    assert build(monkeypatch, tmp_path, a) == ["a"]
+
+
+def test_unreadable_manifest(tmp_path, monkeypatch):
+    Path(tmp_path, MANIFEST_NAME).write_text("not json")
+    assert read_manifest(tmp_path) == {}
+    assert build(monkeypatch, tmp_path, ballot_style("a")) == ["a"]
+    manifest = json.loads(Path(tmp_path, MANIFEST_NAME).read_text())
+    assert list(manifest["ballots"]) == ["a"]
+
+
+def styles(*ids: str) -> list:
+    """Ballot styles that differ, so none is linked to another"""
+    return [ballot_style(_, title=f"Ballot Measure {_}") for _ in ids]
+
+
+def failing_build(
+    monkeypatch,
+    output_dir: Path,
+    failing: str,
+    *ballot_styles,
+    error: BaseException = NotImplementedError("Multiple scopes"),
+    **options,
+):
+    """Build with the ballot style 'failing' raising an error"""
+    build_ballot = workers.build_ballot
+
+    def failing_build_ballot(ballot_data, *args):
+        if ballot_data.id == failing:
+            raise error
+        return build_ballot(ballot_data, *args)
+
+    monkeypatch.setattr(workers, "build_ballot", failing_build_ballot)
+    return build_ballots.build_ballots(
+        election(*ballot_styles), dedup=False, output_dir=output_dir, **options
+    )
+
+
+def test_batch(tmp_path):
+    batch = build_ballots.build_ballots(
+        election(ballot_style("a"), ballot_style("b")), output_dir=tmp_path
+    )
+    assert batch.ok
+    assert batch.output_dir == tmp_path
+    summary = batch.summary()
+    assert summary["ballot_styles"] == 2
+    assert summary["rendered"] == 1
+    assert summary["linked"] == 1
+    assert summary["failed"] == 0
+    assert summary["styles_per_second"] > 0
+
+
+def test_batch_stops_at_failure(tmp_path, monkeypatch):
+    a, b, c = ballot_style("a"), ballot_style("b"), ballot_style("c")
+    batch = failing_build(monkeypatch, tmp_path, "b", a, b, c)
+    assert not batch.ok
+    assert [_.state for _ in batch.tasks.values()] == [
+        "rendered",
+        "failed",
+        "pending",
+    ]
+    assert batch.tasks["b"].error == "NotImplementedError: Multiple scopes"
+    # only the PDFs that were made are listed
+    manifest = read_manifest(tmp_path)
+    assert list(manifest) == ["a"]
+    assert pdf_files(tmp_path) == {manifest["a"]["file"]}
+
+
+def test_keep_going(tmp_path, monkeypatch):
+    a, b, c = styles("a", "b", "c")
+    batch = failing_build(monkeypatch, tmp_path, "b", a, b, c, keep_going=True)
+    assert not batch.ok
+    assert [_.state for _ in batch.tasks.values()] == [
+        "rendered",
+        "failed",
+        "rendered",
+    ]
+    assert list(read_manifest(tmp_path)) == ["a", "c"]
+    # the failed style is the one made next time
+    monkeypatch.undo()
+    assert build(monkeypatch, tmp_path, a, b, c) == ["b"]
+
+
+def test_resume(tmp_path, monkeypatch):
+    a, b, c = styles("a", "b", "c")
+    # the build is killed part way through: no manifest, but a journal
+    with pytest.raises(KeyboardInterrupt):
+        failing_build(
+            monkeypatch, tmp_path, "b", a, b, c, error=KeyboardInterrupt()
+        )
+    assert not Path(tmp_path, MANIFEST_NAME).exists()
+    assert list(read_journal(tmp_path)) == ["a"]
+    # resuming keeps the ballot style that was finished
+    monkeypatch.undo()
+    assert build(monkeypatch, tmp_path, a, b, c) == ["b", "c"]
+    assert list(read_manifest(tmp_path)) == ["a", "b", "c"]
+    assert not Path(tmp_path, JOURNAL_NAME).exists()
+
+
+def test_journal_cut_short(tmp_path, monkeypatch):
+    a, b = ballot_style("a"), ballot_style("b")
+    with pytest.raises(KeyboardInterrupt):
+        failing_build(
+            monkeypatch, tmp_path, "b", a, b, error=KeyboardInterrupt()
+        )
+    journal = Path(tmp_path, JOURNAL_NAME)
+    journal.write_text(journal.read_text() + '{"id": "b", "sta')
+    assert list(read_journal(tmp_path)) == ["a"]
@@ -1,5 +1,8 @@
+import json
 from pathlib import Path
 
+import pytest
+import typer
 from electos.ballotmaker import cli
 from electos.ballotmaker.constants import (
     NO_ERRORS,
@@ -32,9 +35,13 @@ def test_version():
 
 def test_make():
     # bypass mandatory CLI option to force error
-    assert cli.make(edf=None) == NO_FILE
+    with pytest.raises(typer.Exit) as error:
+        cli.make(edf=None)
+    assert error.value.exit_code == NO_FILE
     # any old path will satisfy current tests
-    assert cli.make(imaginary_file) == NO_FILE
+    with pytest.raises(typer.Exit) as error:
+        cli.make(imaginary_file)
+    assert error.value.exit_code == NO_FILE
     # check CLI errors: no options for make
     result = runner.invoke(cli.app, ["make"])
     assert result.exit_code == NO_FILE
@@ -45,6 +52,15 @@ def test_make():
     assert "Error: Option" in result.stdout
 
 
+def test_make_edf(tmp_path):
+    edf = Path(Path(__file__).parent, "june_test_case.json")
+    result = runner.invoke(
+        cli.app, ["make", "--edf", str(edf), "--output-dir", str(tmp_path)]
+    )
+    assert result.exit_code == NO_ERRORS
+    assert list(tmp_path.glob("*.pdf"))
+
+
 # def test_validate():
 #     # bypass mandatory CLI option to force error
 #     # assert cli.validate(edf=None) == NO_FILE
@@ -63,3 +79,19 @@ def test_make():
 def test_demo():
     result = runner.invoke(cli.app, ["demo"])
     assert result.exit_code == NO_ERRORS
+
+
+def test_demo_jobs():
+    result = runner.invoke(cli.app, ["demo", "--jobs", "2"])
+    assert result.exit_code == NO_ERRORS
+
+
+def test_profile(tmp_path):
+    report = tmp_path / "timing.json"
+    result = runner.invoke(
+        cli.app,
+        ["--profile", "--timing-report", str(report), "demo"],
+    )
+    assert result.exit_code == NO_ERRORS
+    assert "doc_build" in result.stdout
+    assert "build_ballot" in json.loads(report.read_text())["stages"]
@@ -0,0 +1,65 @@
+import json
+import re
+from io import BytesIO
+
+from conftest import ELECTION_HEADER, ballot_style, election
+from electos.ballotmaker.ballots.ballot_layout import render_ballot
+from electos.ballotmaker.ballots.combined import build_combined, write_combined
+from electos.ballotmaker.data.models import BallotStyleData
+
+BALLOT_STYLES = [
+    BallotStyleData(**ballot_style("a", "Measure A")),
+    BallotStyleData(**ballot_style("b", "Measure B")),
+    # the same ballot as a
+    BallotStyleData(**ballot_style("c", "Measure A")),
+]
+
+
+def combined_pdf(dedup: bool = True) -> tuple:
+    output = BytesIO()
+    index = write_combined(BALLOT_STYLES, ELECTION_HEADER, output, dedup)
+    return output.getvalue(), index
+
+
+def test_write_combined():
+    pdf, index = combined_pdf()
+    pages = index[0]["last_page"]
+    assert index == [
+        {"id": "a", "first_page": 1, "last_page": pages},
+        {"id": "b", "first_page": pages + 1, "last_page": 2 * pages},
+        {"id": "c", "first_page": 2 * pages + 1, "last_page": 3 * pages},
+    ]
+    # the page tree, not the outline
+    assert re.findall(rb"/Count (\d+) /Kids", pdf) == [str(3 * pages).encode()]
+    # an outline entry for each style
+    for ballot_data in BALLOT_STYLES:
+        assert f"/Title ({ballot_data.id})".encode() in pdf
+    assert b"/PageMode /UseOutlines" in pdf
+    # the instruction images are stored once, as in a single ballot
+    single = render_ballot(BALLOT_STYLES[0], ELECTION_HEADER)
+    assert pdf.count(b"/Subtype /Image") == single.count(b"/Subtype /Image")
+    assert len(pdf) < 2 * len(single)
+
+
+def test_combined_dedup():
+    pdf, _ = combined_pdf()
+    separate_pdf, _ = combined_pdf(dedup=False)
+    # c is drawn with a's page forms
+    assert pdf.count(b"/Subtype /Form") < separate_pdf.count(b"/Subtype /Form")
+    assert len(pdf) < len(separate_pdf)
+
+
+def test_build_combined(tmp_path):
+    batch = build_combined(election(ballot_style("a")), tmp_path)
+    assert batch.ok
+    (combined_file,) = tmp_path.glob("*.pdf")
+    index = json.loads(combined_file.with_suffix(".json").read_text())
+    assert index["file"] == combined_file.name
+    assert [_["id"] for _ in index["ballot_styles"]] == ["a"]
+
+
+def test_build_combined_empty(tmp_path):
+    batch = build_combined(election(), tmp_path)
+    assert batch.ok
+    assert not batch.tasks
+    assert not list(tmp_path.iterdir())
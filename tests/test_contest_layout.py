@@ -0,0 +1,32 @@
+from conftest import ballot_measure
+from electos.ballotmaker.ballots.contest_layout import (
+    ContestTable,
+    contest_table,
+)
+from electos.ballotmaker.data.models import BallotMeasureContestData
+
+BALLOT_MEASURE = ballot_measure()
+
+
+def test_contest_table_reused():
+    first = contest_table(BallotMeasureContestData(**BALLOT_MEASURE))
+    second = contest_table(BallotMeasureContestData(**BALLOT_MEASURE))
+    assert isinstance(first, ContestTable)
+    # each ballot gets its own table, sharing the built cells
+    assert first is not second
+    assert first._cellvalues is second._cellvalues
+
+
+def test_contest_table_changed():
+    first = contest_table(BallotMeasureContestData(**BALLOT_MEASURE))
+    changed = dict(BALLOT_MEASURE, text="Amended ballot measure text")
+    second = contest_table(BallotMeasureContestData(**changed))
+    assert first._cellvalues is not second._cellvalues
+
+
+def test_clone_keeps_measurements():
+    table = contest_table(BallotMeasureContestData(**BALLOT_MEASURE))
+    width, height = table.wrap(492, 720)
+    clone = table.clone()
+    assert clone._rowHeights == table._rowHeights
+    assert clone.wrap(492, 720) == (width, height)
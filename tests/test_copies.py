@@ -0,0 +1,79 @@
+import base64
+import json
+import re
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+from conftest import ELECTION_HEADER, ballot_style, election
+from electos.ballotmaker.ballots.copies import (
+    SERIALS_NAME,
+    build_copies,
+    serial_numbers,
+    write_copies,
+)
+
+
+def page_count(pdf: bytes) -> int:
+    (count,) = re.findall(rb"/Count (\d+)", pdf)
+    return int(count)
+
+
+def pdf_streams(pdf: bytes) -> list:
+    """The decoded content streams of a ReportLab PDF"""
+    return [
+        # ASCII85 without its "~>" end marker, then deflated
+        zlib.decompress(base64.a85decode(_.strip()[:-2]))
+        for _ in re.findall(rb"stream\r?\n(.*?)endstream", pdf, re.S)
+    ]
+
+
+def test_serial_numbers():
+    assert serial_numbers(9, 3) == ["00000009", "00000010", "00000011"]
+
+
+def test_write_copies():
+    (ballot_data,) = election(ballot_style("a")).ballot_styles
+    one = BytesIO()
+    write_copies(ballot_data, ELECTION_HEADER, one, ["00000001"])
+    pages = page_count(one.getvalue())
+    three = BytesIO()
+    serials = ["00000007", "00000008", "00000009"]
+    write_copies(ballot_data, ELECTION_HEADER, three, serials)
+    pdf = three.getvalue()
+    assert page_count(pdf) == 3 * pages
+    streams = pdf_streams(pdf)
+    for serial in serials:
+        # stamped once, drawn on each page of the copy
+        stamps = [_ for _ in streams if f"(Ballot {serial})".encode() in _]
+        assert len(stamps) == 1
+        uses = [_ for _ in streams if f"Serial{serial} Do".encode() in _]
+        assert len(uses) == pages
+    # the ballot is laid out once: each page drawn from the same form
+    assert sum(b"BallotPage1 Do" in _ for _ in streams) == 3
+    # a printed copy has no form fields
+    assert b"/Annots" not in pdf
+
+
+def test_build_copies(tmp_path):
+    styles = election(ballot_style("a"), ballot_style("b", "Measure B"))
+    batch = build_copies(styles, 3, tmp_path, copies_per_file=2)
+    assert batch.ok
+    serials = json.loads(Path(tmp_path, SERIALS_NAME).read_text())["copies"]
+    assert [(_["id"], _["first"], _["last"]) for _ in serials] == [
+        ("a", "00000001", "00000002"),
+        ("a", "00000003", "00000003"),
+        ("b", "00000004", "00000005"),
+        ("b", "00000006", "00000006"),
+    ]
+    assert {_.name for _ in tmp_path.glob("*.pdf")} == {
+        _["file"] for _ in serials
+    }
+
+
+def test_build_shard_copies(tmp_path):
+    # a shard with only style b numbers its copies after those of a
+    styles = election(ballot_style("b", "Measure B"))
+    build_copies(styles, 2, tmp_path, first_serial=100, style_order=["a", "b"])
+    (serials,) = json.loads(Path(tmp_path, SERIALS_NAME).read_text())["copies"]
+    assert (serials["first"], serials["last"]) == ("00000102", "00000103")
@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+import pytest
+from electos.ballotmaker.data.edf_reader import BALLOT_RULES, SKIP, load_edf
+
+EDF_DIR = Path("src/electos/ballotmaker/assets/data")
+EDF_FILES = ["june_test_case.json", "september_test_case.json"]
+
+
+def vote_counts(gp_unit_id: str):
+    return [
+        {
+            "@type": "ElectionResults.VoteCounts",
+            "Count": count,
+            "GpUnitId": gp_unit_id,
+            "Type": "total",
+        }
+        for count in range(3)
+    ]
+
+
+def results_edf() -> dict:
+    """An EDF with results, and strings that look like JSON structure"""
+    return {
+        "@type": "ElectionResults.ElectionReport",
+        "Issuer": 'The "Results" {Office} [1]\\',
+        "Election": [
+            {
+                "@type": "ElectionResults.Election",
+                "Name": "Election é 🗳",
+                "CountStatus": [{"Status": "completed", "Type": "total"}],
+                "BallotCounts": [{"BallotsCast": 12345}],
+                "Contest": [
+                    {
+                        "@id": "contest-1",
+                        "OtherCounts": [{"Overvotes": 1.5e3}],
+                        "ContestSelection": [
+                            {
+                                "@id": "contest-1--yes",
+                                "VoteCounts": vote_counts("gp-1"),
+                            },
+                            {"@id": "contest-1--no", "VoteCounts": []},
+                        ],
+                    }
+                ],
+                "BallotStyle": [],
+            }
+        ],
+        "GpUnit": [
+            {
+                "@id": "gp-1",
+                "SpatialDimension": {"MapUri": "]}"},
+                "VotersRegistered": 98765,
+            }
+        ],
+        "Person": [{"@id": "person-1", "FirstName": "[{"}],
+        "Party": None,
+    }
+
+
+def without_skipped(rule, value):
+    """What 'load_edf' should return, using json.loads' output"""
+    if isinstance(rule, dict) and isinstance(value, dict):
+        return {
+            key: without_skipped(rule.get(key), item)
+            for key, item in value.items()
+            if rule.get(key) is not SKIP
+        }
+    if isinstance(rule, list) and isinstance(value, list):
+        return [without_skipped(rule[0], item) for item in value]
+    return value
+
+
+@pytest.mark.parametrize("edf_file", EDF_FILES)
+def test_test_cases(edf_file):
+    edf = Path(EDF_DIR, edf_file)
+    expected = without_skipped(BALLOT_RULES, json.loads(edf.read_text()))
+    assert load_edf(edf) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1024 * 1024])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_results_skipped(tmp_path, chunk_size, indent):
+    edf = Path(tmp_path, "results.json")
+    edf.write_text(json.dumps(results_edf(), indent=indent))
+    data = load_edf(edf, chunk_size=chunk_size)
+    assert data == without_skipped(BALLOT_RULES, results_edf())
+    election = data["Election"][0]
+    assert "BallotCounts" not in election
+    assert "VoteCounts" not in election["Contest"][0]["ContestSelection"][0]
+    assert "SpatialDimension" not in data["GpUnit"][0]
+    assert "Person" not in data
+
+
+@pytest.mark.parametrize(
+    "text", ['{"Election": [{"Contest": [}', '{"Person": [1, 2}', "{} {}"]
+)
+def test_invalid_json(tmp_path, text):
+    edf = Path(tmp_path, "invalid.json")
+    edf.write_text(text)
+    with pytest.raises(json.JSONDecodeError):
+        load_edf(edf, chunk_size=4)
@@ -0,0 +1,89 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+from electos.ballotmaker.constants import INVALID_DATA
+from electos.ballotmaker.data.edf_references import (
+    reference_errors,
+    reference_fields,
+)
+from electos.ballotmaker.validate_edf import validate_file
+
+test_dir = Path(__file__).parent.resolve()
+full_test_path = Path(test_dir, "june_test_case.json")
+
+
+@pytest.fixture
+def edf_data() -> dict:
+    return json.loads(full_test_path.read_text())
+
+
+def test_reference_fields():
+    fields = reference_fields()
+    assert fields["ElectionResults.Candidate"]["PartyId"] == {
+        "ElectionResults.Party",
+        "ElectionResults.Coalition",
+    }
+    assert "ContestId" in fields["ElectionResults.OrderedContest"]
+    assert "GpUnitIds" in fields["ElectionResults.BallotStyle"]
+
+
+def test_valid_references(edf_data):
+    assert reference_errors(edf_data) == []
+
+
+def test_dangling_references(edf_data):
+    election = edf_data["Election"][0]
+    election["Candidate"][0]["PartyId"] = "no-such-party"
+    ballot_style = election["BallotStyle"][0]
+    ballot_style["GpUnitIds"].append("no-such-gp-unit")
+    errors = reference_errors(edf_data)
+    # in document order
+    assert errors == [
+        (
+            f"/Election/0/BallotStyle/0/GpUnitIds/"
+            f"{len(ballot_style['GpUnitIds']) - 1}",
+            "refers to unknown @id 'no-such-gp-unit'",
+        ),
+        (
+            "/Election/0/Candidate/0/PartyId",
+            "refers to unknown @id 'no-such-party'",
+        ),
+    ]
+
+
+def test_wrongly_typed_reference(edf_data):
+    election = edf_data["Election"][0]
+    candidate_id = election["Candidate"][0]["@id"]
+    election["BallotStyle"][0]["GpUnitIds"][0] = candidate_id
+    (error,) = reference_errors(edf_data)
+    assert error[0] == "/Election/0/BallotStyle/0/GpUnitIds/0"
+    assert "ElectionResults.Candidate" in error[1]
+    assert "ElectionResults.ReportingUnit" in error[1]
+
+
+def test_duplicate_ids(edf_data):
+    contests = edf_data["Election"][0]["Contest"]
+    original = copy.deepcopy(contests[0])
+    contests[0]["@id"] = contests[1]["@id"]
+    errors = reference_errors(edf_data)
+    assert (
+        "/Election/0/Contest/1",
+        f"duplicate @id '{contests[1]['@id']}', also at /Election/0/Contest/0",
+    ) in errors
+    # the contest that lost its ID leaves references to it dangling
+    assert f"refers to unknown @id '{original['@id']}'" in {
+        message for _, message in errors
+    }
+
+
+def test_validate_file_references(tmp_path, edf_data):
+    edf_data["Election"][0]["Candidate"][0]["PartyId"] = "no-such-party"
+    edf = Path(tmp_path, "invalid.json")
+    edf.write_text(json.dumps(edf_data))
+    summary, _ = validate_file(edf)
+    assert summary["error_code"] == INVALID_DATA
+    assert summary["errors"] == [
+        "/Election/0/Candidate/0/PartyId: refers to unknown @id 'no-such-party'"
+    ]
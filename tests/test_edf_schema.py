@@ -0,0 +1,136 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+from electos.ballotmaker.constants import INVALID_DATA
+from electos.ballotmaker.data.edf_schema import (
+    SchemaCompileError,
+    compile_schema,
+    format_path,
+    load_validator,
+    schema_errors,
+)
+from electos.ballotmaker.validate_edf import MAX_SCHEMA_ERRORS, validate_file
+
+test_dir = Path(__file__).parent.resolve()
+full_test_path = Path(test_dir, "june_test_case.json")
+
+
+@pytest.fixture(scope="module")
+def edf_data() -> dict:
+    return json.loads(full_test_path.read_text())
+
+
+@pytest.fixture
+def validator():
+    return load_validator()
+
+
+def test_valid_edf(validator, edf_data):
+    assert validator(edf_data) == []
+
+
+def test_errors_have_pointers(validator, edf_data):
+    data = copy.deepcopy(edf_data)
+    election = data["Election"][0]
+    del election["Name"]
+    election["Type"] = "snap"
+    election["StartDate"] = "June 1"
+    election["BallotStyle"][0]["Unexpected"] = True
+    errors = dict(validator(data))
+    assert "/Election/0/Name" in errors
+    assert "/Election/0/Type" in errors
+    assert "/Election/0/StartDate" in errors
+    assert "/Election/0/BallotStyle/0/Unexpected" in errors
+    # every error is found in one pass
+    assert len(errors) == 4
+
+
+def test_wrong_type(validator, edf_data):
+    data = copy.deepcopy(edf_data)
+    data["Election"][0]["BallotStyle"][0]["GpUnitIds"] = "not a list"
+    errors = validator(data)
+    assert [_ for _, _message in errors] == [
+        "/Election/0/BallotStyle/0/GpUnitIds"
+    ]
+    assert validator([]) == [("/", "is not of type object")]
+
+
+def test_compiled_once():
+    load_validator.cache_clear()
+    try:
+        assert load_validator() is load_validator()
+    finally:
+        load_validator.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"$ref": "https://example.com/schema.json"},
+        {"anyOf": [{"type": "string"}, {"type": "null"}]},
+        {"allOf": [{"type": "string"}]},
+        {"type": "string", "minLength": 1},
+        {"type": "integer", "minimum": 0},
+        {"type": "array", "uniqueItems": True},
+        {"type": "array", "items": [{"type": "string"}]},
+        {"type": "object", "additionalProperties": {"type": "string"}},
+        {"type": "string", "format": "email"},
+        # ignored beside a reference, in draft 4
+        {
+            "$ref": "#/definitions/Name",
+            "maxLength": 8,
+            "definitions": {"Name": {"type": "string"}},
+        },
+        {"properties": {"Name": {"type": "string", "maxItems": 1}}},
+    ],
+)
+def test_unsupported_schema(schema):
+    with pytest.raises(SchemaCompileError):
+        compile_schema(schema)
+
+
+def test_annotations_and_unchecked_formats():
+    source, _ = compile_schema(
+        {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "title": "Link",
+            "type": "string",
+            "format": "uri",
+            "refTypes": ["ElectionResults.Party"],
+        }
+    )
+    assert "def validate(" in source
+
+
+def test_format_path():
+    assert format_path(()) == "/"
+    assert format_path(((((), "a"), 0), "b/c")) == "/a/0/b~1c"
+
+
+def test_validate_file_schema(tmp_path, edf_data):
+    data = copy.deepcopy(edf_data)
+    for ballot_style in data["Election"][0]["BallotStyle"]:
+        ballot_style["Unexpected"] = True
+    edf = Path(tmp_path, "invalid.json")
+    edf.write_text(json.dumps(data))
+    summary, _ = validate_file(edf)
+    assert summary["error_code"] == INVALID_DATA
+    assert len(summary["errors"]) == len(data["Election"][0]["BallotStyle"])
+    # the schema check can be left out
+    summary, _ = validate_file(edf, schema=False)
+    assert summary["status"] == "ok"
+
+
+def test_many_schema_errors(tmp_path, edf_data):
+    data = copy.deepcopy(edf_data)
+    data["Election"][0].update(
+        {f"Unexpected{_}": _ for _ in range(MAX_SCHEMA_ERRORS + 5)}
+    )
+    assert len(schema_errors(data)) > MAX_SCHEMA_ERRORS
+    edf = Path(tmp_path, "invalid.json")
+    edf.write_text(json.dumps(data))
+    summary, _ = validate_file(edf)
+    assert len(summary["errors"]) == MAX_SCHEMA_ERRORS + 1
+    assert summary["errors"][-1].startswith("... and ")
@@ -1,6 +1,9 @@
 from pathlib import Path
+from types import SimpleNamespace
 
 from electos.ballotmaker.constants import NO_DATA, NO_ERRORS, NO_FILE
+from electos.ballotmaker.data.extractor import BallotDataExtractor
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
 from electos.ballotmaker.election_data import ElectionData
 
 imaginary_file = Path("imaginary_file.json")
@@ -27,3 +30,55 @@ def test_read_edf():
     assert election_data.edf_error == NO_ERRORS
     # the EDF needs to have at least 1 BallotStyle
     assert election_data.ballot_count > 0
+
+
+def test_ballot_data():
+    election_data = ElectionData(full_test_path)
+    ballot_data = election_data.ballot_data
+    assert len(ballot_data) == 1
+    assert len(ballot_data[0].ballot_styles) == election_data.ballot_count
+    # extracted once, then shared
+    assert election_data.ballot_data is ballot_data
+
+
+def test_extract_selected_styles():
+    election_data = ElectionData(full_test_path)
+    ballot_data = election_data.extract(BallotStyleFilter(["precinct_4_*"]))
+    ballot_styles = ballot_data[0].ballot_styles
+    assert [_.id for _ in ballot_styles] == ["precinct_4_bedrock"]
+    ballot_data = election_data.extract(BallotStyleFilter(gp_units="None"))
+    assert ballot_data[0].ballot_styles == []
+
+
+def test_ballot_data_no_file():
+    assert ElectionData(None).ballot_data == []
+
+
+def test_contests_shared():
+    # each contest is extracted once, whatever number of styles it's on
+    ballot_styles = ElectionData(full_test_path).ballot_data[0].ballot_styles
+    contests = {}
+    for ballot_style in ballot_styles:
+        for contest in ballot_style.contests:
+            assert contests.setdefault(contest.id, contest) is contest
+    assert sum(len(_.contests) for _ in ballot_styles) > len(contests)
+
+
+def test_other_contests_skipped(monkeypatch):
+    ballot_style_contests = BallotDataExtractor._ballot_style_contests
+    party_contest = SimpleNamespace(
+        model__id="party-contest", model__type="ElectionResults.PartyContest"
+    )
+
+    def with_party_contest(self, ballot_style):
+        yield from ballot_style_contests(self, ballot_style)
+        yield party_contest
+
+    monkeypatch.setattr(
+        BallotDataExtractor, "_ballot_style_contests", with_party_contest
+    )
+    ballot_styles = ElectionData(full_test_path).ballot_data[0].ballot_styles
+    assert ballot_styles
+    for ballot_style in ballot_styles:
+        assert ballot_style.contests
+        assert "party-contest" not in [_.id for _ in ballot_style.contests]
@@ -0,0 +1,51 @@
+from conftest import ELECTION_HEADER, ballot_measure, ballot_style
+from electos.ballotmaker.ballots import fingerprint
+from electos.ballotmaker.ballots.fingerprint import (
+    ballot_fingerprint,
+    ballot_inputs_hash,
+    layout_hash,
+)
+from electos.ballotmaker.ballots.page_layout import PageLayout
+from electos.ballotmaker.data.models import BallotStyleData
+
+
+def style(id: str, scope: str = "Spacetown Precinct", order=(1, 2)):
+    contests = [ballot_measure(_) for _ in order]
+    return BallotStyleData(**ballot_style(id, contests=contests, scope=scope))
+
+
+def test_style_id_ignored():
+    assert ballot_fingerprint(
+        style("precinct_2_a"), ELECTION_HEADER
+    ) == ballot_fingerprint(style("precinct_2_b"), ELECTION_HEADER)
+
+
+def test_printed_content_differs():
+    fingerprint = ballot_fingerprint(style("a"), ELECTION_HEADER)
+    assert fingerprint != ballot_fingerprint(
+        style("a", scope="Port Precinct"), ELECTION_HEADER
+    )
+    assert fingerprint != ballot_fingerprint(
+        style("a", order=(2, 1)), ELECTION_HEADER
+    )
+    assert fingerprint != ballot_fingerprint(
+        style("a"), dict(ELECTION_HEADER, Name="Primary Election")
+    )
+
+
+def test_inputs_hash(monkeypatch):
+    inputs = ballot_inputs_hash(style("a"), ELECTION_HEADER)
+    assert inputs == ballot_inputs_hash(style("a"), ELECTION_HEADER)
+    # the style ID names the file, so it's an input too
+    assert inputs != ballot_inputs_hash(style("b"), ELECTION_HEADER)
+    # so are the layout settings and assets
+    monkeypatch.setattr(PageLayout, "font_size", 11)
+    layout_hash.cache_clear()
+    assert inputs != ballot_inputs_hash(style("a"), ELECTION_HEADER)
+    monkeypatch.undo()
+    monkeypatch.setattr(
+        fingerprint, "_asset_hashes", lambda: {"writein.png": "changed"}
+    )
+    layout_hash.cache_clear()
+    assert inputs != ballot_inputs_hash(style("a"), ELECTION_HEADER)
+    layout_hash.cache_clear()
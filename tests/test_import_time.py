@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+RUN_CLI = "from electos.ballotmaker.cli import app; app()"
+
+
+def cli_imports(*args: str) -> set:
+    """Modules imported by a CLI command"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_CLI, *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    imports = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        imports.add(line.rsplit("|", 1)[1].strip())
+    return imports
+
+
+def imported(imports: set, package: str) -> bool:
+    return any(
+        name == package or name.startswith(f"{package}.") for name in imports
+    )
+
+
+@pytest.mark.parametrize(
+    "args, not_imported",
+    [
+        (["--version"], ["reportlab", "electos.datamodels", "pydantic"]),
+        (["demo", "--help"], ["reportlab", "electos.datamodels"]),
+        (["validate", "--edf", "not_a_file.json"], ["reportlab"]),
+        (["make", "--edf", "not_a_file.json"], ["reportlab"]),
+    ],
+)
+def test_startup_imports(args, not_imported):
+    imports = cli_imports(*args)
+    assert imported(imports, "electos.ballotmaker.cli")
+    for package in not_imported:
+        assert not imported(imports, package), package
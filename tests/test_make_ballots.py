@@ -1,7 +1,15 @@
+import logging
 from pathlib import Path
 
-from electos.ballotmaker.constants import NO_ERRORS, NO_FILE
-from electos.ballotmaker.make_ballots import make_ballots
+from electos.ballotmaker import make_ballots as make_ballots_module
+from electos.ballotmaker.ballots.manifest import read_manifest
+from electos.ballotmaker.constants import (
+    INVALID_DATA,
+    NO_DATA,
+    NO_ERRORS,
+    NO_FILE,
+)
+from electos.ballotmaker.make_ballots import load_election, make_ballots
 
 imaginary_file = Path("imaginary_file.json")
 test_dir = Path(__file__).parent.resolve()
@@ -9,11 +17,66 @@ test_file = Path("june_test_case.json")
 full_test_path = Path(test_dir, test_file)
 
 
-def test_make_ballots():
+def test_make_ballots(tmp_path):
     # force a no file error with Path = None
     assert make_ballots(_edf=None) == NO_FILE
     # ensure imaginary_file is actually not a file
     assert not imaginary_file.is_file()
     assert make_ballots(imaginary_file) == NO_FILE
     assert full_test_path.is_file()
-    assert make_ballots(full_test_path) == NO_ERRORS
+    assert make_ballots(full_test_path, tmp_path) == NO_ERRORS
+    manifest = read_manifest(tmp_path)
+    assert manifest
+    for entry in manifest.values():
+        assert Path(tmp_path, entry["file"]).is_file()
+
+
+def test_make_selected_ballots(tmp_path):
+    assert (
+        make_ballots(full_test_path, tmp_path, _style_ids=["no-such-style"])
+        == NO_DATA
+    )
+    assert not read_manifest(tmp_path)
+
+
+def test_load_election_errors(tmp_path, monkeypatch, caplog):
+    edf = Path(tmp_path, "edf.json")
+    edf.write_text("{")
+    assert load_election(edf, use_cache=False) == (None, INVALID_DATA)
+    # an expected error is logged without a traceback
+    (record,) = caplog.records
+    assert record.levelno == logging.ERROR
+    assert record.exc_info is None
+
+    def load_ballot_data(*args):
+        raise KeyError("Election")
+
+    monkeypatch.setattr(
+        make_ballots_module, "load_ballot_data", load_ballot_data
+    )
+    caplog.clear()
+    assert load_election(edf) == (None, INVALID_DATA)
+    # anything else is a bug, logged with its traceback
+    (record,) = caplog.records
+    assert record.exc_info is not None
+
+
+def test_make_combined_empty_shard(tmp_path):
+    # four ballot styles: the fifth of five shards has none
+    assert (
+        make_ballots(full_test_path, tmp_path, shard=(5, 5), combined=True)
+        == NO_ERRORS
+    )
+    assert not list(tmp_path.glob("*.pdf"))
+
+
+def test_make_combined_options(tmp_path):
+    assert (
+        make_ballots(full_test_path, tmp_path, jobs=2, combined=True)
+        == INVALID_DATA
+    )
+    assert (
+        make_ballots(full_test_path, tmp_path, keep_going=True, combined=True)
+        == INVALID_DATA
+    )
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,134 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+from electos.ballotmaker.serve_ballots import BallotServer, is_loopback
+
+test_dir = Path(__file__).parent.resolve()
+EDF_NAME = "june_test_case.json"
+full_test_path = Path(test_dir, EDF_NAME)
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp("serve")
+    # jobs can name the files in the root directory
+    root = tmp_path_factory.mktemp("root")
+    Path(root, EDF_NAME).write_bytes(full_test_path.read_bytes())
+    with BallotServer(("127.0.0.1", 0), 1, output_dir, root) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+def request(server, path: str, body: bytes = None):
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}{path}"
+    try:
+        with urllib.request.urlopen(url, data=body) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_status(server):
+    status, body = request(server, "/status")
+    assert status == 200
+    assert body["jobs"] == 1
+
+
+def test_render_file(server):
+    job = {"edf": EDF_NAME, "styles": ["precinct_4_*"]}
+    status, body = request(server, "/render", json.dumps(job).encode())
+    assert status == 200
+    assert list(body["ballots"]) == ["precinct_4_bedrock"]
+    assert Path(body["ballots"]["precinct_4_bedrock"]).is_file()
+
+
+def test_render_relative_paths(server):
+    job = {
+        "edf": EDF_NAME,
+        "styles": ["precinct_4_*"],
+        "output_dir": "ballots",
+    }
+    status, body = request(server, "/render", json.dumps(job).encode())
+    assert status == 200
+    pdf = Path(body["ballots"]["precinct_4_bedrock"])
+    assert pdf.parent == Path(server.root, "ballots")
+
+
+def test_render_outside_root(server):
+    root = server.root
+    for job in (
+        {"edf": str(full_test_path)},
+        {"edf": f"../{root.name}/../{root.name}/../{EDF_NAME}"},
+        {"edf": EDF_NAME, "output_dir": str(test_dir)},
+        {"edf": EDF_NAME, "output_dir": ".."},
+    ):
+        status, _ = request(server, "/render", json.dumps(job).encode())
+        assert status == 403, job
+    # an EDF sent with the job can't name an output directory outside
+    status, _ = request(
+        server,
+        f"/render/edf?output_dir={test_dir}",
+        full_test_path.read_bytes(),
+    )
+    assert status == 403
+    # a symbolic link out of the root isn't followed
+    Path(root, "link.json").symlink_to(full_test_path)
+    job = {"edf": "link.json"}
+    assert request(server, "/render", json.dumps(job).encode())[0] == 403
+
+
+def test_no_root(tmp_path):
+    with BallotServer(("127.0.0.1", 0), 1, tmp_path) as server:
+        with pytest.raises(PermissionError):
+            server.job_path(str(full_test_path))
+
+
+def test_loopback_only():
+    assert is_loopback("127.0.0.1")
+    assert is_loopback("localhost")
+    assert not is_loopback("0.0.0.0")
+    assert not is_loopback("")
+    with pytest.raises(ValueError, match="loopback"):
+        BallotServer(("0.0.0.0", 0), 1)
+
+
+def test_render_edf(server):
+    status, body = request(
+        server, "/render/edf?style=precinct_1_*", full_test_path.read_bytes()
+    )
+    assert status == 200
+    assert list(body["ballots"]) == ["precinct_1_downtown"]
+
+
+def test_render_errors(server):
+    job = {"edf": EDF_NAME, "styles": ["no_such_style"]}
+    assert request(server, "/render", json.dumps(job).encode())[0] == 404
+    job = {"edf": "not_a_file.json"}
+    assert request(server, "/render", json.dumps(job).encode())[0] == 404
+    assert request(server, "/render", b"{}")[0] == 400
+    assert request(server, "/render", b"not json")[0] == 400
+
+
+def test_render_pdf(server):
+    job = {
+        "edf": EDF_NAME,
+        "styles": ["precinct_4_*"],
+        "format": "pdf",
+    }
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}/render"
+    with urllib.request.urlopen(
+        url, data=json.dumps(job).encode()
+    ) as response:
+        assert response.headers["Content-Type"] == "application/pdf"
+        assert response.read().startswith(b"%PDF")
+    # a PDF response holds one ballot style
+    job["styles"] = ["precinct_*"]
+    assert request(server, "/render", json.dumps(job).encode())[0] == 400
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+from conftest import ballot_style, candidate_contest, election
+from electos.ballotmaker.ballots.journal import JOURNAL_NAME
+from electos.ballotmaker.ballots.manifest import read_manifest, write_manifest
+from electos.ballotmaker.ballots.shards import (
+    merge_shards,
+    parse_shard,
+    plan_shards,
+    read_plan,
+    select_shard,
+    style_cost,
+    write_plan,
+)
+
+
+def style(id: str, candidates: int, title: str = None) -> dict:
+    """A style of one contest, which costs candidates + 2 to render"""
+    contest = candidate_contest(
+        title or f"Mayor of {id}", candidates, write_in=False
+    )
+    return ballot_style(id, contests=[contest])
+
+
+def test_parse_shard():
+    assert parse_shard("2/8") == (2, 8)
+    for shard in ("0/8", "9/8", "2", "a/b", "1/2/3"):
+        with pytest.raises(ValueError):
+            parse_shard(shard)
+
+
+def test_style_cost():
+    (ballot_data,) = election(style("a", 3)).ballot_styles
+    # the page, one contest, three candidates
+    assert style_cost(ballot_data) == 5
+
+
+def test_plan_shards():
+    sizes = [9, 7, 6, 5, 4, 3, 2, 2, 1]
+    styles = [style(f"s{n}", size) for n, size in enumerate(sizes)]
+    plan = plan_shards(election(*styles), 3, "edf-hash")
+    assert plan["edf_hash"] == "edf-hash"
+    shards = {_["id"]: _["shard"] for _ in plan["ballot_styles"]}
+    assert sorted(shards) == sorted(_["id"] for _ in styles)
+    assert set(shards.values()) == {1, 2, 3}
+    costs = plan["shard_costs"]
+    assert sum(costs) == sum(size + 2 for size in sizes)
+    assert max(costs) - min(costs) <= max(sizes) + 2
+    # the same styles make the same plan
+    assert plan_shards(election(*styles), 3, "edf-hash") == plan
+
+
+def test_identical_styles_share_a_shard():
+    styles = [style(f"s{n}", 2, title="Mayor") for n in range(4)]
+    styles.append(style("other", 2))
+    plan = plan_shards(election(*styles), 2)
+    shards = {_["id"]: _["shard"] for _ in plan["ballot_styles"]}
+    assert len({shards[f"s{n}"] for n in range(4)}) == 1
+    assert shards["other"] != shards["s0"]
+
+
+def test_more_shards_than_styles(tmp_path):
+    plan = plan_shards(election(style("a", 1)), 3)
+    assert plan["shard_costs"] == [3, 0, 0]
+    write_plan(Path(tmp_path, "plan.json"), plan)
+    assert read_plan(Path(tmp_path, "plan.json")) == plan
+    shard = election(style("a", 1))
+    select_shard(shard, plan, 2)
+    assert shard.ballot_styles == []
+
+
+def shard_output(output_dir: Path, *ballot_ids: str) -> Path:
+    output_dir.mkdir()
+    ballots = {}
+    for ballot_id in ballot_ids:
+        Path(output_dir, f"{ballot_id}.pdf").write_text(ballot_id)
+        ballots[ballot_id] = {"file": f"{ballot_id}.pdf"}
+    write_manifest(output_dir, ballots)
+    return output_dir
+
+
+def test_merge_shards(tmp_path):
+    plan = plan_shards(
+        election(*(style(_, 1) for _ in ("a", "b", "c", "d"))), 2
+    )
+    first = shard_output(Path(tmp_path, "1"), "a", "b")
+    second = shard_output(Path(tmp_path, "2"), "c")
+    output_dir = Path(tmp_path, "merged")
+    merged, missing = merge_shards([first, second], output_dir, plan)
+    assert sorted(merged) == ["a", "b", "c"]
+    assert missing == ["d"]
+    assert read_manifest(output_dir) == merged
+    assert Path(output_dir, "c.pdf").read_text() == "c"
+
+
+def test_merge_duplicate_style(tmp_path, caplog):
+    first = shard_output(Path(tmp_path, "1"), "a")
+    second = shard_output(Path(tmp_path, "2"), "a")
+    Path(second, JOURNAL_NAME).write_text("")
+    with pytest.raises(ValueError, match="Ballot style a"):
+        merge_shards([first, second], Path(tmp_path, "merged"))
+    assert "didn't finish" in caplog.text
@@ -0,0 +1,62 @@
+from conftest import ballot_style
+from electos.ballotmaker.data.models import ElectionData
+from electos.ballotmaker.data.style_filter import BallotStyleFilter
+
+ELECTION = {
+    "name": "General Election",
+    "type": "general",
+    "start_date": "2024-11-05",
+    "end_date": "2024-11-05",
+    "ballot_styles": [
+        ballot_style(
+            "precinct_1_downtown", contests=[], scope="Downtown Precinct"
+        ),
+        ballot_style(
+            "precinct_4_bedrock", contests=[], scope="Bedrock Precinct"
+        ),
+        ballot_style(
+            "precinct_3_spaceport", contests=[], scope="Spaceport Precinct"
+        ),
+    ],
+}
+
+
+def test_empty_filter():
+    style_filter = BallotStyleFilter()
+    assert not style_filter
+    assert style_filter.matches("precinct_1_downtown", [])
+
+
+def test_style_patterns():
+    style_filter = BallotStyleFilter(styles=["precinct_1_*", "*bedrock"])
+    assert style_filter
+    assert style_filter.matches("precinct_1_downtown", [])
+    assert style_filter.matches("precinct_4_bedrock", [])
+    assert not style_filter.matches("precinct_3_spaceport", [])
+
+
+def test_gp_unit_patterns():
+    style_filter = BallotStyleFilter(gp_units="Bedrock*")
+    assert style_filter.gp_units == ["Bedrock*"]
+    assert style_filter.matches("any", ["Downtown", "Bedrock Precinct"])
+    assert not style_filter.matches("any", ["Downtown Precinct"])
+
+
+def test_both_patterns():
+    style_filter = BallotStyleFilter(["precinct_*"], ["Bedrock*"])
+    assert style_filter.matches("precinct_4_bedrock", ["Bedrock Precinct"])
+    assert not style_filter.matches("precinct_4_bedrock", ["Downtown"])
+    assert not style_filter.matches("style_4", ["Bedrock Precinct"])
+
+
+def test_select():
+    election = ElectionData(**ELECTION)
+    style_filter = BallotStyleFilter(gp_units=["Downtown*", "Spaceport*"])
+    selected = style_filter.select([election])
+    assert [_.id for _ in selected[0].ballot_styles] == [
+        "precinct_1_downtown",
+        "precinct_3_spaceport",
+    ]
+    assert selected[0].name == election.name
+    # the extracted data is left as it is, e.g. in the cache
+    assert len(election.ballot_styles) == 3
@@ -0,0 +1,52 @@
+from electos.ballotmaker.data.synthetic_edf import generate_edf
+
+
+def ids_of(items):
+    return {_["@id"] for _ in items}
+
+
+def test_counts():
+    edf = generate_edf(
+        ballot_styles=12,
+        contests_per_style=5,
+        candidates_per_contest=3,
+        gp_units=4,
+        measures_per_style=2,
+    )
+    election = edf["Election"][0]
+    ballot_styles = election["BallotStyle"]
+    assert len(ballot_styles) == 12
+    assert all(len(_["OrderedContent"]) == 5 for _ in ballot_styles)
+    # a state and the precincts
+    assert len(edf["GpUnit"]) == 5
+    candidate_contests = [
+        _
+        for _ in election["Contest"]
+        if _["@type"].endswith("CandidateContest")
+    ]
+    # candidates plus a write-in
+    assert all(len(_["ContestSelection"]) == 4 for _ in candidate_contests)
+
+
+def test_references():
+    edf = generate_edf(ballot_styles=5)
+    election = edf["Election"][0]
+    gp_unit_ids = ids_of(edf["GpUnit"])
+    contest_ids = ids_of(election["Contest"])
+    candidate_ids = ids_of(election["Candidate"])
+    assert election["ElectionScopeId"] in gp_unit_ids
+    for ballot_style in election["BallotStyle"]:
+        assert set(ballot_style["GpUnitIds"]) <= gp_unit_ids
+        for item in ballot_style["OrderedContent"]:
+            assert item["ContestId"] in contest_ids
+    for candidate in election["Candidate"]:
+        assert candidate["PartyId"] in ids_of(edf["Party"])
+        assert candidate["PersonId"] in ids_of(edf["Person"])
+    for contest in election["Contest"]:
+        for selection in contest["ContestSelection"]:
+            assert set(selection.get("CandidateIds", [])) <= candidate_ids
+
+
+def test_repeatable():
+    assert generate_edf(seed=1) == generate_edf(seed=1)
+    assert generate_edf(seed=1) != generate_edf(seed=2)
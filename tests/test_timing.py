@@ -0,0 +1,56 @@
+import json
+import pstats
+
+from electos.ballotmaker.timing import Timings, profile_run, span, timings
+
+
+def test_span_summary():
+    recorder = Timings()
+    for ballot_style in ("precinct_1", "precinct_2"):
+        with recorder.span("build_ballot", ballot_style=ballot_style):
+            pass
+    with recorder.span("render"):
+        pass
+    summary = recorder.summary()
+    assert summary["build_ballot"]["count"] == 2
+    assert summary["render"]["count"] == 1
+    assert list(recorder.ballot_styles()) == ["precinct_1", "precinct_2"]
+    assert "precinct_2" in recorder.format_summary()
+
+
+def test_span_records_errors():
+    recorder = Timings()
+    try:
+        with recorder.span("extract"):
+            raise ValueError
+    except ValueError:
+        pass
+    assert recorder.summary()["extract"]["count"] == 1
+
+
+def test_profile_run(tmp_path, capsys):
+    stats_file = tmp_path / "ballots.prof"
+    report_file = tmp_path / "timing.json"
+    with profile_run(True, stats_file, report_file):
+        with span("make_ballots"):
+            sum(range(1000))
+    assert "make_ballots" in capsys.readouterr().out
+    assert pstats.Stats(str(stats_file)).total_calls > 0
+    report = json.loads(report_file.read_text())
+    assert report["stages"]["make_ballots"]["count"] == 1
+    assert report["spans"] == timings.spans
+
+
+def test_spans_kept_only_when_profiling():
+    # a long-running process doesn't collect spans for ever
+    timings.clear()
+    with span("load_edf"):
+        pass
+    timings.extend([{"stage": "build_ballot", "seconds": 0.1}])
+    assert timings.spans == []
+    with profile_run():
+        with span("load_edf"):
+            pass
+    assert [_["stage"] for _ in timings.spans] == ["load_edf"]
+    assert not timings.enabled
+    timings.clear()
@@ -0,0 +1,75 @@
+import json
+import shutil
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from electos.ballotmaker import election_data
+from electos.ballotmaker.constants import INVALID_DATA, NO_ERRORS, NO_FILE
+from electos.ballotmaker.validate_edf import validate_edfs, validate_file
+
+test_dir = Path(__file__).parent.resolve()
+full_test_path = Path(test_dir, "june_test_case.json")
+empty_file_path = Path(test_dir, "empty.json")
+imaginary_file = Path("imaginary_file.json")
+
+
+def summaries(output: StringIO) -> list:
+    return [json.loads(_) for _ in output.getvalue().splitlines()]
+
+
+def test_validate_file():
+    summary, text = validate_file(full_test_path)
+    assert summary["status"] == "ok"
+    assert summary["error_code"] == NO_ERRORS
+    assert summary["ballot_styles"] > 0
+    assert summary["contests"] > 0
+    assert summary["errors"] == []
+    assert summary["seconds"] >= 0
+    # the full ballot data only on request
+    assert text is None
+    summary, text = validate_file(full_test_path, dump=True)
+    assert len(json.loads(text)[0]["ballot_styles"]) == (
+        summary["ballot_styles"]
+    )
+
+
+def test_validate_file_parses_once(monkeypatch):
+    def load_edf(edf):
+        raise AssertionError(f"{edf} read again")
+
+    monkeypatch.setattr(election_data, "load_edf", load_edf)
+    summary, _ = validate_file(full_test_path)
+    assert summary["status"] == "ok"
+
+
+def test_invalid_files():
+    summary, _ = validate_file(imaginary_file)
+    assert summary["status"] == "error"
+    assert summary["error_code"] == NO_FILE
+    summary, _ = validate_file(empty_file_path)
+    assert summary["error_code"] == INVALID_DATA
+    assert summary["errors"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_directory(tmp_path, jobs):
+    for name in ("a.json", "b.json"):
+        shutil.copyfile(full_test_path, Path(tmp_path, name))
+    shutil.copyfile(empty_file_path, Path(tmp_path, "c.json"))
+    output = StringIO()
+    result = validate_edfs([tmp_path, imaginary_file], jobs, output=output)
+    # the first error is the result
+    assert result == INVALID_DATA
+    lines = summaries(output)
+    assert [Path(_["edf"]).name for _ in lines] == [
+        "a.json",
+        "b.json",
+        "c.json",
+        imaginary_file.name,
+    ]
+    assert [_["status"] for _ in lines] == ["ok", "ok", "error", "error"]
+
+
+def test_no_files(tmp_path):
+    assert validate_edfs([tmp_path], output=StringIO()) == NO_FILE